@@ -0,0 +1,48 @@
+"""
+Measures the dotted path accessors on ``Resource`` against walking the path with ``getattr``.
+
+Run with::
+
+    python -m benchmarks.bench_accessors
+"""
+from httpbase.fields import ResourceField, StrField
+from httpbase.resources import Resource
+
+from .bench_serialization import bench
+
+
+class ProfileResource(Resource):
+    email = StrField()
+    name = StrField()
+
+
+class AuthorResource(Resource):
+    profile = ResourceField(resource_class=ProfileResource)
+
+
+class PostResource(Resource):
+    author = ResourceField(resource_class=AuthorResource)
+    title = StrField()
+
+
+def getattr_walk(resource, path):
+    *levels, target = path.split(".")
+    for level in levels:
+        resource = getattr(resource, level).value
+    return getattr(resource, target).value
+
+
+def main():
+    post = PostResource(
+        author=AuthorResource(profile=ProfileResource(email="foo@example.com", name="author")), title="Post Title"
+    )
+    paths = ["title", "author.profile.email", "author.profile.name"]
+    bench("getattr walk", lambda: getattr_walk(post, "author.profile.email"), number=100000)
+    bench("Resource.get_value", lambda: post.get_value("author.profile.email"), number=100000)
+    bench("Resource.update", lambda: post.update("author.profile.email", "foo@example.com"), number=100000)
+    bench("get_value x3", lambda: [post.get_value(path) for path in paths], number=100000)
+    bench("Resource.get_values (3 paths)", lambda: post.get_values(paths), number=100000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares a list of resources with a ``ResourceBatch`` holding the same rows, for memory and for serializing all of
+them to a JSON array, in one process and with ``serialize_parallel`` on every CPU.
+
+Run with::
+
+    python -m benchmarks.bench_batches
+"""
+import json
+import os
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from httpbase.batches import ResourceBatch, serialize_parallel
+from httpbase.fields import BoolField, IntField, StrField
+from httpbase.resources import Resource
+
+from .bench_serialization import bench
+
+ROWS = 100000
+
+
+class RecordResource(Resource):
+    __slots__ = ()
+    id = IntField(label="id")
+    user_id = IntField(label="userId")
+    title = StrField(label="title")
+    published = BoolField(label="published")
+    views = IntField(label="views")
+
+
+def make_records():
+    return [RecordResource(id=index, user_id=index % 100, title="title", published=True, views=index * 3)
+            for index in range(ROWS)]
+
+
+def memory(factory) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = factory()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / ROWS
+
+
+def make_batch():
+    batch = ResourceBatch[RecordResource]()
+    for index in range(ROWS):
+        batch.add(id=index, user_id=index % 100, title="title", published=True, views=index * 3)
+    return batch
+
+
+def main():
+    records = make_records()
+    batch = ResourceBatch[RecordResource](resources=records)
+    assert batch.dicts() == [record.dict() for record in records]
+    print(f"{'bytes per row, list of resources':<40} {memory(make_records):8.0f}")
+    print(f"{'bytes per row, ResourceBatch':<40} {memory(make_batch):8.0f}")
+    resources = bench("json.dumps([r.dict() for r in rows])",
+                      lambda: json.dumps([record.dict() for record in records]), number=1, repeat=3)
+    batched = bench("ResourceBatch.json()", batch.json, number=1, repeat=3)
+    print(f"{'speedup':<40} {resources / batched:8.2f}x")
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        assert serialize_parallel(batch, min_rows=0, executor=pool) == batch.json()
+        parallel = bench(f"serialize_parallel(), {workers} workers",
+                         lambda: serialize_parallel(batch, min_rows=0, executor=pool), number=1, repeat=3)
+    print(f"{'speedup':<40} {batched / parallel:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Times opening a large cassette and replaying responses from it.
+
+Run with::
+
+    python -m benchmarks.bench_cassettes
+"""
+import os
+import tempfile
+import time
+
+from httpbase.cassettes import Cassette, CassetteWriter, Interaction, ReplayTransport
+
+from .bench_serialization import bench
+
+RECORDS = 100000
+
+
+def write_cassette(path: str):
+    body = b'{"id": 1, "name": "' + b"x" * 200 + b'"}'
+    with CassetteWriter(path) as writer:
+        for index in range(RECORDS):
+            writer.write(Interaction("GET", f"http://example.com/items/{index % 1000}", [("Accept", "*/*")], b"",
+                                     200, "OK", [("Content-Type", "application/json")], body, 0.01))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.cassette")
+        write_cassette(path)
+        start = time.perf_counter()
+        cassette = Cassette(path)
+        print(f"{'open ' + str(RECORDS) + ' records':<40} {(time.perf_counter() - start) * 1000:8.1f} ms")
+        sequence = ReplayTransport(cassette, match="sequence")
+        by_request = ReplayTransport(cassette)
+        by_request("GET", "http://example.com/items/0")
+        bench("replay: sequence", lambda: sequence("GET", "http://example.com/items/0"))
+        bench("replay: request", lambda: by_request("GET", "http://example.com/items/1"))
+        cassette.close()
+
+
+if __name__ == "__main__":
+    main()
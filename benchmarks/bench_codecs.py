@@ -0,0 +1,26 @@
+"""
+Compares the size of a serialized resource and the time to encode and decode it with each codec.
+
+Run with::
+
+    python -m benchmarks.bench_codecs
+"""
+from httpbase import codecs
+from httpbase.codecs import get_codec
+
+from .bench_serialization import bench, make_post
+
+
+def main():
+    value = make_post().dict()
+    names = ["json"] + (["orjson"] if codecs.orjson is not None else []) + ["msgpack", "cbor"]
+    for name in names:
+        codec = get_codec(name)
+        data = codec.encode(value)
+        print(f"{name + ': size':<40} {len(data):8d} bytes")
+        bench(f"{name}: encode", lambda: codec.encode(value))
+        bench(f"{name}: decode", lambda: codec.decode(data))
+
+
+if __name__ == "__main__":
+    main()
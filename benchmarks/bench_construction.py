@@ -0,0 +1,30 @@
+"""
+Measures the time it takes to construct resources and the memory each instance holds on to.
+
+Run with::
+
+    python -m benchmarks.bench_construction
+"""
+import tracemalloc
+
+from .bench_serialization import bench, make_post
+
+
+def memory_per_instance(factory, count=10000) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / count
+
+
+def main():
+    bench("PostResource(...)", make_post)
+    bench("PostResource(...).dict()", lambda: make_post().dict())
+    print(f"{'bytes per PostResource':<40} {memory_per_instance(make_post):8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Compares formatting and parsing ISO 8601 timestamps through ``DateField`` with plain ``strftime`` and ``strptime``.
+
+Run with::
+
+    python -m benchmarks.bench_dates
+"""
+from datetime import datetime, timedelta
+
+from httpbase.fields import DateField, EpochField
+
+from .bench_serialization import bench
+
+FORMAT = "%Y-%m-%dT%H:%M:%S"
+VALUES = [datetime(2018, 4, 20) + timedelta(minutes=index) for index in range(10000)]
+
+
+def main():
+    field = DateField(format=FORMAT)
+    strings = field.serialize_many(VALUES)
+    timestamps = EpochField().serialize_many(VALUES)
+    bench("[strftime(value) for value in values]", lambda: [value.strftime(FORMAT) for value in VALUES], number=20)
+    bench("DateField.serialize_many", lambda: field.serialize_many(VALUES), number=20)
+    bench("[strptime(value) for value in values]",
+          lambda: [datetime.strptime(value, FORMAT) for value in strings], number=20)
+    bench("DateField.deserialize_many", lambda: field.deserialize_many(strings), number=20)
+    bench("EpochField.serialize_many", lambda: EpochField().serialize_many(VALUES), number=20)
+    bench("EpochField.deserialize_many", lambda: EpochField().deserialize_many(timestamps), number=20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares decoding a large JSON list response into resources with ``Resource.from_json`` against ``json.loads`` alone,
+and lazily decoding the same response when only a couple of fields of each item are read.
+
+Run with::
+
+    python -m benchmarks.bench_decoding
+"""
+import json
+
+from httpbase.fields import BoolField, IntField, ListField, ResourceField, StrField
+from httpbase.resources import Resource
+
+from .bench_serialization import bench
+
+
+class AuthorResource(Resource):
+    name = StrField(label="authorName")
+    post_count = IntField(label="postCount")
+
+
+class PostResource(Resource):
+    id = IntField(label="id")
+    user_id = IntField(label="userId")
+    title = StrField(label="title")
+    body = StrField(label="body")
+    published = BoolField(label="published")
+    tags = ListField(label="tags")
+    author = ResourceField(label="author", resource_class=AuthorResource)
+    contributors = ListField(label="contributors", resource_class=AuthorResource)
+
+
+def make_payload(count: int=1000) -> bytes:
+    return json.dumps([
+        {
+            "id": index,
+            "userId": index % 10,
+            "title": "Post Title",
+            "body": "...",
+            "published": True,
+            "tags": ["a", "b", "c"],
+            "author": {"authorName": "author", "postCount": 10},
+            "contributors": [{"authorName": "contributor", "postCount": 1}] * 10,
+        }
+        for index in range(count)
+    ]).encode()
+
+
+def main():
+    payload = make_payload()
+    raw = bench("json.loads (1000 items)", lambda: json.loads(payload), number=100)
+    decoded = bench("Resource.from_json (1000 items)", lambda: PostResource.from_json(payload), number=100)
+    print(f"{'from_json / json.loads':<40} {decoded / raw:8.2f}x")
+
+    def read_two_fields(lazy):
+        return [(post.id.value, post.title.value) for post in PostResource.from_json(payload, lazy=lazy)]
+
+    bench("from_json + 2 fields", lambda: read_two_fields(False), number=100)
+    bench("from_json(lazy=True) + 2 fields", lambda: read_two_fields(True), number=100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures the time it takes to import the package and each submodule in a fresh interpreter, and whether the import
+pulls in ``requests``.
+
+Run with::
+
+    python -m benchmarks.bench_imports
+"""
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "httpbase",
+    "httpbase.constants",
+    "httpbase.fields",
+    "httpbase.resources",
+    "httpbase.codecs",
+    "httpbase.batches",
+    "httpbase.streaming",
+    "httpbase.routes",
+    "httpbase.tenants",
+    "httpbase.client",
+    "httpbase.bench",
+]
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "requests" in sys.modules)
+"""
+
+
+def import_time(module: str, repeat: int=7):
+    """Returns the median import time of ``module`` in seconds and whether it imported ``requests``."""
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", SCRIPT.format(module=module)], check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+        times.append(float(output[0]))
+    return statistics.median(times), output[1] == "True"
+
+
+def main():
+    print(f"{'module':<40} {'import':>11} requests")
+    for module in MODULES:
+        seconds, imports_requests = import_time(module)
+        print(f"{module:<40} {seconds * 1e3:8.2f} ms {'yes' if imports_requests else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
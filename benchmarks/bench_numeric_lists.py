@@ -0,0 +1,38 @@
+"""
+Compares serializing a long list of floats held by a ``ListField`` with a ``NumericListField``.
+
+Run with::
+
+    python -m benchmarks.bench_numeric_lists
+"""
+import random
+
+from httpbase.fields import ListField, NumericListField
+from httpbase.resources import Resource
+
+from .bench_serialization import bench
+
+SAMPLES = 100000
+
+
+class ListTelemetry(Resource):
+    samples = ListField(label="samples")
+
+
+class ArrayTelemetry(Resource):
+    samples = NumericListField(label="samples", typecode="d")
+
+
+def main():
+    samples = [random.random() for _ in range(SAMPLES)]
+    plain = ListTelemetry(samples=samples)
+    packed = ArrayTelemetry(samples=samples)
+    assert plain.dict() == packed.dict()
+    bench("ArrayTelemetry(samples=...)", lambda: ArrayTelemetry(samples=samples), number=20)
+    list_time = bench("ListField dict()", plain.dict, number=20)
+    array_time = bench("NumericListField dict()", packed.dict, number=20)
+    print(f"{'speedup':<40} {list_time / array_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares the compiled serializers ``Resource.dict()`` uses with the generic field loop in
+``Resource._dict_generic()``.
+
+Run with::
+
+    python -m benchmarks.bench_serialization
+"""
+import timeit
+from datetime import datetime
+
+from httpbase.fields import BoolField, DateField, IntField, ListField, MapField, ResourceField, StrField
+from httpbase.resources import Resource
+
+
+class AuthorResource(Resource):
+    __slots__ = ()
+    name = StrField(label="authorName")
+    post_count = IntField(label="postCount")
+
+
+class PostResource(Resource):
+    __slots__ = ()
+    id = IntField(label="id")
+    user_id = IntField(label="userId")
+    title = StrField(label="title")
+    body = StrField(label="body")
+    published = BoolField(label="published")
+    tags = ListField(label="tags")
+    metadata = MapField(label="metaData")
+    subtitle = StrField(label="subtitle", nullable=True, omit_null=True)
+    created = DateField(label="created")
+    author = ResourceField(label="author")
+
+
+def make_post():
+    return PostResource(
+        id=1,
+        user_id=2,
+        title="Post Title",
+        body="...",
+        published=True,
+        tags=["a", "b", "c"],
+        metadata={"subscribed": True, "popular": False},
+        created=datetime(2018, 4, 20, 16, 20),
+        author=AuthorResource(name="author", post_count=10),
+    )
+
+
+def bench(label, func, number=20000, repeat=5):
+    best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+    print(f"{label:<40} {best * 1e6:8.2f} us/op")
+    return best
+
+
+def main():
+    post = make_post()
+    assert post.dict() == post._dict_generic()
+    generic = bench("Resource._dict_generic()", post._dict_generic)
+    compiled = bench("Resource.dict()", post.dict)
+    print(f"{'speedup':<40} {generic / compiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
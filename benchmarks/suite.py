@@ -0,0 +1,251 @@
+"""
+Benchmark suite for the hot paths of resources and clients: constructing, serializing and decoding resources of
+different widths and depths, building URLs, preparing request kwargs and full request round trips against a local
+HTTP server running in the same process and through in-process WSGI and ASGI transports.
+
+Each benchmark is timed in many samples and reported as the median and 99th percentile time per operation and the
+operations per second at the median. Results can be saved as a baseline and later runs compared against it, which
+exits with status 1 when a benchmark is slower than the baseline by more than the threshold.
+
+Run with::
+
+    python -m benchmarks
+    python -m benchmarks --save-baseline
+    python -m benchmarks --compare --threshold 0.15
+    python -m benchmarks --filter dict
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+from httpbase.bench import StandInServer
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.fields import IntField, ResourceField, StrField
+from httpbase.resources import Resource
+from httpbase.routes import Route
+from httpbase.transports import ASGITransport, WSGITransport
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+WIDTHS = (5, 20, 50)
+DEPTHS = (1, 5, 20)
+
+ITEM_BODY = json.dumps({"id": 1, "name": "name", "tags": ["a", "b"]}).encode()
+
+# Each sample runs for at least this long, so timer resolution doesn't show up in the results
+MIN_SAMPLE_TIME = 0.002
+
+
+class Stats(NamedTuple):
+    median: float
+    p99: float
+    samples: int
+
+    @property
+    def ops(self) -> float:
+        return 1 / self.median
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the value at ``fraction`` of the sorted values, interpolating between the closest two."""
+    values = sorted(values)
+    position = (len(values) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def measure(func: Callable, samples: int=100) -> Stats:
+    """
+    Time ``func`` in ``samples`` samples. The number of calls in a sample is picked so that a sample takes at least
+    ``MIN_SAMPLE_TIME``, and the time per call of each sample is used for the statistics. The garbage collector is
+    disabled while a sample runs, the same as ``timeit`` does.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < MIN_SAMPLE_TIME:
+        number *= 2
+    gc.collect()
+    times = [time / number for time in timer.repeat(repeat=samples, number=number)]
+    return Stats(statistics.median(times), percentile(times, 0.99), samples)
+
+
+def wide_resource_class(width: int) -> type:
+    attrs = {}
+    for index in range(width):
+        attrs[f"field_{index}"] = IntField(label=f"field{index}") if index % 2 else StrField(label=f"field{index}")
+    return type(f"Wide{width}Resource", (Resource,), attrs)
+
+
+def wide_kwargs(width: int) -> Dict:
+    return {f"field_{index}": index if index % 2 else f"value {index}" for index in range(width)}
+
+
+def deep_resource(depth: int) -> Resource:
+    """
+    Returns a chain of ``depth`` resources, each holding the next one in a ``ResourceField``. Each level has its own
+    class so that ``from_dict`` decodes the whole chain.
+    """
+    resource_class = type("Level0Resource", (Resource,), {"name": StrField(label="name"), "count": IntField()})
+    resource = resource_class(name="leaf", count=1)
+    for level in range(1, depth):
+        resource_class = type(f"Level{level}Resource", (Resource,), {
+            "name": StrField(label="name"),
+            "child": ResourceField(label="child", resource_class=resource_class),
+        })
+        resource = resource_class(name=f"level {level}", child=resource)
+    return resource
+
+
+class BenchmarkClient(HTTPBaseClient):
+    def get_item(self, item_id: int):
+        return self._make_request(Route("/items/{item_id}", HTTPMethods.GET), item_id=item_id)
+
+    def create_item(self, item: Resource):
+        return self._make_request(Route("/items", HTTPMethods.POST), data=item.json(),
+                                  headers={"Content-Type": "application/json"})
+
+
+def resource_benchmarks() -> Iterator[Tuple[str, Callable]]:
+    for width in WIDTHS:
+        resource_class = wide_resource_class(width)
+        kwargs = wide_kwargs(width)
+        resource = resource_class(**kwargs)
+        data = resource.dict()
+        yield f"resource.init[width={width}]", lambda cls=resource_class, kwargs=kwargs: cls(**kwargs)
+        yield f"resource.dict[width={width}]", resource.dict
+        yield f"resource.json[width={width}]", resource.json
+        yield f"resource.from_dict[width={width}]", lambda cls=resource_class, data=data: cls.from_dict(data)
+    for depth in DEPTHS:
+        resource = deep_resource(depth)
+        data = resource.dict()
+        yield f"resource.dict[depth={depth}]", resource.dict
+        yield f"resource.from_dict[depth={depth}]", lambda cls=type(resource), data=data: cls.from_dict(data)
+
+
+def client_benchmarks() -> Iterator[Tuple[str, Callable]]:
+    route = Route("/api/users/{user_id}/posts/{post_id}", HTTPMethods.GET, params={"page"})
+    yield "route.get_url", lambda: route.get_url("http://example.com", user_id=1, post_id=2)
+    client = BenchmarkClient(baseurl="http://example.com")
+    kwargs = {"user_id": 1, "post_id": 2, "params": {"page": 1}, "headers": {"Accept": "application/json"},
+              "data": "{}", "timeout": 5}
+    yield "client.prep_request", lambda: client._prep_request(**kwargs)
+
+
+def item_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "application/json"), ("Content-Length", str(len(ITEM_BODY)))])
+    return [ITEM_BODY]
+
+
+async def item_asgi_app(scope, receive, send):
+    while (await receive()).get("more_body"):
+        pass
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(ITEM_BODY)).encode())]
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": ITEM_BODY})
+
+
+def round_trip_benchmarks(server: StandInServer) -> Iterator[Tuple[str, Callable]]:
+    client = BenchmarkClient(baseurl=server.url)
+    item = wide_resource_class(5)(**wide_kwargs(5))
+    yield "round_trip.get", lambda: client.get_item(1)
+    yield "round_trip.post", lambda: client.create_item(item)
+    wsgi_client = BenchmarkClient(baseurl="http://testserver", transport=WSGITransport(item_app))
+    yield "round_trip.wsgi_get", lambda: wsgi_client.get_item(1)
+    yield "round_trip.wsgi_post", lambda: wsgi_client.create_item(item)
+    asgi_client = BenchmarkClient(baseurl="http://testserver", transport=ASGITransport(item_asgi_app))
+    yield "round_trip.asgi_get", lambda: asgi_client.get_item(1)
+    yield "round_trip.asgi_post", lambda: asgi_client.create_item(item)
+
+
+def run(pattern: str=None, samples: int=100) -> Dict[str, Stats]:
+    """Run every benchmark whose name matches the regular expression ``pattern`` and print each result."""
+    results = {}
+    with StandInServer(body=ITEM_BODY) as server:
+        for name, func in (*resource_benchmarks(), *client_benchmarks(), *round_trip_benchmarks(server)):
+            if pattern is not None and not re.search(pattern, name):
+                continue
+            # Round trips are much slower than everything else, so they get fewer samples
+            stats = measure(func, max(samples // 5, 10) if name.startswith("round_trip") else samples)
+            results[name] = stats
+            print(format_stats(name, stats), flush=True)
+    return results
+
+
+def format_stats(name: str, stats: Stats) -> str:
+    return f"{name:<36} {stats.median * 1e6:10.2f} us {stats.p99 * 1e6:10.2f} us {stats.ops:12.0f}"
+
+
+def save_baseline(results: Dict[str, Stats], path: str):
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {name: stats._asdict() for name, stats in results.items()},
+    }
+    with open(path, "w") as baseline:
+        json.dump(document, baseline, indent=2, sort_keys=True)
+        baseline.write("\n")
+
+
+def compare(results: Dict[str, Stats], path: str, threshold: float) -> List[str]:
+    """
+    Print how the median of each result changed against the baseline in ``path``.
+
+    Returns:
+        The names of the benchmarks that got slower by more than ``threshold``, as a fraction of the baseline.
+    """
+    with open(path) as baseline:
+        document = json.load(baseline)
+    print(f"\ncompared with {path} (python {document['python']}, {document['platform']})")
+    regressions = []
+    for name, stats in results.items():
+        previous = document["results"].get(name)
+        if previous is None:
+            print(f"{name:<36} {'new':>10}")
+            continue
+        change = stats.median / previous["median"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  slower"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<36} {change:+10.1%}{flag}")
+    return regressions
+
+
+def main(argv: List[str]=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--filter", help="only run benchmarks whose name matches this regular expression")
+    parser.add_argument("--samples", type=int, default=100, help="samples per benchmark (default: %(default)s)")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE_PATH, metavar="PATH",
+                        help="save the results as the baseline (default: benchmarks/baseline.json)")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, metavar="PATH",
+                        help="compare the results with a baseline (default: benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="fraction a median may grow by before it counts as slower (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<36} {'median':>13} {'p99':>13} {'ops/s':>12}")
+    results = run(args.filter, args.samples)
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+        print(f"\nsaved baseline to {args.save_baseline}")
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,52 @@
-import requests
+import importlib
+from typing import TYPE_CHECKING
 
-from .client import HTTPBaseClient
-from .constants import HTTPMethods, HTTPResponseCodes
-from .fields import IntField, StrField, ListField, MapField, ResourceField
-from .resources import Resource
-from .routes import Route
+# The names exported by the package and the submodule each one comes from. They are imported the first time they are
+# used, so ``import httpbase`` stays cheap and ``requests`` is only imported once a client is used
+_EXPORTS = {
+    "ResourceBatch": "batches",
+    "HTTPBaseClient": "client",
+    "HTTPMethods": "constants",
+    "HTTPResponseCodes": "constants",
+    "IntField": "fields",
+    "StrField": "fields",
+    "ListField": "fields",
+    "MapField": "fields",
+    "ResourceField": "fields",
+    "FrozenResource": "resources",
+    "Resource": "resources",
+    "Route": "routes",
+    "TenantScheduler": "tenants",
+}
 
-# Alias the Response class form requests so it can be used as a type hint with having to import form a dependency
-Response = requests.Response
+__all__ = [*_EXPORTS, "Response"]
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+    from .batches import ResourceBatch
+    from .client import HTTPBaseClient
+    from .constants import HTTPMethods, HTTPResponseCodes
+    from .fields import IntField, StrField, ListField, MapField, ResourceField
+    from .resources import FrozenResource, Resource
+    from .routes import Route
+    from .tenants import TenantScheduler
+
+    Response = requests.Response
+
+
+def __getattr__(name: str):
+    if name == "Response":
+        # Alias the Response class form requests so it can be used as a type hint with having to import form a dependency
+        value = importlib.import_module("requests").Response
+    else:
+        module = _EXPORTS.get(name)
+        if module is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
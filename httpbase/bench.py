@@ -0,0 +1,432 @@
+"""
+Load generator for :class:`~httpbase.client.HTTPBaseClient` subclasses.
+
+Calls a method of a client from many threads, either at a fixed rate (open loop) or with a fixed number of requests
+in flight (closed loop), and reports a latency histogram, percentiles, a breakdown of the responses by status class and
+the throughput of each second of the run.
+
+Run with::
+
+    python -m httpbase.bench myapp.clients:ItemsClient get_item --args myapp.load:item_ids --rate 200 --duration 30
+    python -m httpbase.bench myapp.clients:ItemsClient get_item --kwargs '{"item_id": 1}' --concurrency 16 --local
+
+``--local`` sends the requests to a stand-in server on a local port instead of a real upstream.
+"""
+import argparse
+import collections
+import importlib
+import itertools
+import json
+import math
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .constants import HTTPResponseCodes
+
+# Latencies are counted in buckets this much wider than the one before, so percentiles are accurate to 2%
+_BUCKET_GROWTH = 1.02
+_LOG_GROWTH = math.log(_BUCKET_GROWTH)
+# Upper bound of the first bucket, in seconds
+_MIN_LATENCY = 1e-6
+
+# Default number of threads sending requests in open loop mode, which caps the number of requests in flight
+DEFAULT_MAX_IN_FLIGHT = 100
+
+
+class LatencyHistogram(object):
+    """
+    Counts latencies in logarithmic buckets, so memory use doesn't depend on the number of requests. Percentiles are
+    the upper bound of the bucket they fall in, within 2% of the recorded value. The minimum, maximum and mean are
+    exact.
+    """
+    def __init__(self):
+        self.counts: Dict[int, int] = collections.Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket(latency: float) -> int:
+        if latency <= _MIN_LATENCY:
+            return 0
+        return math.ceil(math.log(latency / _MIN_LATENCY) / _LOG_GROWTH)
+
+    @staticmethod
+    def _upper_bound(bucket: int) -> float:
+        return _MIN_LATENCY * _BUCKET_GROWTH ** bucket
+
+    def record(self, latency: float):
+        """Count a latency in seconds."""
+        self.counts[self._bucket(latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.min = min(self.min, latency)
+        self.max = max(self.max, latency)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Returns the latency in seconds that ``percent`` percent of the recorded latencies are at or below."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self._upper_bound(bucket), self.max)
+        return self.max
+
+    def bars(self, rows: int=20) -> List[Tuple[float, float, int]]:
+        """
+        Group the buckets in to at most ``rows`` ranges of equal width on a log scale.
+
+        Returns:
+            A list of ``(low, high, count)`` tuples with latencies in seconds.
+        """
+        if not self.count:
+            return []
+        first, last = self._bucket(self.min), self._bucket(self.max)
+        width = max(1, math.ceil((last - first + 1) / rows))
+        grouped = collections.Counter()
+        for bucket, count in self.counts.items():
+            grouped[(bucket - first) // width] += count
+        return [
+            (self._upper_bound(first + row * width - 1), self._upper_bound(first + (row + 1) * width - 1), grouped[row])
+            for row in range((last - first) // width + 1)
+        ]
+
+
+def status_class(result) -> str:
+    """
+    Returns the name of the class of a response: ``"2xx"`` to ``"5xx"`` for a response with a ``status_code``,
+    ``"other"`` for anything else a client method returns and ``"error: <exception name>"`` for exceptions.
+    """
+    if isinstance(result, BaseException):
+        return f"error: {result.__class__.__name__}"
+    status_code = getattr(result, "status_code", None)
+    if status_code is None:
+        return "other"
+    for name, check in (("1xx", HTTPResponseCodes.is_1xx_code), ("2xx", HTTPResponseCodes.is_2xx_code),
+                        ("3xx", HTTPResponseCodes.is_3xx_code), ("4xx", HTTPResponseCodes.is_4xx_code),
+                        ("5xx", HTTPResponseCodes.is_5xx_code)):
+        if check(status_code):
+            return name
+    return "other"
+
+
+class LoadReport(object):
+    """
+    The results of :func:`~httpbase.bench.run_load`.
+
+    Attributes:
+        histogram: A :class:`~httpbase.bench.LatencyHistogram` of every request.
+        statuses: Number of requests by :func:`~httpbase.bench.status_class`.
+        throughput: Number of requests completed in each second of the run.
+        duration: Seconds from the start of the run until the last request completed.
+        late: Number of requests of an open loop run that were sent later than scheduled, because every thread was
+            busy. Their latency includes the delay, but a large number means ``max_in_flight`` should be raised.
+        max_lag: The longest delay of a late request in seconds.
+    """
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.histogram = LatencyHistogram()
+        self.statuses: Dict[str, int] = collections.Counter()
+        self.throughput: List[int] = []
+        self.duration = 0.0
+        self.late = 0
+        self.max_lag = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, latency: float, result, completed: float, lag: float):
+        with self._lock:
+            self.histogram.record(latency)
+            self.statuses[status_class(result)] += 1
+            second = int(completed)
+            if second >= len(self.throughput):
+                self.throughput.extend([0] * (second + 1 - len(self.throughput)))
+            self.throughput[second] += 1
+            self.duration = max(self.duration, completed)
+            if lag > 0:
+                self.late += 1
+                self.max_lag = max(self.max_lag, lag)
+
+    @property
+    def requests(self) -> int:
+        return self.histogram.count
+
+    @property
+    def rate(self) -> float:
+        """Requests completed per second over the whole run."""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def format(self) -> str:
+        """Returns the report as text."""
+        histogram = self.histogram
+        lines = [
+            f"mode: {self.mode}",
+            f"requests: {self.requests} in {self.duration:.2f}s ({self.rate:.1f}/s)",
+        ]
+        if self.mode.startswith("open"):
+            lines.append(f"late sends: {self.late} (max lag {self.max_lag * 1000:.2f} ms)")
+        lines += ["", "latency (ms):"]
+        lines.append(f"  min {histogram.min * 1000 if histogram.count else 0:.2f}  mean {histogram.mean * 1000:.2f}"
+                     f"  max {histogram.max * 1000:.2f}")
+        for percent in (50, 90, 99, 99.9):
+            lines.append(f"  p{percent:<5} {histogram.percentile(percent) * 1000:10.2f}")
+        lines += ["", "histogram (ms):"]
+        bars = histogram.bars()
+        peak = max((count for _, _, count in bars), default=0)
+        for low, high, count in bars:
+            bar = "#" * round(40 * count / peak) if peak else ""
+            lines.append(f"  {low * 1000:10.2f} - {high * 1000:10.2f} {count:8d} {bar}")
+        lines += ["", "responses:"]
+        for name, count in sorted(self.statuses.items()):
+            lines.append(f"  {name:<30} {count:8d} {count / self.requests:7.1%}")
+        lines += ["", "throughput (requests/s):"]
+        for second, count in enumerate(self.throughput):
+            lines.append(f"  {second:5d}s {count:8d}")
+        return "\n".join(lines)
+
+
+def run_load(call: Callable, args: Iterable[Dict]=None, rate: float=None, concurrency: int=None,
+             duration: float=10.0, requests: int=None, max_in_flight: int=DEFAULT_MAX_IN_FLIGHT) -> LoadReport:
+    """
+    Call ``call`` repeatedly from many threads and measure how long each call takes.
+
+    With ``rate`` the run is open loop: request ``n`` is scheduled for ``n / rate`` seconds after the start, whether or
+    not earlier requests have completed, and its latency is measured from that scheduled time. A request that is sent
+    late because every thread was busy still counts the time it waited, so a slow server can't hide its latency by
+    slowing down the load generator, which is the coordinated omission problem. With ``concurrency`` the run is
+    closed loop: that many threads each send a request as soon as their previous one completed, and latency is
+    measured from when the request was sent.
+
+    Example::
+
+        client = ItemsClient(baseurl=server.url)
+        report = run_load(client.get_item, ({"item_id": item_id} for item_id in range(10000)), rate=200)
+        print(report.format())
+
+    Args:
+        call: Called with the keyword arguments of each request. Exceptions are counted as errors.
+        args: An iterable of the keyword arguments for each request. The run stops early when it is exhausted. Defaults
+            to no arguments.
+        rate: Requests per second for an open loop run.
+        concurrency: Number of requests in flight for a closed loop run.
+        duration: Seconds to send requests for.
+        requests: Stop after this many requests, even if ``duration`` hasn't passed.
+        max_in_flight: Number of threads sending requests in an open loop run.
+
+    Raises:
+        ValueError: Unless exactly one of ``rate`` or ``concurrency`` is given.
+    """
+    if (rate is None) == (concurrency is None):
+        raise ValueError("exactly one of rate or concurrency is required")
+    if rate is not None and rate <= 0 or concurrency is not None and concurrency < 1:
+        raise ValueError("rate and concurrency must be positive")
+    arguments = iter(args) if args is not None else itertools.repeat({})
+    limit = requests if requests is not None else math.inf
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def next_request() -> Optional[Tuple[int, Dict]]:
+        with lock:
+            index = next(counter)
+            if index >= limit:
+                return None
+            try:
+                return index, next(arguments)
+            except StopIteration:
+                return None
+
+    if rate is not None:
+        report = LoadReport(f"open loop, {rate:g} requests/s")
+        threads = max_in_flight
+    else:
+        report = LoadReport(f"closed loop, {concurrency} in flight")
+        threads = concurrency
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def send(kwargs: Dict, scheduled: float):
+        sent = time.perf_counter()
+        try:
+            result = call(**kwargs)
+        except Exception as err:
+            result = err
+        completed = time.perf_counter()
+        # Lag under 1ms is scheduler jitter rather than the generator falling behind
+        lag = sent - scheduled if sent - scheduled > 0.001 else 0.0
+        report._record(completed - scheduled, result, completed - start, lag)
+
+    def open_loop():
+        while True:
+            request = next_request()
+            if request is None:
+                return
+            index, kwargs = request
+            scheduled = start + index / rate
+            if scheduled >= deadline:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            send(kwargs, scheduled)
+
+    def closed_loop():
+        while time.perf_counter() < deadline:
+            request = next_request()
+            if request is None:
+                return
+            send(request[1], time.perf_counter())
+
+    workers = [threading.Thread(target=open_loop if rate is not None else closed_loop, daemon=True)
+               for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return report
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        server = self.server
+        if server.delay:
+            time.sleep(server.delay)
+        self.send_response(server.status)
+        self.send_header("Content-Type", server.content_type)
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(server.body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections when many threads connect at once, which shows up as 1s latencies
+    request_queue_size = 1024
+    connections = 0
+
+    def process_request(self, request, client_address):
+        # Only called from the thread accepting connections
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class StandInServer(object):
+    """
+    An HTTP server on a free local port that gives every request the same response, for running load against
+    without a real upstream. It runs in background threads until the ``with`` block exits.
+
+    Example::
+
+        with StandInServer(delay=0.005) as server:
+            client = ItemsClient(baseurl=server.url)
+
+    Args:
+        status: The status code of every response.
+        body: The body of every response.
+        content_type: The ``Content-Type`` of every response.
+        delay: Seconds to wait before responding, to stand in for the time an upstream takes.
+    """
+    def __init__(self, status: int=HTTPResponseCodes.OK, body: bytes=b"{}", content_type: str="application/json",
+                 delay: float=0.0):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.delay = delay
+        self.url = None
+        self._server = None
+
+    def __enter__(self) -> "StandInServer":
+        server = self._server = _StandInHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        server.status, server.body, server.content_type, server.delay = (
+            self.status, self.body, self.content_type, self.delay
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:{}".format(server.server_address[1])
+        return self
+
+    @property
+    def connections(self) -> int:
+        """The number of connections the server has accepted, to check how well clients reuse them."""
+        return self._server.connections
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _import(path: str):
+    """Returns the object at ``path``, given as ``package.module:name``."""
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError(f"expected package.module:name, got {path!r}")
+    value = importlib.import_module(module_name)
+    for attr in name.split("."):
+        value = getattr(value, attr)
+    return value
+
+
+def main(argv: List[str]=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m httpbase.bench", description="Load generator for httpbase clients.")
+    parser.add_argument("client", help="the client class, as package.module:ClassName")
+    parser.add_argument("method", help="the name of the client method to call")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--rate", type=float, help="requests per second, open loop")
+    mode.add_argument("--concurrency", type=int, help="requests in flight, closed loop")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run for (default: %(default)s)")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="threads sending requests in open loop mode (default: %(default)s)")
+    arguments = parser.add_mutually_exclusive_group()
+    arguments.add_argument("--args", metavar="PATH",
+                           help="a function, as package.module:name, returning an iterable of kwargs for each request")
+    arguments.add_argument("--kwargs", type=json.loads, default={},
+                           help="kwargs for every request, as a JSON object")
+    parser.add_argument("--client-kwargs", type=json.loads, default={},
+                        help="kwargs for the client constructor, as a JSON object")
+    parser.add_argument("--local", action="store_true", help="send the requests to a local stand-in server")
+    parser.add_argument("--local-status", type=int, default=HTTPResponseCodes.OK,
+                        help="status code of the stand-in server (default: %(default)s)")
+    parser.add_argument("--local-delay", type=float, default=0.0,
+                        help="seconds the stand-in server waits before responding (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    client_class = _import(args.client)
+    if args.args:
+        request_args = _import(args.args)()
+    else:
+        request_args = itertools.repeat(args.kwargs)
+    load = dict(args=request_args, rate=args.rate, concurrency=args.concurrency, duration=args.duration,
+                requests=args.requests, max_in_flight=args.max_in_flight)
+    if args.local:
+        with StandInServer(status=args.local_status, delay=args.local_delay) as server:
+            client = client_class(**dict(args.client_kwargs, baseurl=server.url))
+            report = run_load(getattr(client, args.method), **load)
+    else:
+        client = client_class(**args.client_kwargs)
+        report = run_load(getattr(client, args.method), **load)
+    print(report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+Record the requests a client sends and the responses it gets in to a cassette file, and replay them later without a
+network. Cassettes are append only binary files read through ``mmap``, so a cassette of millions of requests opens in
+about a second and replaying a response only reads that response from disk.
+
+Example::
+
+    with RecordingTransport("traffic.cassette") as recorder:
+        client = MyClient(transport=recorder)
+        run_workload(client)
+
+    client = MyClient(transport=ReplayTransport("traffic.cassette", simulate_latency=True))
+    run_workload(client)
+
+A cassette starts with ``MAGIC`` followed by one record per interaction. A record is a ``_RECORD`` header with the
+status code, the length of each section and the time the request took, followed by the sections: method, reason, URL,
+request headers, request body, response headers and response body. Headers are UTF-8 ``Name: value`` lines separated
+by ``\\r\\n``. A record cut short by a crash while it was written is ignored.
+"""
+import mmap
+import struct
+import threading
+import time
+from array import array
+from typing import Dict, List, NamedTuple, Tuple, Union
+
+import requests
+from requests.models import PreparedRequest
+
+from .exceptions import CassetteError
+from .transports import _body_bytes, build_response
+
+MAGIC = b"HBCAS01\n"
+
+# status, then the length of the method, reason, URL, request headers, request body, response headers and response
+# body, then the seconds the request took
+_RECORD = struct.Struct("<HHHIIIIId")
+
+_Headers = List[Tuple[str, str]]
+
+
+class Interaction(NamedTuple):
+    """One request and its response."""
+    method: str
+    url: str
+    request_headers: _Headers
+    request_body: bytes
+    status: int
+    reason: str
+    response_headers: _Headers
+    response_body: bytes
+    elapsed: float
+
+
+def _encode_headers(headers: _Headers) -> bytes:
+    return "\r\n".join(f"{name}: {value}" for name, value in headers).encode("utf-8")
+
+
+def _decode_headers(data: bytes) -> _Headers:
+    if not data:
+        return []
+    return [tuple(line.split(": ", 1)) for line in data.decode("utf-8").split("\r\n")]
+
+
+def _full_url(url: str, params=None) -> str:
+    """Returns ``url`` with ``params`` added and normalized the way ``requests`` sends it."""
+    prepared = PreparedRequest()
+    prepared.prepare_url(url, params)
+    return prepared.url
+
+
+class CassetteWriter(object):
+    """
+    Appends interactions to a cassette file, creating it if it doesn't exist. Writes are buffered, call
+    :func:`~httpbase.cassettes.CassetteWriter.close` or use the writer as a context manager to write everything out.
+
+    Raises:
+        CassetteError: If the file exists and isn't a cassette.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            with open(path, "rb") as existing:
+                if existing.read(len(MAGIC)) != MAGIC:
+                    self._file.close()
+                    raise CassetteError(f"{path} isn't a cassette")
+
+    def write(self, interaction: Interaction):
+        """Append an interaction to the cassette."""
+        sections = (
+            interaction.method.encode("ascii"),
+            interaction.reason.encode("utf-8"),
+            interaction.url.encode("utf-8"),
+            _encode_headers(interaction.request_headers),
+            interaction.request_body,
+            _encode_headers(interaction.response_headers),
+            interaction.response_body,
+        )
+        header = _RECORD.pack(interaction.status, *map(len, sections), interaction.elapsed)
+        with self._lock:
+            self._file.write(header)
+            self._file.writelines(sections)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "CassetteWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Cassette(object):
+    """
+    Read only view of a cassette file. Opening a cassette scans the record headers to find where each record starts,
+    bodies are only read when they are used.
+
+    Example::
+
+        cassette = Cassette("traffic.cassette")
+        len(cassette)
+        1000000
+        cassette[0].url
+        'http://example.com/api/items/1'
+
+    Raises:
+        CassetteError: If the file isn't a cassette.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as cassette:
+            if cassette.read(len(MAGIC)) != MAGIC:
+                raise CassetteError(f"{path} isn't a cassette")
+            self._data = mmap.mmap(cassette.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = self._scan()
+
+    def _scan(self) -> array:
+        offsets = array("Q")
+        data = self._data
+        size = len(data)
+        header_size = _RECORD.size
+        unpack_from = _RECORD.unpack_from
+        position = len(MAGIC)
+        while position + header_size <= size:
+            end = position + header_size + sum(unpack_from(data, position)[1:8])
+            if end > size:
+                break
+            offsets.append(position)
+            position = end
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _sections(self, index: int) -> Tuple[tuple, List[int]]:
+        position = self.offsets[index]
+        fields = _RECORD.unpack_from(self._data, position)
+        starts = [position + _RECORD.size]
+        for length in fields[1:8]:
+            starts.append(starts[-1] + length)
+        return fields, starts
+
+    def __getitem__(self, index: int) -> Interaction:
+        fields, starts = self._sections(index)
+        data = self._data
+        method, reason, url, request_headers, request_body, response_headers, response_body = (
+            data[start:end] for start, end in zip(starts, starts[1:])
+        )
+        return Interaction(method.decode("ascii"), url.decode("utf-8"), _decode_headers(request_headers), request_body,
+                           fields[0], reason.decode("utf-8"), _decode_headers(response_headers), response_body,
+                           fields[8])
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def request_key(self, index: int) -> Tuple[str, str]:
+        """Returns the method and URL of the request of an interaction."""
+        fields, starts = self._sections(index)
+        data = self._data
+        return data[starts[0]:starts[1]].decode("ascii"), data[starts[2]:starts[3]].decode("utf-8")
+
+    def response(self, index: int) -> Tuple[int, str, _Headers, bytes, float, str]:
+        """Returns the status, reason, headers, body and elapsed time of a response and the URL of its request."""
+        fields, starts = self._sections(index)
+        data = self._data
+        return (fields[0], data[starts[1]:starts[2]].decode("utf-8"), _decode_headers(data[starts[5]:starts[6]]),
+                data[starts[6]:starts[7]], fields[8], data[starts[2]:starts[3]].decode("utf-8"))
+
+    def close(self):
+        self._data.close()
+
+
+class RecordingTransport(object):
+    """
+    Transport that sends requests with another transport and records each request and response in a cassette.
+    Response bodies are read before the response is returned, so streamed responses are recorded too. Streamed request
+    bodies are recorded as empty because they are consumed as they are sent. Requests that raise aren't recorded.
+
+    Args:
+        cassette: The path of the cassette or a ``CassetteWriter``. Interactions are appended to an existing cassette.
+        transport: The transport that sends the requests. Defaults to ``requests``.
+    """
+    def __init__(self, cassette: Union[str, CassetteWriter], transport=None):
+        self.writer = cassette if isinstance(cassette, CassetteWriter) else CassetteWriter(cassette)
+        self.transport = transport
+
+    def __call__(self, method: str, url: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        send = self.transport if self.transport is not None else requests.request
+        response = send(method, url, **kwargs)
+        content = response.content or b""
+        elapsed = time.perf_counter() - start
+        request = response.request
+        if request is None:
+            # The transport didn't say what it sent, so record the request the way ``requests`` would have sent it
+            request = requests.Request(method, url, headers=kwargs.get("headers"), files=kwargs.get("files"),
+                                       data=kwargs.get("data"), json=kwargs.get("json")).prepare()
+        # Files and generators were consumed when the request was sent and are recorded as empty
+        self.writer.write(Interaction(
+            method.upper(), _full_url(url, kwargs.get("params")), list(request.headers.items()),
+            _body_bytes(request.body),
+            response.status_code, response.reason or "", list(response.headers.items()), content, elapsed,
+        ))
+        return response
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self) -> "RecordingTransport":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayTransport(object):
+    """
+    Transport that answers requests with the responses recorded in a cassette, without a network.
+
+    With ``match="request"`` each request gets the next recorded response for the same method and URL, including the
+    query string. With ``match="sequence"`` requests get the recorded responses in the order they were recorded,
+    whatever was requested, which is the fastest way to drive a benchmark with recorded traffic.
+
+    Args:
+        cassette: The path of the cassette or a ``Cassette``.
+        match: ``"request"`` or ``"sequence"``.
+        repeat: Start from the first matching response again once they have all been used. Otherwise a
+            ``CassetteError`` is raised.
+        simulate_latency: Wait as long as the recorded request took before returning each response.
+        latency_scale: Multiplies the simulated latency, ``0.5`` replays at twice the original speed.
+
+    Raises:
+        CassetteError: If a request has no recorded response.
+    """
+    def __init__(self, cassette: Union[str, Cassette], match: str="request", repeat: bool=True,
+                 simulate_latency: bool=False, latency_scale: float=1.0):
+        if match not in ("request", "sequence"):
+            raise ValueError("match must be 'request' or 'sequence'")
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette(cassette)
+        self.match = match
+        self.repeat = repeat
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._position = 0
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self._index: Dict[Tuple[str, str], List[int]] = None
+
+    def _build_index(self) -> Dict[Tuple[str, str], List[int]]:
+        index = {}
+        for record in range(len(self.cassette)):
+            index.setdefault(self.cassette.request_key(record), []).append(record)
+        return index
+
+    def _next(self, method: str, url: str) -> int:
+        with self._lock:
+            if self.match == "sequence":
+                records, key = range(len(self.cassette)), None
+                position = self._position
+            else:
+                if self._index is None:
+                    self._index = self._build_index()
+                key = (method.upper(), url)
+                records = self._index.get(key, ())
+                position = self._positions.get(key, 0)
+            if not records:
+                raise CassetteError(f"no recorded response for {method} {url}")
+            if position >= len(records):
+                if not self.repeat:
+                    raise CassetteError(f"all recorded responses for {method} {url} have been used")
+                position = 0
+            if key is None:
+                self._position = position + 1
+            else:
+                self._positions[key] = position + 1
+            return records[position]
+
+    def __call__(self, method: str, url: str, **kwargs) -> requests.Response:
+        if self.match == "request":
+            url = _full_url(url, kwargs.get("params"))
+        status, reason, headers, body, elapsed, recorded_url = self.cassette.response(self._next(method, url))
+        if self.simulate_latency:
+            time.sleep(elapsed * self.latency_scale)
+        return build_response(status, reason, headers, body, recorded_url, elapsed=elapsed)
@@ -1,24 +1,71 @@
-import json
+import functools
+import warnings
+from contextlib import closing
+from typing import Callable, Iterator
 
 import requests
 
+from . import forks
+from .codecs import Codec, JSONCodec, get_codec, get_codec_for_content_type
 from .constants import HTTPResponseCodes, _RequestsKwargs
-from .exceptions import ConfigurationError, RouteError
+from .exceptions import ConfigurationError, RouteError, TenantCapacityError
 from .routes import Route
+from .streaming import NDJSON_CONTENT_TYPES, encode_json_array, encode_ndjson, iter_json_array, iter_ndjson
 
 
 _request_kwargs = _RequestsKwargs()
 
 
-def _get_error_response(code: int, message: str) -> requests.Response:
+def _get_error_response(code: int, message: str, codec: Codec=None) -> requests.Response:
     """"""
+    codec = get_codec(codec)
     resp = requests.Response()
     resp.status_code = code
-    resp.headers = {"Content-Type": "application/json"}
-    resp._content = json.dumps({"message": "error making request: {}".format(message)}).encode()
+    resp.headers = {"Content-Type": codec.content_type}
+    resp._content = codec.encode({"message": "error making request: {}".format(message)})
     return resp
 
 
+def _release_when_read(response: requests.Response, release: Callable[[], None]) -> requests.Response:
+    """
+    Calls ``release`` once, when the whole body of a streamed ``response`` has been read with ``iter_content``, when
+    reading it fails or when the response is closed.
+    """
+    token = [None]
+
+    def release_once():
+        try:
+            # Popping is atomic, so only one caller gets the token
+            token.pop()
+        except IndexError:
+            return
+        release()
+
+    close = response.close
+    iter_content = response.iter_content
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            release_once()
+
+    def iter_content_and_release(*args, **kwargs):
+        try:
+            yield from iter_content(*args, **kwargs)
+        except GeneratorExit:
+            # Reading stopped part way, the rest of the body is transferred until the response is closed
+            raise
+        except BaseException:
+            release_once()
+            raise
+        release_once()
+
+    response.close = close_and_release
+    response.iter_content = iter_content_and_release
+    return response
+
+
 class HTTPBaseClient(object):
     """Base class for HTTP clients.
 
@@ -64,24 +111,121 @@ class HTTPBaseClient(object):
 
     Methods:
          __init__(*list, **dict) -> HTTPBaseClient
+         after_fork() -> None
+         _warm_after_fork() -> None
+         warm(int, Route, **dict) -> int
          _inject_headers(dict[str, str]) -> dict
          _is_requests_kwarg(str) -> bool
          _strip_route_kwargs(dict) -> dict
+         _prep_streaming_body(dict, Iterable[Resource], bool) -> dict
+         _get_codec(Route) -> Codec
+         _decode_response(requests.Response, Route) -> Any
          _prep_request(**dict) -> dict
+         _prep_codec(Route, dict) -> dict
          _make_request(Route, **dict) -> requests.Response
+         _stream_request(Route, **dict) -> Iterator
     """
     baseurl = None
+    tenant_scheduler = None
+    # Sends the requests. Any callable with the signature of ``requests.request``, like the transports in
+    # :mod:`httpbase.transports`. ``None`` sends them with ``requests``, which opens a new connection for every request.
+    # A ``SessionTransport`` keeps connections open
+    transport = None
+    # The codec for request and response bodies. Either a ``Codec``, the name of one, or ``None`` for the default codec.
+    # See :mod:`httpbase.codecs`
+    codec = None
+    # The number of connections opened in each child process after a fork, before the first request the client sends
+    # there, and the route sent to open them. ``0`` doesn't open any. See
+    # :func:`~httpbase.client.HTTPBaseClient.after_fork`
+    warm_connections = 0
+    warm_route = None
+    # Holds a token while a warm up after a fork is pending. Whoever pops it warms up
+    _pending_warm = ()
 
     def __init__(self, *args, **kwargs):
         self.baseurl = kwargs.get("baseurl", self.baseurl)
+        self.tenant_scheduler = kwargs.get("tenant_scheduler", self.tenant_scheduler)
+        self.transport = kwargs.get("transport", self.transport)
+        self.codec = kwargs.get("codec", self.codec)
+        self.warm_connections = kwargs.get("warm_connections", self.warm_connections)
+        self.warm_route = kwargs.get("warm_route", self.warm_route)
 
         if self.baseurl is None:
             raise ConfigurationError(
                 "'baseurl' must be provided as a class attribute or as a keyword argument to __init__"
             )
+        forks.register_client(self)
 
     ConfigurationError = ConfigurationError
 
+    def after_fork(self):
+        """
+        Hook called in a child process right after a fork, once the connection pools of the transports and the tenant
+        scheduler have been reset. It runs before ``fork()`` returns in the child, where network calls and threads can
+        deadlock on locks held by threads of the parent, so it only marks the client to open ``warm_connections``
+        connections with :func:`~httpbase.client.HTTPBaseClient.warm` before the first request it sends in the child.
+        Calling ``warm()`` directly does the same ahead of that. Override it to reset more state, but keep it as cheap.
+        """
+        if self.warm_connections:
+            self._pending_warm = [None]
+
+    def _warm_after_fork(self):
+        """
+        Warm up once after a fork if it's still pending. If it fails a ``RuntimeWarning`` is issued and requests are
+        sent anyway.
+        """
+        try:
+            # Popping is atomic, so only one caller warms up
+            self._pending_warm.pop()
+        except IndexError:
+            return
+        try:
+            self.warm(self.warm_connections, self.warm_route)
+        except Exception as err:
+            # The requests that follow open their own connections
+            warnings.warn(f"warming up {self.baseurl} after fork failed: {err!r}", RuntimeWarning)
+
+    def warm(self, connections: int=1, route: Route=None, **kwargs) -> int:
+        """
+        Open connections to the base URL ahead of the first requests, so they don't all pay for DNS, TCP and TLS setup
+        at once after a deploy or a scale out. Connections are kept open by the ``transport`` of the client, which has
+        to be one that pools them, like :class:`~httpbase.transports.SessionTransport`.
+
+        Example::
+
+            client = MyClient(baseurl="https://example.com", transport=SessionTransport(pool_maxsize=8))
+            client.warm(connections=8, route=Route("/health", HTTPMethods.HEAD))
+
+        Args:
+            connections: The number of connections to have open.
+            route: A cheap route, like a ``HEAD`` or ``OPTIONS`` route, sent ``connections`` times at once before the
+                connections are topped up. It also warms up the server and anything on the way to it. It's the only
+                thing sent when the transport doesn't pool connections.
+            kwargs: The kwargs for :func:`~httpbase.client.HTTPBaseClient._make_request` when sending ``route``.
+
+        Returns:
+            The number of idle connections to the base URL, ``0`` if the transport doesn't pool connections.
+
+        Raises:
+            ConfigurationError: If there is no ``route`` and the transport doesn't pool connections.
+            ValueError: If ``connections`` is less than ``1``.
+        """
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        if self._pending_warm:
+            # Warming up directly replaces the one pending after a fork
+            self._pending_warm = ()
+        warm = getattr(self.transport, "warm", None)
+        if warm is None and route is None:
+            raise ConfigurationError("warming up needs a route or a transport that keeps connections open")
+        if route is not None:
+            # Imported here because concurrent.futures imports logging, which only clients that warm up need
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=connections) as executor:
+                for response in list(executor.map(lambda _: self._make_request(route, **kwargs), range(connections))):
+                    response.close()
+        return warm(self.baseurl, connections) if warm is not None else 0
+
     def _inject_headers(self, req_kwargs: dict) -> dict:
         """
         Inject any additional headers users may not have added or shouldn't need to know about. This method can and
@@ -116,6 +260,76 @@ class HTTPBaseClient(object):
         """
         return {key: value for key, value in kwargs.items() if self._is_requests_kwarg(key)}
 
+    def _prep_streaming_body(self, req_kwargs: dict, resources, ndjson: bool=False) -> dict:
+        """
+        Set the body of the request to a generator that serializes ``resources`` as they are sent. ``requests`` sends
+        generators with chunked transfer encoding, so the whole payload is never held in memory.
+
+        Args:
+            req_kwargs: The kwargs for ``requests``.
+            resources: An iterable of ``Resource`` objects.
+            ndjson: ``True`` to send newline delimited JSON instead of a JSON array.
+        """
+        if ndjson:
+            req_kwargs["data"] = encode_ndjson(resources)
+            content_type = NDJSON_CONTENT_TYPES[0]
+        else:
+            req_kwargs["data"] = encode_json_array(resources)
+            content_type = "application/json"
+        headers = dict(req_kwargs.get("headers") or {})
+        headers.setdefault("Content-Type", content_type)
+        req_kwargs["headers"] = headers
+        return req_kwargs
+
+    def _get_codec(self, route: Route=None) -> Codec:
+        """
+        Returns the :class:`~httpbase.codecs.Codec` for request and response bodies, which is the codec of ``route``
+        if it has one and the codec of the client otherwise.
+        """
+        if route is not None and route.codec is not None:
+            return get_codec(route.codec)
+        return get_codec(self.codec)
+
+    def _decode_response(self, response: requests.Response, route: Route=None):
+        """
+        Decode the body of a response. The codec is picked from the ``Content-Type`` of the response, falling back to
+        the codec of ``route`` or the client when the content type isn't one of a registered codec.
+
+        Example::
+
+            response = self._make_request(routes.get_post, post_id=post_id)
+            post = PostResource.from_dict(self._decode_response(response, routes.get_post))
+
+        Raises:
+            ValueError: If the body can't be decoded.
+        """
+        codec = get_codec_for_content_type(response.headers.get("Content-Type", ""))
+        if codec is None:
+            codec = self._get_codec(route)
+        return codec.decode(response.content)
+
+    def _prep_codec(self, route: Route, req_kwargs: dict) -> dict:
+        """
+        Negotiate the format of the request and response bodies with the codec of ``route`` or the client. The ``json``
+        kwarg is encoded with the codec and sent as ``data`` with a matching ``Content-Type``, and an ``Accept`` header
+        asks for responses in the same format. Headers that are already set are kept. ``requests`` already handles
+        ``json`` for the standard library JSON codec, so nothing is changed for it.
+
+        Args:
+            route: The route for the request.
+            req_kwargs: The kwargs for ``requests``.
+        """
+        codec = self._get_codec(route)
+        if type(codec) is JSONCodec:
+            return req_kwargs
+        headers = dict(req_kwargs.get("headers") or {})
+        if req_kwargs.get("json") is not None:
+            req_kwargs["data"] = codec.encode(req_kwargs.pop("json"))
+            headers.setdefault("Content-Type", codec.content_type)
+        headers.setdefault("Accept", codec.content_type)
+        req_kwargs["headers"] = headers
+        return req_kwargs
+
     def _prep_request(self, **kwargs) -> dict:
         """
         Remove kwargs that ``requests`` will choke on and add any missing required headers.
@@ -125,6 +339,8 @@ class HTTPBaseClient(object):
             **kwargs:
         """
         req_kwargs = self._strip_route_kwargs(kwargs)
+        if kwargs.get("stream_resources") is not None:
+            req_kwargs = self._prep_streaming_body(req_kwargs, kwargs["stream_resources"], kwargs.get("ndjson", False))
         req_kwargs = self._inject_headers(req_kwargs)
         return req_kwargs
 
@@ -135,7 +351,8 @@ class HTTPBaseClient(object):
               we care about (query params and URL templating variables).
             - Injects required headers (auth and content type).
             - Formats the full URL. Formats in things like resource ID's and attaches query params.
-            - Finally sends request and returns the response.
+            - Finally sends request and returns the response. The request is sent with the ``transport`` of the client
+              if it has one and with ``requests`` otherwise.
 
         Args:
             route: The route for the request. Contains the path, HTTP method, template variable names for the URL and
@@ -144,7 +361,7 @@ class HTTPBaseClient(object):
         Keyword Args:
             params:  Dictionary or bytes to be sent in the query string for the request.
             data:  Dictionary, bytes, or file-like object to send in the body of the request.
-            json:  json to send in the body of the request.
+            json:  A value to send in the body of the request. Encoded with the codec of the route or the client.
             headers:  Dictionary of HTTP Headers to send with the
             cookies:  Dict or CookieJar object to send with the
             files:  Dictionary of ``'filename': file-like-objects`` for multipart encoding upload.
@@ -157,11 +374,85 @@ class HTTPBaseClient(object):
             verify:  Either a boolean, in which case it controls whether we verify the server's TLS certificate,
                 or a string, in which case it must be a path to a CA bundle to use. Defaults to ``True``.
             cert:  if String, path to ssl client cert file (.pem). If Tuple, ('cert', 'key') pair.
+            stream_resources: An iterable of ``Resource`` objects to send as the body. They are serialized one at a time
+                as the request is sent, as a JSON array or as newline delimited JSON if ``ndjson`` is ``True``.
+            tenant: The key of the tenant the request is made on behalf of. Only used when the client has a
+                ``tenant_scheduler``, in which case the request waits for a slot for that tenant before being sent.
+                With ``stream=True`` the slot is held until the body has been read or the response is closed.
             kwargs: any additional kwargs your client specific client methods might need.
         """
-        req_kwargs = self._prep_request(**kwargs)
+        if self._pending_warm:
+            self._warm_after_fork()
+        req_kwargs = self._prep_codec(route, self._prep_request(**kwargs))
         try:
             url = route.get_url(self.baseurl, **kwargs)
-            return requests.request(route.method, url, **req_kwargs)
+            send = self.transport if self.transport is not None else requests.request
+            if self.tenant_scheduler is None:
+                return send(route.method, url, **req_kwargs)
+            tenant = kwargs.get("tenant")
+            if not req_kwargs.get("stream"):
+                with self.tenant_scheduler.slot(tenant):
+                    return send(route.method, url, **req_kwargs)
+            # The body of a streamed response is read after this returns, so the slot is held until it has been
+            self.tenant_scheduler.acquire(tenant)
+            try:
+                response = send(route.method, url, **req_kwargs)
+            except BaseException:
+                self.tenant_scheduler.release(tenant)
+                raise
+            return _release_when_read(response, functools.partial(self.tenant_scheduler.release, tenant))
         except RouteError as err:
-            return _get_error_response(HTTPResponseCodes.BAD_REQUEST, str(err))
+            return _get_error_response(HTTPResponseCodes.BAD_REQUEST, str(err), self._get_codec(route))
+        except TenantCapacityError as err:
+            return _get_error_response(HTTPResponseCodes.TOO_MANY_REQUESTS, str(err), self._get_codec(route))
+
+    def _stream_request(self, route: Route, resource_class: type=None, ndjson: bool=None, chunk_size: int=65536,
+                        **kwargs) -> Iterator:
+        """
+        Make a request with ``stream=True`` and decode the response body incrementally, yielding one item at a time.
+        The body must either be a JSON array or newline delimited JSON. Memory use is bounded by the size of the
+        largest item rather than by the size of the response.
+
+        Example::
+
+            class EventsClient(HTTPBaseClient):
+                def export_events(self):
+                    return self._stream_request(routes.export_events, resource_class=EventResource)
+
+            for event in client.export_events():
+                print(event.event_id.value)
+
+        Args:
+            route: The route for the request.
+            resource_class: If given each item is decoded in to an instance of this ``Resource`` class with
+                :func:`~httpbase.resources.Resource.from_dict`. Otherwise the decoded JSON values are yielded.
+            ndjson: ``True`` for newline delimited JSON, ``False`` for a JSON array. By default it's picked from the
+                ``Content-Type`` of the response. Each line of newline delimited JSON is decoded with the codec of the
+                route or client when that is a JSON codec, JSON arrays are always decoded incrementally with the
+                standard library.
+            chunk_size: Number of bytes read from the response at a time.
+            kwargs: The same kwargs :func:`~httpbase.client.HTTPBaseClient._make_request` accepts.
+
+        Raises:
+            requests.HTTPError: If the response doesn't have a 2xx status code.
+            ValueError: If the body isn't valid JSON.
+        """
+        kwargs["stream"] = True
+        response = self._make_request(route, **kwargs)
+        with closing(response):
+            response.raise_for_status()
+            if ndjson is None:
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                ndjson = content_type in NDJSON_CONTENT_TYPES
+            if ndjson:
+                codec = self._get_codec(route)
+                codec = codec if isinstance(codec, JSONCodec) else None
+                items = iter_ndjson(response.iter_content(chunk_size), codec=codec)
+            else:
+                items = iter_json_array(response.iter_content(chunk_size))
+            if resource_class is None:
+                yield from items
+            else:
+                from_dict = resource_class.from_dict
+                for item in items:
+                    yield from_dict(item)
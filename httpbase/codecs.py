@@ -0,0 +1,573 @@
+import json
+import struct
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import Dict, Optional, Tuple, Union
+
+from .exceptions import ConfigurationError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+_DOUBLE = struct.Struct(">d")
+
+_END = object()
+
+
+def _json_key(key) -> str:
+    """Returns a dictionary key as the string ``json.dumps`` would use for it."""
+    if isinstance(key, str):
+        return key
+    if key is True or key is False or key is None:
+        return json.dumps(key)
+    if isinstance(key, float):
+        return json.dumps(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+
+def _dumps_iteratively(value, separators: Tuple[str, str]=(", ", ": "), ensure_ascii: bool=True) -> str:
+    """
+    Encodes ``value`` as JSON like ``json.dumps`` without recursing, for values nested deeper than the recursion limit.
+    Only encodes the types ``json.dumps`` encodes by default, and doesn't check for circular references, so it's only
+    used once ``json.dumps`` has failed with a ``RecursionError``, which it raises before looping on a cycle.
+    """
+    item_separator, key_separator = separators
+    encode_string = encode_basestring_ascii if ensure_ascii else encode_basestring
+    parts = []
+    # Each entry is an iterator over the items of an open container, whether it's a dict and whether it's empty so far
+    stack = []
+    while True:
+        if isinstance(value, dict):
+            parts.append("{")
+            stack.append([iter(value.items()), True, True])
+        elif isinstance(value, (list, tuple)):
+            parts.append("[")
+            stack.append([iter(value), False, True])
+        else:
+            parts.append(json.dumps(value, ensure_ascii=ensure_ascii))
+        while stack:
+            entry = stack[-1]
+            item = next(entry[0], _END)
+            if item is _END:
+                parts.append("}" if entry[1] else "]")
+                stack.pop()
+                continue
+            if not entry[2]:
+                parts.append(item_separator)
+            entry[2] = False
+            if entry[1]:
+                key, value = item
+                parts.append(encode_string(_json_key(key)))
+                parts.append(key_separator)
+            else:
+                value = item
+            break
+        else:
+            return "".join(parts)
+
+
+class Codec(object):
+    """
+    Base class for the codecs that turn serialized resources in to request bodies and response bodies back in to
+    Python values. Subclasses set ``name`` and ``content_type`` and implement ``encode`` and ``decode``.
+    """
+    name: str = None
+    content_type: str = None
+
+    def encode(self, value) -> bytes:
+        """Returns ``value`` encoded as ``bytes`` ready to be sent."""
+        raise NotImplementedError
+
+    def dumps(self, value) -> str:
+        """Returns ``value`` encoded as a ``str``."""
+        return self.encode(value).decode()
+
+    def decode(self, data: Union[bytes, str]):
+        """Returns the value encoded in ``data``."""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.name}>"
+
+
+class JSONCodec(Codec):
+    """JSON codec using the ``json`` module from the standard library. This is the default."""
+    name = "json"
+    content_type = "application/json"
+
+    def dumps(self, value) -> str:
+        """Returns ``value`` encoded as a JSON ``str``. Values of any depth can be encoded."""
+        try:
+            return json.dumps(value)
+        except RecursionError:
+            return _dumps_iteratively(value)
+
+    def encode(self, value) -> bytes:
+        return self.dumps(value).encode()
+
+    def decode(self, data: Union[bytes, str]):
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    JSON codec using `orjson <https://github.com/ijl/orjson>`_, which encodes straight to ``bytes`` and is several
+    times faster than the standard library. The output is compact and non-ASCII characters aren't escaped, so it isn't
+    byte for byte the same as :class:`~httpbase.codecs.JSONCodec`. Non-string keys are converted to strings like the
+    standard library does.
+
+    Raises:
+        ConfigurationError: If orjson isn't installed.
+    """
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ConfigurationError("the orjson codec requires orjson to be installed")
+        self.options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value) -> str:
+        return self.encode(value).decode()
+
+    def encode(self, value) -> bytes:
+        try:
+            return orjson.dumps(value, option=self.options)
+        except orjson.JSONEncodeError as err:
+            # orjson can't encode values nested more than 255 levels deep
+            if "recursion" not in str(err).lower():
+                raise
+            return _dumps_iteratively(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def decode(self, data: Union[bytes, str]):
+        return orjson.loads(data)
+
+
+def _as_bytes(data: Union[bytes, bytearray, memoryview]) -> bytes:
+    if isinstance(data, str):
+        raise TypeError("binary codecs decode bytes, not str")
+    return bytes(data)
+
+
+def _read(data: bytes, pos: int, size: int) -> Tuple[bytes, int]:
+    chunk = data[pos:pos + size]
+    if len(chunk) != size:
+        raise ValueError(f"truncated data at offset {pos}")
+    return chunk, pos + size
+
+
+def _msgpack_length(out: bytearray, length: int, fixed: Optional[int], fixed_limit: int, markers: Tuple):
+    """Write the header of a MessagePack str, bin, array or map of ``length`` items using the smallest format."""
+    if fixed is not None and length < fixed_limit:
+        out.append(fixed | length)
+        return
+    for marker, size in zip(markers, (1, 2, 4)):
+        if marker is not None and length < 1 << (8 * size):
+            out.append(marker)
+            out += length.to_bytes(size, "big")
+            return
+    raise ValueError(f"too many items for MessagePack: {length}")
+
+
+def _msgpack_pack(value, out: bytearray):
+    if value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80 or -0x20 <= value < 0:
+            out.append(value & 0xFF)
+        elif 0 <= value < 1 << 64:
+            for marker, size in ((0xCC, 1), (0xCD, 2), (0xCE, 4), (0xCF, 8)):
+                if value < 1 << (8 * size):
+                    out.append(marker)
+                    out += value.to_bytes(size, "big")
+                    break
+        elif -(1 << 63) <= value < 0:
+            for marker, size in ((0xD0, 1), (0xD1, 2), (0xD2, 4), (0xD3, 8)):
+                if value >= -(1 << (8 * size - 1)):
+                    out.append(marker)
+                    out += value.to_bytes(size, "big", signed=True)
+                    break
+        else:
+            raise ValueError(f"integer out of range for MessagePack: {value}")
+    elif isinstance(value, float):
+        out.append(0xCB)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        _msgpack_length(out, len(encoded), 0xA0, 32, (0xD9, 0xDA, 0xDB))
+        out += encoded
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _msgpack_length(out, len(value), None, 0, (0xC4, 0xC5, 0xC6))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        _msgpack_length(out, len(value), 0x90, 16, (None, 0xDC, 0xDD))
+        for item in value:
+            _msgpack_pack(item, out)
+    elif isinstance(value, dict):
+        _msgpack_length(out, len(value), 0x80, 16, (None, 0xDE, 0xDF))
+        for key, item in value.items():
+            _msgpack_pack(key, out)
+            _msgpack_pack(item, out)
+    else:
+        raise TypeError(f"Object of type {value.__class__.__name__} is not MessagePack serializable")
+
+
+# Kind and size in bytes of the MessagePack formats that are followed by a fixed size value or length
+_MSGPACK_FORMATS = {
+    0xC4: ("bin", 1), 0xC5: ("bin", 2), 0xC6: ("bin", 4),
+    0xCA: ("float", 4), 0xCB: ("float", 8),
+    0xCC: ("uint", 1), 0xCD: ("uint", 2), 0xCE: ("uint", 4), 0xCF: ("uint", 8),
+    0xD0: ("int", 1), 0xD1: ("int", 2), 0xD2: ("int", 4), 0xD3: ("int", 8),
+    0xD9: ("str", 1), 0xDA: ("str", 2), 0xDB: ("str", 4),
+    0xDC: ("array", 2), 0xDD: ("array", 4),
+    0xDE: ("map", 2), 0xDF: ("map", 4),
+}
+_MSGPACK_CONSTANTS = {0xC0: None, 0xC2: False, 0xC3: True}
+
+
+def _msgpack_unpack(data: bytes, pos: int) -> Tuple[object, int]:
+    marker, pos = _read(data, pos, 1)
+    marker = marker[0]
+    if marker < 0x80:
+        return marker, pos
+    if marker >= 0xE0:
+        return marker - 0x100, pos
+    if marker < 0x90:
+        kind, length = "map", marker & 0x0F
+    elif marker < 0xA0:
+        kind, length = "array", marker & 0x0F
+    elif marker < 0xC0:
+        kind, length = "str", marker & 0x1F
+    elif marker in _MSGPACK_CONSTANTS:
+        return _MSGPACK_CONSTANTS[marker], pos
+    else:
+        try:
+            kind, size = _MSGPACK_FORMATS[marker]
+        except KeyError:
+            raise ValueError(f"unsupported MessagePack format 0x{marker:02x} at offset {pos - 1}")
+        chunk, pos = _read(data, pos, size)
+        if kind == "uint":
+            return int.from_bytes(chunk, "big"), pos
+        if kind == "int":
+            return int.from_bytes(chunk, "big", signed=True), pos
+        if kind == "float":
+            return struct.unpack(">f" if size == 4 else ">d", chunk)[0], pos
+        length = int.from_bytes(chunk, "big")
+    if kind == "str":
+        chunk, pos = _read(data, pos, length)
+        return chunk.decode("utf-8"), pos
+    if kind == "bin":
+        return _read(data, pos, length)
+    if kind == "array":
+        items = []
+        for _ in range(length):
+            item, pos = _msgpack_unpack(data, pos)
+            items.append(item)
+        return items, pos
+    mapping = {}
+    for _ in range(length):
+        key, pos = _msgpack_unpack(data, pos)
+        mapping[key], pos = _msgpack_unpack(data, pos)
+    return mapping, pos
+
+
+def _cbor_head(out: bytearray, major: int, argument: int):
+    """Write a CBOR initial byte for ``major`` followed by ``argument`` in the fewest bytes."""
+    major <<= 5
+    if argument < 24:
+        out.append(major | argument)
+        return
+    for info, size in ((24, 1), (25, 2), (26, 4), (27, 8)):
+        if argument < 1 << (8 * size):
+            out.append(major | info)
+            out += argument.to_bytes(size, "big")
+            return
+
+
+def _cbor_pack(value, out: bytearray):
+    if value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif isinstance(value, int):
+        if 0 <= value < 1 << 64:
+            _cbor_head(out, 0, value)
+        elif -(1 << 64) <= value < 0:
+            _cbor_head(out, 1, -1 - value)
+        else:
+            # Bignums are tag 2 for positive and tag 3 for negative numbers, wrapping the big endian magnitude
+            tag, magnitude = (2, value) if value > 0 else (3, -1 - value)
+            _cbor_head(out, 6, tag)
+            encoded = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, "big")
+            _cbor_head(out, 2, len(encoded))
+            out += encoded
+    elif isinstance(value, float):
+        out.append(0xFB)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        _cbor_head(out, 3, len(encoded))
+        out += encoded
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _cbor_head(out, 2, len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        _cbor_head(out, 4, len(value))
+        for item in value:
+            _cbor_pack(item, out)
+    elif isinstance(value, dict):
+        _cbor_head(out, 5, len(value))
+        for key, item in value.items():
+            _cbor_pack(key, out)
+            _cbor_pack(item, out)
+    else:
+        raise TypeError(f"Object of type {value.__class__.__name__} is not CBOR serializable")
+
+
+_CBOR_SIMPLE = {20: False, 21: True, 22: None, 23: None}
+_CBOR_FLOATS = {25: struct.Struct(">e"), 26: struct.Struct(">f"), 27: _DOUBLE}
+# Marks the end of an item with an indefinite length
+_CBOR_BREAK = object()
+
+
+def _cbor_unpack(data: bytes, pos: int) -> Tuple[object, int]:
+    initial, pos = _read(data, pos, 1)
+    initial = initial[0]
+    major, info = initial >> 5, initial & 0x1F
+    if major == 7:
+        if info in _CBOR_SIMPLE:
+            return _CBOR_SIMPLE[info], pos
+        if info in _CBOR_FLOATS:
+            float_format = _CBOR_FLOATS[info]
+            chunk, pos = _read(data, pos, float_format.size)
+            return float_format.unpack(chunk)[0], pos
+        if info == 31:
+            return _CBOR_BREAK, pos
+        raise ValueError(f"unsupported CBOR simple value {info} at offset {pos - 1}")
+    if info == 31:
+        return _cbor_unpack_indefinite(data, pos, major)
+    if info < 24:
+        argument = info
+    elif info < 28:
+        chunk, pos = _read(data, pos, 1 << (info - 24))
+        argument = int.from_bytes(chunk, "big")
+    else:
+        raise ValueError(f"invalid CBOR additional information {info} at offset {pos - 1}")
+    if major == 0:
+        return argument, pos
+    if major == 1:
+        return -1 - argument, pos
+    if major == 2:
+        return _read(data, pos, argument)
+    if major == 3:
+        chunk, pos = _read(data, pos, argument)
+        return chunk.decode("utf-8"), pos
+    if major == 4:
+        items = []
+        for _ in range(argument):
+            item, pos = _cbor_unpack(data, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        mapping = {}
+        for _ in range(argument):
+            key, pos = _cbor_unpack(data, pos)
+            mapping[key], pos = _cbor_unpack(data, pos)
+        return mapping, pos
+    # Tags other than bignums are ignored and the tagged item is returned as is
+    item, pos = _cbor_unpack(data, pos)
+    if argument in (2, 3) and isinstance(item, bytes):
+        item = int.from_bytes(item, "big")
+        if argument == 3:
+            item = -1 - item
+    return item, pos
+
+
+def _cbor_unpack_indefinite(data: bytes, pos: int, major: int) -> Tuple[object, int]:
+    if major not in (2, 3, 4, 5):
+        raise ValueError(f"major type {major} can't have an indefinite length at offset {pos - 1}")
+    items = []
+    while True:
+        item, pos = _cbor_unpack(data, pos)
+        if item is _CBOR_BREAK:
+            break
+        items.append(item)
+    if major == 2:
+        return b"".join(items), pos
+    if major == 3:
+        return "".join(items), pos
+    if major == 4:
+        return items, pos
+    if len(items) % 2:
+        raise ValueError("CBOR map with a key but no value")
+    return dict(zip(items[::2], items[1::2])), pos
+
+
+def _decode_all(unpack, data: bytes, name: str):
+    data = _as_bytes(data)
+    try:
+        value, pos = unpack(data, 0)
+    except TypeError as err:
+        # Unhashable keys, such as arrays used as map keys
+        raise ValueError(f"invalid {name} data: {err}")
+    if value is _CBOR_BREAK:
+        raise ValueError(f"unexpected break in {name} data")
+    if pos != len(data):
+        raise ValueError(f"extra data after {name} value at offset {pos}")
+    return value
+
+
+class MessagePackCodec(Codec):
+    """
+    `MessagePack <https://msgpack.org>`_ codec. Uses the ``msgpack`` package when it's installed and a pure Python
+    implementation otherwise, so there is no required dependency. Supports the same values as JSON plus ``bytes``.
+    Decoding raises ``ValueError`` for malformed data.
+    """
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def encode(self, value) -> bytes:
+        if msgpack is not None:
+            return msgpack.packb(value, use_bin_type=True)
+        out = bytearray()
+        _msgpack_pack(value, out)
+        return bytes(out)
+
+    def decode(self, data: bytes):
+        if msgpack is not None:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        return _decode_all(_msgpack_unpack, data, "MessagePack")
+
+    def dumps(self, value) -> str:
+        raise TypeError("MessagePack is a binary format, use encode() instead")
+
+
+class CBORCodec(Codec):
+    """
+    `CBOR <https://cbor.io>`_ codec. Uses the ``cbor2`` package when it's installed and a pure Python implementation
+    otherwise, so there is no required dependency. Supports the same values as JSON plus ``bytes``. Decoding raises
+    ``ValueError`` for malformed data.
+    """
+    name = "cbor"
+    content_type = "application/cbor"
+
+    def encode(self, value) -> bytes:
+        if cbor2 is not None:
+            return cbor2.dumps(value)
+        out = bytearray()
+        _cbor_pack(value, out)
+        return bytes(out)
+
+    def decode(self, data: bytes):
+        if cbor2 is not None:
+            return cbor2.loads(data)
+        return _decode_all(_cbor_unpack, data, "CBOR")
+
+    def dumps(self, value) -> str:
+        raise TypeError("CBOR is a binary format, use encode() instead")
+
+
+_CODECS: Dict[str, type] = {}
+_instances: Dict[str, Codec] = {}
+_CONTENT_TYPES: Dict[str, str] = {}
+
+
+def register_codec(codec_class: type) -> type:
+    """
+    Make a :class:`~httpbase.codecs.Codec` subclass available by its ``name`` to
+    :func:`~httpbase.codecs.get_codec`. Can be used as a class decorator.
+    """
+    _CODECS[codec_class.name] = codec_class
+    _instances.pop(codec_class.name, None)
+    _CONTENT_TYPES.setdefault(codec_class.content_type, codec_class.name)
+    return codec_class
+
+
+register_codec(JSONCodec)
+register_codec(OrjsonCodec)
+register_codec(MessagePackCodec)
+register_codec(CBORCodec)
+
+
+def get_codec(codec: Union[str, Codec]=None) -> Codec:
+    """
+    Resolve a codec setting to a :class:`~httpbase.codecs.Codec`.
+
+    Args:
+        codec: A ``Codec`` instance, the ``name`` of a registered codec, ``"auto"`` for the fastest installed JSON codec
+            (orjson when it's installed and the standard library otherwise) or ``None`` for the default codec.
+
+    Raises:
+        ConfigurationError: If there is no codec called ``codec`` or it can't be used.
+    """
+    if codec is None:
+        return _default_codec
+    if isinstance(codec, Codec):
+        return codec
+    if codec == "auto":
+        codec = OrjsonCodec.name if orjson is not None else JSONCodec.name
+    instance = _instances.get(codec)
+    if instance is None:
+        try:
+            codec_class = _CODECS[codec]
+        except KeyError:
+            raise ConfigurationError(f"unknown codec {codec!r}, expected one of {sorted(_CODECS)} or 'auto'")
+        instance = _instances[codec] = codec_class()
+    return instance
+
+
+_default_codec: Codec = get_codec(JSONCodec.name)
+
+
+def get_codec_for_content_type(content_type: str) -> Optional[Codec]:
+    """
+    Returns the codec registered first for a ``Content-Type`` header, ignoring parameters like ``charset``, or ``None``
+    if there isn't one. ``application/json`` resolves to the default codec when that is a JSON codec.
+    """
+    content_type = content_type.split(";")[0].strip().lower()
+    name = _CONTENT_TYPES.get(content_type)
+    if name is None:
+        return None
+    if _default_codec.content_type == content_type:
+        return _default_codec
+    return get_codec(name)
+
+
+def get_default_codec() -> Codec:
+    """Returns the codec used by resources and clients that don't set their own."""
+    return _default_codec
+
+
+def set_default_codec(codec: Union[str, Codec]=None):
+    """
+    Set the codec used by resources and clients that don't set their own. The default is the standard library
+    :class:`~httpbase.codecs.JSONCodec`, so the output of :func:`~httpbase.resources.Resource.json` doesn't change
+    depending on what happens to be installed.
+
+    Example::
+
+        httpbase.codecs.set_default_codec("auto")
+
+    Args:
+        codec: Anything :func:`~httpbase.codecs.get_codec` accepts. ``None`` restores the standard library codec.
+    """
+    global _default_codec
+    _default_codec = get_codec(codec if codec is not None else JSONCodec.name)
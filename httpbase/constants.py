@@ -2,6 +2,8 @@ from typing import NamedTuple
 
 
 DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%s"
+# Pass as the ``format`` of a ``DateField`` to use ``isoformat()`` and ``fromisoformat()``
+ISO_DATE_FORMAT = "iso"
 TEMPLATE_VARIABLE_PATTERN = r"{(\w+)}"
 
 class _HTTPMethods(NamedTuple):
@@ -20,6 +20,7 @@ class SerializationError(Exception):
 
 
 class ImmutableFieldError(Exception):
+    """Raised when a field of a :class:`~httpbase.resources.FrozenResource` is set after the resource was created."""
     pass
 
 
@@ -29,3 +30,26 @@ class NonNullableField(Exception):
     constructor and no default is set.
     """
     pass
+
+
+class TenantCapacityError(Exception):
+    """
+    Raised by a :class:`~httpbase.tenants.TenantScheduler` when a request could not be given a slot before its timeout
+    ran out.
+    """
+    pass
+
+
+class DeserializationError(Exception):
+    """
+    Raised when decoding a ``Resource`` from JSON in strict mode and the data has keys the resource doesn't declare or
+    values that don't match their fields.
+    """
+    pass
+
+
+class CassetteError(Exception):
+    """
+    Raised by :mod:`httpbase.cassettes` when a cassette file is invalid or has no recorded response for a request.
+    """
+    pass
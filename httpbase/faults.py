@@ -0,0 +1,240 @@
+"""
+A transport that makes requests slow or fail on purpose, to see how a client and the code around it behave when an
+upstream degrades. Faults are configured per route with probabilities and drawn from a seeded random number generator,
+so a run can be repeated exactly.
+
+Example::
+
+    transport = FaultTransport(
+        faults=Faults(latency=lognormal(0.05, 0.5)),
+        routes={routes.get_item: Faults(error_rate=0.05, reset_rate=0.01, partial_body_rate=0.01)},
+        seed=42,
+    )
+    with StandInServer() as server:
+        client = ItemsClient(baseurl=server.url, transport=transport)
+        print(run_load(client.get_item, rate=200, duration=30).format())
+    print(transport.counts)
+
+Latency distributions are callables that take a ``random.Random`` and return a number of seconds. The ones in this
+module cover the usual shapes, any other callable works too.
+"""
+import collections
+import http.client
+import math
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable
+from urllib.parse import urlsplit
+
+import requests
+
+from .constants import TEMPLATE_VARIABLE_PATTERN
+from .routes import Route
+from .transports import build_response
+
+Distribution = Callable[[random.Random], float]
+
+DEFAULT_ERROR_STATUSES = (500, 502, 503, 504)
+
+# Slow bodies are read in slices that take this many seconds, so reading them doesn't wait for a whole chunk at once
+_SLOW_BODY_SLICE = 0.1
+
+
+def fixed(seconds: float) -> Distribution:
+    """Always ``seconds``."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Distribution:
+    """Anywhere between ``low`` and ``high`` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def normal(mean: float, stddev: float) -> Distribution:
+    """Normally distributed around ``mean`` seconds, never below zero."""
+    return lambda rng: max(0.0, rng.gauss(mean, stddev))
+
+
+def lognormal(median: float, sigma: float) -> Distribution:
+    """
+    Log-normally distributed with a median of ``median`` seconds. Most service latencies look like this, a larger
+    ``sigma`` gives a longer tail.
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def exponential(mean: float) -> Distribution:
+    """Exponentially distributed with a mean of ``mean`` seconds."""
+    return lambda rng: rng.expovariate(1 / mean)
+
+
+class Faults(object):
+    """
+    The faults to inject in to the requests of a route. Each rate is the probability from ``0`` to ``1`` that a request
+    gets that fault, drawn independently for every request. A request that gets a connection reset or an error status
+    is never sent.
+
+    Args:
+        latency: A distribution of the delay added before each request is sent. If the request has a read ``timeout``
+            shorter than the delay the request waits for the timeout and raises ``requests.ReadTimeout``.
+        latency_rate: The probability a request is delayed.
+        error_rate: The probability of responding with an error status instead of sending the request.
+        error_statuses: The statuses error responses are picked from.
+        reset_rate: The probability of raising ``requests.ConnectionError`` for a connection reset by the upstream.
+        slow_body_rate: The probability the response body is sent slowly.
+        body_bytes_per_second: How fast slow bodies are sent.
+        partial_body_rate: The probability the connection drops part way through the response body. Reading the body
+            raises ``requests.exceptions.ChunkedEncodingError``, from the transport unless the request is streamed.
+        partial_body_fraction: The part of the body that is sent before the connection drops.
+
+    Raises:
+        ValueError: If a rate isn't between ``0`` and ``1``.
+    """
+    def __init__(self, latency: Distribution=None, latency_rate: float=1.0, error_rate: float=0.0,
+                 error_statuses: Iterable[int]=DEFAULT_ERROR_STATUSES, reset_rate: float=0.0,
+                 slow_body_rate: float=0.0, body_bytes_per_second: float=64 * 1024, partial_body_rate: float=0.0,
+                 partial_body_fraction: float=0.5):
+        rates = {"latency_rate": latency_rate, "error_rate": error_rate, "reset_rate": reset_rate,
+                 "slow_body_rate": slow_body_rate, "partial_body_rate": partial_body_rate,
+                 "partial_body_fraction": partial_body_fraction}
+        for name, rate in rates.items():
+            if not 0 <= rate <= 1:
+                raise ValueError(f"{name} must be between 0 and 1")
+        self.latency = latency
+        self.latency_rate = latency_rate
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.reset_rate = reset_rate
+        self.slow_body_rate = slow_body_rate
+        self.body_bytes_per_second = body_bytes_per_second
+        self.partial_body_rate = partial_body_rate
+        self.partial_body_fraction = partial_body_fraction
+
+
+class _FaultyBody(object):
+    """The ``raw`` of a response whose body is sent slowly or cut short."""
+    def __init__(self, content: bytes, bytes_per_second: float=None, cut_at: int=None):
+        self.content = content
+        self.bytes_per_second = bytes_per_second
+        self.cut_at = cut_at
+        self.position = 0
+
+    def read(self, amt: int=None) -> bytes:
+        end = len(self.content) if self.cut_at is None else self.cut_at
+        if self.position >= end:
+            if self.cut_at is not None:
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"connection dropped after {self.cut_at} of {len(self.content)} bytes (injected)"
+                )
+            return b""
+        size = end - self.position if amt is None else min(amt, end - self.position)
+        if self.bytes_per_second:
+            size = min(size, max(1, int(self.bytes_per_second * _SLOW_BODY_SLICE)))
+            time.sleep(size / self.bytes_per_second)
+        chunk = self.content[self.position:self.position + size]
+        self.position += size
+        return chunk
+
+    def close(self):
+        pass
+
+
+def _route_pattern(route: Route) -> re.Pattern:
+    """Returns a regex that matches the path of the URLs of ``route``."""
+    parts = re.split(TEMPLATE_VARIABLE_PATTERN, route.path)
+    # ``re.split`` puts the names of the template variables at the odd indexes
+    pattern = "".join("[^/]+" if index % 2 else re.escape(part) for index, part in enumerate(parts))
+    if not route.path.startswith("/"):
+        # Relative to the path of the base URL
+        pattern = "(?:.*/)?" + pattern
+    return re.compile(pattern)
+
+
+def _read_timeout(timeout) -> float:
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+class FaultTransport(object):
+    """
+    Transport that injects latency and failures in to the requests it sends with another transport. The faults of a
+    request come from the first of ``routes`` with the same method and a path its URL matches, or from ``faults`` if
+    none match. Requests with no faults are passed straight through.
+
+    The random draws are made one request at a time, so with the same ``seed`` and the same requests in the same order
+    the same faults are injected. Requests sent from several threads are drawn for in the order they are sent.
+
+    Args:
+        transport: The transport that sends the requests. Defaults to ``requests``.
+        faults: The faults for requests that don't match any of ``routes``.
+        routes: ``Faults`` for the requests of each ``Route``.
+        seed: Seeds the random number generator.
+
+    Attributes:
+        counts: A ``collections.Counter`` of the faults that have been injected, by name: ``latency``, ``timeout``,
+            ``reset``, ``error``, ``slow_body`` and ``partial_body``.
+    """
+    def __init__(self, transport: Callable=None, faults: Faults=None, routes: Dict[Route, Faults]=None,
+                 seed: int=None):
+        self.transport = transport
+        self.faults = faults
+        self.routes = [(route.method.upper(), _route_pattern(route), route_faults)
+                       for route, route_faults in (routes or {}).items()]
+        self.counts = collections.Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def faults_for(self, method: str, url: str) -> Faults:
+        """Returns the faults for a request, or ``None`` if it has none."""
+        method = method.upper()
+        path = urlsplit(url).path
+        for route_method, pattern, faults in self.routes:
+            if route_method == method and pattern.fullmatch(path):
+                return faults
+        return self.faults
+
+    def __call__(self, method: str, url: str, **kwargs) -> requests.Response:
+        send = self.transport if self.transport is not None else requests.request
+        faults = self.faults_for(method, url)
+        if faults is None:
+            return send(method, url, **kwargs)
+        timeout = _read_timeout(kwargs.get("timeout"))
+        with self._lock:
+            rng = self._random
+            delay = faults.latency(rng) if faults.latency is not None and rng.random() < faults.latency_rate else 0.0
+            timed_out = bool(delay) and timeout is not None and delay > timeout
+            reset = rng.random() < faults.reset_rate
+            error = rng.random() < faults.error_rate
+            status = rng.choice(faults.error_statuses) if error else None
+            slow_body = rng.random() < faults.slow_body_rate
+            partial_body = rng.random() < faults.partial_body_rate
+            self.counts.update(name for name, injected in (
+                ("latency", delay and not timed_out), ("timeout", timed_out), ("reset", reset), ("error", error),
+                ("slow_body", slow_body), ("partial_body", partial_body),
+            ) if injected)
+        if timed_out:
+            time.sleep(timeout)
+            raise requests.ReadTimeout(f"injected latency of {delay:.3f}s exceeded the read timeout of {timeout}s")
+        if delay:
+            time.sleep(delay)
+        if reset:
+            raise requests.ConnectionError(ConnectionResetError(104, "Connection reset by peer (injected)"))
+        if error:
+            return build_response(status, http.client.responses.get(status, ""), [("Content-Type", "application/json")],
+                                  b'{"message": "injected fault"}', url, elapsed=delay)
+        response = send(method, url, **kwargs)
+        if slow_body or partial_body:
+            content = response.content or b""
+            cut_at = int(len(content) * faults.partial_body_fraction) if partial_body else None
+            response.raw = _FaultyBody(content, faults.body_bytes_per_second if slow_body else None, cut_at)
+            response._content = False
+            response._content_consumed = False
+            if not kwargs.get("stream"):
+                # ``requests`` reads bodies that aren't streamed before returning, so the slow read or the dropped
+                # connection happens here
+                response.content
+        return response
@@ -1,7 +1,32 @@
-from typing import Callable
+import copy
+import datetime
+import functools
+from array import array
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple
 
-from .constants import null, DEFAULT_DATE_FORMAT
-from .exceptions import NonNullableField
+from .constants import null, DEFAULT_DATE_FORMAT, ISO_DATE_FORMAT
+from .exceptions import DeserializationError, NonNullableField
+
+# Placeholder for the values of lazily decoded resources that haven't been decoded yet
+_NOT_LOADED = object()
+
+# Defaults of these types are shared between resources as is, anything else is copied for each resource that uses it
+_IMMUTABLE_TYPES = (
+    type(None), bool, int, float, str, bytes, type, datetime.date, datetime.time, datetime.timedelta, frozenset
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """
+    Returns the ``numpy`` module, or ``None`` if it isn't installed. It's only imported by the first
+    :class:`~httpbase.fields.NumericListField`, since importing it takes longer than importing the rest of the package.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
 
 
 def _default_validator(value):
@@ -13,14 +38,266 @@ def _default_validator(value):
         )
 
 
+# ``strftime`` formats that ``isoformat()`` can produce, with the arguments it needs to produce them
+_ISO_EQUIVALENT_FORMATS = {
+    "%Y-%m-%dT%H:%M:%S": ("T", "seconds"),
+    "%Y-%m-%d %H:%M:%S": (" ", "seconds"),
+    "%Y-%m-%dT%H:%M:%S.%f": ("T", "microseconds"),
+    "%Y-%m-%d %H:%M:%S.%f": (" ", "microseconds"),
+    "%Y-%m-%d": None,
+}
+
+
+def _not_a_date(value):
+    return TypeError(f"value {value} of type {value.__class__.__name__} can't be serialized as a date.")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_date_format(format: str) -> Tuple[Callable, Optional[Callable]]:
+    """
+    Returns a function that formats a date with ``format`` and a function that parses a string in ``format``, or
+    ``None`` if ``strptime`` can't parse the format. Formats ``isoformat()`` can produce and ``fromisoformat()`` can
+    parse use those instead of ``strftime`` and ``strptime``, which are several times slower.
+    """
+    def format_date(value):
+        try:
+            return value.strftime(format)
+        except AttributeError:
+            raise _not_a_date(value)
+
+    def parse_date(value):
+        return datetime.datetime.strptime(value, format)
+
+    if format == ISO_DATE_FORMAT:
+        def format_date(value):
+            try:
+                return value.isoformat()
+            except AttributeError:
+                raise _not_a_date(value)
+
+        return format_date, datetime.datetime.fromisoformat
+
+    if format in _ISO_EQUIVALENT_FORMATS:
+        strftime = format_date
+        arguments = _ISO_EQUIVALENT_FORMATS[format]
+        if arguments is None:
+            def format_date(value):
+                if type(value) is datetime.date and value.year >= 1000:
+                    return value.isoformat()
+                return strftime(value)
+        else:
+            sep, timespec = arguments
+
+            # Years before 1000 and aware datetimes are formatted differently by isoformat()
+            def format_date(value):
+                if type(value) is datetime.datetime and value.tzinfo is None and value.year >= 1000:
+                    return value.isoformat(sep, timespec)
+                return strftime(value)
+
+        return format_date, datetime.datetime.fromisoformat
+
+    try:
+        sample = datetime.datetime(2000, 1, 2, 3, 4, 5, 6)
+        datetime.datetime.strptime(sample.strftime(format), format)
+    except ValueError:
+        parse_date = None
+    return format_date, parse_date
+
+
+# Placeholder returned for values left out of the output because they couldn't be serialized
+_OMITTED = object()
+
+# How the nested serializer treats a value: serialized by its field, a resource, a list or mapping of resources held
+# by a ``ListField`` or ``MapField`` with a ``resource_class``, or a single item of such a list or mapping
+_LEAF, _NESTED_RESOURCE, _NESTED_LIST, _NESTED_MAP = range(4)
+
+_SERIALIZATION_ERRORS = (TypeError, AttributeError, ValueError)
+
+
+def _nesting(field) -> int:
+    if type(field).to_value is not Field.to_value:
+        # The override decides how the whole value is serialized
+        return _LEAF
+    serialize = type(field).serialize
+    if serialize is ResourceField.serialize:
+        return _NESTED_RESOURCE
+    if field.validator is _serialize_resource:
+        if serialize is ListField.serialize:
+            return _NESTED_LIST
+        if serialize is MapField.serialize:
+            return _NESTED_MAP
+    return _LEAF
+
+
+def _serialization_plan(declared_fields: Mapping, use_labels: bool) -> tuple:
+    """
+    Returns ``(key, label, field, nesting, serialize)`` for each field of a resource class, where ``serialize`` is the
+    cheapest callable that serializes a value of a field that doesn't hold nested resources.
+    """
+    plan = []
+    for key, field in declared_fields.items():
+        if type(field).to_value is not Field.to_value:
+            serialize = functools.partial(_to_value, field, use_labels=use_labels)
+        elif type(field).serialize is Field.serialize and not field.nullable:
+            serialize = field.validator
+        else:
+            serialize = functools.partial(field.serialize, use_labels=use_labels)
+        plan.append((key, field.label if use_labels else key, field, _nesting(field), serialize))
+    return tuple(plan)
+
+
+def _to_value(field, value, **kwargs):
+    """
+    Serializes ``value`` the way ``field`` does. Fields that override ``to_value``, which was written for fields that
+    held their own value, have it called on a copy of the field holding ``value``. Other fields use ``serialize``.
+    """
+    if type(field).to_value is Field.to_value:
+        return field.serialize(value, **kwargs)
+    holder = copy.copy(field)
+    holder.value = value
+    return holder.to_value(**kwargs)
+
+
+def _set_value(field, value, resource=None):
+    """
+    Returns the value stored on ``resource`` when ``field`` is set to ``value``. Fields that override ``set_value`` have
+    it called on a copy of the field, like :func:`~httpbase.fields._to_value`, other fields use ``clean``.
+    """
+    if type(field).set_value is Field.set_value:
+        return field.clean(value, resource)
+    holder = copy.copy(field)
+    holder.parent = resource
+    holder.set_value(value)
+    return holder.value
+
+
+def _open_nested(value, nesting: int, use_labels: bool, add_error: Callable, path: str):
+    """
+    Returns the empty output for a nested value and the frame that fills it in, a function that stores a child's
+    output and an iterator of ``(key, value, field, nesting, path, serialize)`` for the children. Resources without
+    nested resources of their own are serialized right away by their compiled serializer and have no frame.
+    """
+    if value is None:
+        return None, None
+    if nesting == _NESTED_RESOURCE:
+        resource_class = type(value)
+        plans = getattr(resource_class, "_serialization_plans", None)
+        if plans is None:
+            add_error(path, f"error from validator: expected a Resource got {value.__class__.__name__}")
+            return _OMITTED, None
+        if value._raw is not None:
+            value._load()
+        prefix = f"{path}." if path else ""
+        if not resource_class._has_nested:
+            return resource_class._serializers[use_labels](value, add_error, prefix), None
+        output = {}
+        children = (
+            (label, item, field, kind, prefix + key, serialize)
+            for (key, label, field, kind, serialize), item in zip(plans[use_labels], value._values)
+        )
+        return output, (output.__setitem__, children)
+    if nesting == _NESTED_LIST:
+        if not isinstance(value, (list, tuple)):
+            add_error(path, f"error from validator: expected a list got {value.__class__.__name__}")
+            return _OMITTED, None
+        output = []
+        children = (
+            (index, item, None, _NESTED_RESOURCE, f"{path}.{index}", None) for index, item in enumerate(value)
+        )
+        return output, (lambda index, item: output.append(item), children)
+    if not isinstance(value, Mapping):
+        add_error(path, f"error from validator: expected an object got {value.__class__.__name__}")
+        return _OMITTED, None
+    output = {}
+    children = ((key, item, None, _NESTED_RESOURCE, f"{path}.{key}", None) for key, item in value.items())
+    return output, (output.__setitem__, children)
+
+
+def _serialize_nested(value, nesting: int, use_labels: bool, add_error: Callable, path: str):
+    """
+    Serialize a tree of nested resources, and lists and mappings of resources, without recursion. The walk keeps an
+    explicit stack of the containers being filled in, so the depth of the tree is only limited by memory.
+
+    ``use_labels`` and ``omit_null`` are honoured at every level. Values that can't be serialized are left out of the
+    output and ``add_error`` is called with their dotted path, the same paths
+    :func:`~httpbase.resources.Resource.get_value` takes, and the error message.
+
+    Returns:
+        The serialized value, or ``_OMITTED`` if ``value`` itself couldn't be serialized.
+    """
+    result, frame = _open_nested(value, nesting, use_labels, add_error, path)
+    if frame is None:
+        return result
+    stack = [frame]
+    while stack:
+        put, children = stack[-1]
+        for key, child, field, kind, child_path, serialize in children:
+            if kind == _LEAF:
+                if child is null:
+                    if not field.omit_null:
+                        put(key, None)
+                    continue
+                try:
+                    put(key, serialize(child))
+                except _SERIALIZATION_ERRORS as err:
+                    add_error(child_path, f"error from validator: {str(err)}")
+                continue
+            if child is null:
+                if field is None or not field.omit_null:
+                    put(key, None)
+                continue
+            serialized, frame = _open_nested(child, kind, use_labels, add_error, child_path)
+            if serialized is not _OMITTED:
+                put(key, serialized)
+            if frame is not None:
+                stack.append(frame)
+                break
+        else:
+            stack.pop()
+    return result
+
+
+def _serialize_strict(value, nesting: int, use_labels: bool):
+    """Serialize a nested value and raise a ``ValueError`` naming every path that couldn't be serialized."""
+    errors = {}
+    result = _serialize_nested(value, nesting, use_labels, errors.__setitem__, "")
+    if errors:
+        raise ValueError("; ".join(f"{path or 'value'}: {message}" for path, message in errors.items()))
+    return result
+
+
+def _serialize_resource(resource, use_labels: bool=True) -> dict:
+    return _serialize_strict(resource, _NESTED_RESOURCE, use_labels)
+
+
+def _deserialize_resource(field, resource_class, value, strict: bool, lazy: bool=False):
+    if type(value) is dict or isinstance(value, Mapping):
+        return resource_class.from_dict(value, strict=strict, lazy=lazy)
+    if strict and not isinstance(value, resource_class):
+        raise DeserializationError(
+            f"{field.label} expected an object for {resource_class.__name__} got {value.__class__.__name__}"
+        )
+    return value
+
+
 class Field(object):
     """Base class for the fields on a ``Resource``.
 
      ``Field`` are containers for values that know how to serialize the values they contain.
+
+    Fields declared on a ``Resource`` are shared by every instance of that resource and act as descriptors. The values
+    live on the resource instances and accessing a field through an instance returns a
+    :class:`~httpbase.fields.BoundField` that pairs the shared field with that instance's value.
+
+    ``array_typecode`` is the ``array`` type code used to store the values of the field in a
+    :class:`~httpbase.batches.ResourceBatch`, or ``None`` to store them in a list.
     """
+    array_typecode = None
+
     def __init__(self, label: str=None, nullable: bool=False, default=null,
                  validator: Callable=_default_validator, **kwargs):
         self.label = label
+        self.name = None
         self.value = None
         self.nullable = nullable
         self.default = default
@@ -28,35 +305,141 @@ class Field(object):
         self.printable: bool = kwargs.get("printable", True)
         self.omit_null: bool = kwargs.get("omit_null", False)
 
-    def _set_parent(self, parent):
-        if parent is None:
-            from .resources import Resource
-            parent = Resource
-        self.parent = parent
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._bound_field(self.name)
+
+    def __set__(self, instance, value):
+        value = _set_value(self, value, instance)
+        instance._mark_dirty(self.name)
+        instance._values[instance._field_index[self.name]] = value
 
     def __repr__(self):
+        return self._repr(self.value)
+
+    def _repr(self, value) -> str:
         if self.printable:
-            message = f"<{self.__class__.__name__}: {self.value}>"
+            message = f"<{self.__class__.__name__}: {value}>"
         else:
             message = f"<{self.__class__.__name__}: XXXXXX>"
         return message
 
-    def to_value(self, **kwargs):
-        # Don't attempt to validate null values
-        if self.nullable and self.value is None:
-            return self.value
-        return self.validator(self.value)
+    def get_default(self):
+        """Returns the default value. Mutable defaults are copied so resources don't share them."""
+        if isinstance(self.default, _IMMUTABLE_TYPES):
+            return self.default
+        return copy.deepcopy(self.default)
 
-    def set_value(self, value):
+    def clean(self, value, resource=None):
+        """
+        Returns the value that should be stored on a resource when this field is set to ``value``.
+
+        Args:
+            value: The new value. ``None`` is replaced with the default.
+            resource: The resource the value is being set on. Only used for error messages.
+
+        Raises:
+            NonNullableField: If ``value`` is ``None`` and the field is neither nullable nor has a default.
+        """
         if value is None:
             if not self.nullable and self.default is null:
-                raise NonNullableField(f"{self.parent.__class__.__name__}.{self.label} cannot be null")
-            else:
-                value = self.default
-        self.value = value
+                raise NonNullableField(f"{resource.__class__.__name__}.{self.label} cannot be null")
+            return self.get_default()
+        return value
+
+    def serialize(self, value, **kwargs):
+        """Returns the JSON serializable form of ``value``."""
+        # Don't attempt to validate null values
+        if self.nullable and value is None:
+            return value
+        return self.validator(value)
+
+    def serialize_many(self, values: Sequence, **kwargs) -> List:
+        """
+        Returns the JSON serializable form of each of ``values``, which must not contain ``null``. Fields override this
+        with conversions that handle a whole list or column at once.
+        """
+        serialize = self.serialize
+        return [serialize(value, **kwargs) for value in values]
+
+    def deserialize(self, value, strict: bool=False, lazy: bool=False):
+        """
+        Returns the value that should be stored for ``value`` decoded from JSON. Only called for values that aren't
+        ``None``.
+
+        Args:
+            value: The decoded JSON value.
+            strict: If ``True`` raise a ``DeserializationError`` for values that don't match the field.
+            lazy: If ``True`` nested resources are decoded lazily as well.
+        """
+        return value
+
+    def to_value(self, **kwargs):
+        """
+        Returns the JSON serializable form of ``value``. Subclasses that override this are called on a copy of the field
+        holding the value of the resource being serialized, instead of ``serialize``.
+        """
+        return self.serialize(self.value, **kwargs)
+
+    def set_value(self, value):
+        """
+        Stores the cleaned ``value`` on the field. Subclasses that override this are called on a copy of the field
+        when a resource is created or one of its fields is set, instead of ``clean``, and the ``value`` the copy ends up
+        with is stored on the resource.
+        """
+        self.value = self.clean(value, getattr(self, "parent", None))
+
+
+class BoundField(object):
+    """
+    A :class:`~httpbase.fields.Field` as seen through a single ``Resource`` instance. This is what attribute access on
+    a resource returns. It has the same interface as the field it wraps, but ``value`` reads and writes the value
+    stored on the resource.
+    """
+    __slots__ = ("field", "resource", "index")
+
+    def __init__(self, field: Field, resource, index: int):
+        self.field = field
+        self.resource = resource
+        self.index = index
+
+    def __getattr__(self, name):
+        if name in BoundField.__slots__:
+            raise AttributeError(name)
+        return getattr(self.field, name)
+
+    def __repr__(self):
+        return self.field._repr(self.value)
+
+    @property
+    def parent(self):
+        return self.resource
+
+    @property
+    def value(self):
+        value = self.resource._values[self.index]
+        if value is _NOT_LOADED:
+            value = self.resource._load_field(self.index)
+        return value
+
+    @value.setter
+    def value(self, value):
+        self.resource._mark_dirty(self.field.name)
+        self.resource._values[self.index] = value
+
+    def to_value(self, **kwargs):
+        return _to_value(self.field, self.value, **kwargs)
+
+    def set_value(self, value):
+        value = _set_value(self.field, value, self.resource)
+        self.resource._mark_dirty(self.field.name)
+        self.resource._values[self.index] = value
 
 
 class IntField(Field):
+    array_typecode = "q"
+
     def __init__(self, **kwargs):
         if "validator" not in kwargs:
             kwargs["validator"] = int
@@ -76,67 +459,269 @@ class BoolField(Field):
             raise NonNullableField(f"{self.__class__.__name__} cannot be null")
         super().__init__(**kwargs)
 
-    def to_value(self, **kwargs):
-        return bool(self.value)
+    def serialize(self, value, **kwargs):
+        return bool(value)
+
+    def serialize_many(self, values: Sequence, **kwargs) -> List[bool]:
+        return list(map(bool, values))
 
 
 class ResourceField(Field):
-    def to_value(self, **kwargs):
-        use_labels = kwargs.get("use_labels", True)
-        if self.value is None and self.nullable:
-            return self.default
-        values = {}
-        for key, field in self.value.fields.items():
-            label = self._get_json_key(key, field, use_labels)
-            values[label] = field.to_value()
-        return values
-
-    def _get_json_key(self, key, field, use_label):
-        if use_label:
-            label = field.label
-        else:
-            label = key
-        return label
+    """
+    Field for a nested ``Resource``. Pass the class of the nested resource as ``resource_class`` to have
+    :func:`~httpbase.resources.Resource.from_dict` decode nested objects into it.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.resource_class = kwargs.get("resource_class")
+
+    def serialize(self, value, **kwargs):
+        return _serialize_strict(value, _NESTED_RESOURCE, kwargs.get("use_labels", True))
+
+    def deserialize(self, value, strict: bool=False, lazy: bool=False):
+        if self.resource_class is None:
+            return value
+        return _deserialize_resource(self, self.resource_class, value, strict, lazy)
 
 
 class ListField(Field):
     """
-    Field for value thatshould be serialized as strings.
+    Field for value thatshould be serialized as strings. When ``resource_class`` is given the items are resources of
+    that class.
     """
-    def to_value(self, **kwargs):
-        if self.value is None and self.nullable:
+    def __init__(self, **kwargs):
+        if kwargs.get("resource_class") is not None and "validator" not in kwargs:
+            kwargs["validator"] = _serialize_resource
+        super().__init__(**kwargs)
+        self.resource_class = kwargs.get("resource_class")
+
+    def serialize(self, value, **kwargs):
+        if value is None and self.nullable:
             return self.default
-        return [self.validator(val) for val in self.value]
+        if self.validator is _serialize_resource:
+            return _serialize_strict(value, _NESTED_LIST, kwargs.get("use_labels", True))
+        return [self.validator(val) for val in value]
+
+    def deserialize(self, value, strict: bool=False, lazy: bool=False):
+        if self.resource_class is None:
+            return value
+        if not isinstance(value, list):
+            if strict:
+                raise DeserializationError(f"{self.label} expected a list got {value.__class__.__name__}")
+            return value
+        return [_deserialize_resource(self, self.resource_class, item, strict, lazy) for item in value]
+
+
+class NumericListField(ListField):
+    """
+    Field for long lists of numbers. Values are stored as an ``array.array`` of ``typecode``, or as a NumPy array
+    sharing the same buffer when NumPy is installed, so every element is type checked in a single conversion when the
+    value is set or decoded and serializing is a single ``tolist()`` call instead of a validator call per element.
+
+    Lists whose elements don't fit ``typecode`` are stored as is and reported as errors when the resource is serialized,
+    the same as any other field whose validator fails.
+
+    Example::
+
+        class TelemetryResource(Resource):
+            samples = NumericListField(typecode="d")
+            counts = NumericListField(typecode="q", use_numpy=False)
+
+        telemetry = TelemetryResource(samples=[0.5, 1.5], counts=[1, 2])
+        telemetry.counts.value
+        array('q', [1, 2])
+
+    Args:
+        typecode: The ``array`` type code of the elements, such as ``"d"`` for floats or ``"q"`` for 64 bit ints.
+        use_numpy: Store values as NumPy arrays. Defaults to ``True`` when NumPy is installed.
+    """
+    def __init__(self, typecode: str="d", use_numpy: bool=None, **kwargs):
+        if kwargs.get("resource_class") is not None:
+            raise TypeError(f"{self.__class__.__name__} can't hold resources")
+        super().__init__(**kwargs)
+        self.typecode = typecode
+        if use_numpy is False:
+            numpy = None
+        else:
+            numpy = _numpy()
+            if use_numpy and numpy is None:
+                raise ImportError("use_numpy requires numpy to be installed")
+        self.use_numpy = numpy is not None
+        self.dtype = numpy.dtype(typecode) if self.use_numpy else None
+
+    def _convert(self, value):
+        """Returns ``value`` as an array of ``typecode``. Raises ``TypeError`` or ``ValueError`` if it won't fit."""
+        try:
+            return self._to_array(value)
+        except OverflowError as err:
+            raise ValueError(str(err)) from err
+
+    def _to_array(self, value):
+        if self.use_numpy:
+            numpy = _numpy()
+            if isinstance(value, numpy.ndarray) and value.dtype == self.dtype:
+                return value
+            if not isinstance(value, array) or value.typecode != self.typecode:
+                value = array(self.typecode, value)
+            return numpy.frombuffer(value, dtype=self.dtype)
+        if isinstance(value, array) and value.typecode == self.typecode:
+            return value
+        return array(self.typecode, value)
+
+    def clean(self, value, resource=None):
+        value = super().clean(value, resource)
+        if value is null or value is None:
+            return value
+        try:
+            return self._convert(value)
+        except (TypeError, ValueError):
+            return value
+
+    def serialize(self, value, **kwargs):
+        if value is None and self.nullable:
+            return self.default
+        return self._convert(value).tolist()
+
+    def deserialize(self, value, strict: bool=False, lazy: bool=False):
+        try:
+            return self._convert(value)
+        except (TypeError, ValueError) as err:
+            if strict:
+                raise DeserializationError(f"{self.label} expected a list of {self.typecode!r} numbers: {err}")
+            return value
 
 
 class MapField(Field):
-    def to_value(self, **kwargs):
-        if self.value is None and self.nullable:
+    """
+    Field for mappings. When ``resource_class`` is given the values are resources of that class.
+    """
+    def __init__(self, **kwargs):
+        if kwargs.get("resource_class") is not None and "validator" not in kwargs:
+            kwargs["validator"] = _serialize_resource
+        super().__init__(**kwargs)
+        self.resource_class = kwargs.get("resource_class")
+
+    def serialize(self, value, **kwargs):
+        if value is None and self.nullable:
             return self.default
-        return {key: self.validator(value) for key, value in self.value.items()}
+        if self.validator is _serialize_resource:
+            return _serialize_strict(value, _NESTED_MAP, kwargs.get("use_labels", True))
+        return {key: self.validator(item) for key, item in value.items()}
+
+    def deserialize(self, value, strict: bool=False, lazy: bool=False):
+        if self.resource_class is None:
+            return value
+        if not isinstance(value, Mapping):
+            if strict:
+                raise DeserializationError(f"{self.label} expected an object got {value.__class__.__name__}")
+            return value
+        return {
+            key: _deserialize_resource(self, self.resource_class, item, strict, lazy) for key, item in value.items()
+        }
 
 
 class DateField(Field):
+    """
+    Field for dates and datetimes serialized as strings in ``format``. Pass ``format=ISO_DATE_FORMAT`` to use
+    ``isoformat()``. Strings decoded with :func:`~httpbase.resources.Resource.from_dict` are parsed back in to
+    datetimes, with ``fromisoformat()`` for ISO 8601 formats and with ``strptime`` for anything else. Strings that
+    don't parse are kept as is unless decoding is strict.
+
+    :func:`~httpbase.fields.DateField.serialize_many` and :func:`~httpbase.fields.DateField.deserialize_many` convert
+    whole lists or columns of values at once.
+    """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.format = kwargs.get("format", DEFAULT_DATE_FORMAT)
+        self._format, self._parse = _compile_date_format(self.format)
 
-    def to_value(self, **kwargs):
+    def serialize(self, value, **kwargs):
+        return self._format(value)
+
+    def serialize_many(self, values: Sequence, **kwargs) -> List[str]:
+        return list(map(self._format, values))
+
+    def deserialize(self, value, strict: bool=False, lazy: bool=False):
+        if self._parse is None or not isinstance(value, str):
+            if strict and self._parse is not None:
+                raise DeserializationError(f"{self.label} expected a date string got {value.__class__.__name__}")
+            return value
         try:
-            return self.value.strftime(self.format)
-        except AttributeError:
-            raise TypeError(f"value {self.value} of type {self.value.__class__.__name__} can't be serialized as a date.")
+            return self._parse(value)
+        except ValueError as err:
+            if strict:
+                raise DeserializationError(f"{self.label} could not parse date {value!r}: {err}")
+            return value
+
+    def deserialize_many(self, values: Sequence, strict: bool=False) -> List:
+        """
+        Parse a list of date strings.
+
+        Raises:
+            DeserializationError: In strict mode if any of the values can't be parsed.
+        """
+        if self._parse is not None:
+            try:
+                return list(map(self._parse, values))
+            except (TypeError, ValueError):
+                pass
+        return [self.deserialize(value, strict) for value in values]
 
 
 class EpochField(Field):
+    """
+    Field for datetimes serialized as seconds since the epoch, as a float or as an int if ``total_seconds`` is
+    ``False``. Numbers decoded with :func:`~httpbase.resources.Resource.from_dict` are converted back in to naive
+    datetimes in local time, the inverse of ``timestamp()``.
+    """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.total_seconds = kwargs.get("total_seconds", True)
+        self._format = self._timestamp if self.total_seconds else self._int_timestamp
 
-    def to_value(self, **kwargs):
+    def _timestamp(self, value):
         try:
-            if self.total_seconds:
-                return self.value.timestamp()
-            return int(self.value.timestamp())
+            return value.timestamp()
         except AttributeError:
-            raise TypeError(f"Failed to serialize {self}. Expected 'datetime' got {self.value.__class__.__name__}")
+            raise TypeError(
+                f"Failed to serialize {self._repr(value)}. Expected 'datetime' got {value.__class__.__name__}"
+            )
+
+    def _int_timestamp(self, value):
+        return int(self._timestamp(value))
+
+    def serialize(self, value, **kwargs):
+        return self._format(value)
+
+    def serialize_many(self, values: Sequence, **kwargs) -> List:
+        try:
+            timestamps = list(map(datetime.datetime.timestamp, values))
+        except TypeError:
+            return list(map(self._format, values))
+        if self.total_seconds:
+            return timestamps
+        return list(map(int, timestamps))
+
+    def deserialize(self, value, strict: bool=False, lazy: bool=False):
+        if type(value) is int or type(value) is float:
+            try:
+                return datetime.datetime.fromtimestamp(value)
+            except (OverflowError, OSError, ValueError) as err:
+                if strict:
+                    raise DeserializationError(f"{self.label} could not convert timestamp {value!r}: {err}")
+                return value
+        if strict:
+            raise DeserializationError(f"{self.label} expected a number got {value.__class__.__name__}")
+        return value
+
+    def deserialize_many(self, values: Sequence, strict: bool=False) -> List:
+        """
+        Convert a list of timestamps to datetimes.
+
+        Raises:
+            DeserializationError: In strict mode if any of the values can't be converted.
+        """
+        try:
+            return list(map(datetime.datetime.fromtimestamp, values))
+        except (TypeError, OverflowError, OSError, ValueError):
+            return [self.deserialize(value, strict) for value in values]
@@ -0,0 +1,73 @@
+"""
+Keeps clients usable in the child processes of pre-fork servers like gunicorn and of ``multiprocessing``. A child
+starts with a copy of everything the parent had, including the sockets of pooled connections and the locks and state of
+threads that don't exist in the child. Sharing a socket with the parent mixes up the responses of both processes, and a
+lock that was held by a thread of the parent is never released.
+
+Objects that hold such state register here and are reset in the child right after the fork, before anything else runs.
+Then the :func:`~httpbase.client.HTTPBaseClient.after_fork` hook of every client and the callbacks added with
+:func:`~httpbase.forks.after_fork` are called::
+
+    @after_fork
+    def reseed():
+        random.seed()
+
+All of this runs before ``fork()`` returns in the child, where a network call or a new thread can deadlock on a lock
+held by a thread of the parent, like the ones around DNS lookups or logging. Hooks and callbacks should only reset
+state. Clients with ``warm_connections`` are marked to warm up before the first request they send in the child instead.
+
+Forks that don't go through ``os.fork``, like those made by some C extensions, aren't seen here, so transports also
+check the process ID before using a pool.
+
+An exception raised by a reset, a hook or a callback is turned in to a ``RuntimeWarning`` so the others still run.
+"""
+import os
+import warnings
+import weakref
+from typing import Callable
+
+# Objects with an ``_after_fork`` method that resets them, called first
+_resettable = weakref.WeakSet()
+# Clients, whose ``after_fork`` hook is called once everything is reset
+_clients = weakref.WeakSet()
+_callbacks = []
+
+
+def register(obj):
+    """Call ``obj._after_fork()`` in the child after a fork. Only a weak reference to ``obj`` is kept."""
+    _resettable.add(obj)
+
+
+def register_client(client):
+    """Call ``client.after_fork()`` in the child after a fork. Only a weak reference to ``client`` is kept."""
+    _clients.add(client)
+
+
+def after_fork(callback: Callable) -> Callable:
+    """
+    Call ``callback`` in the child after a fork, once the connection pools and clients have been reset. Can be used
+    as a decorator.
+    """
+    _callbacks.append(callback)
+    return callback
+
+
+def _call(function: Callable, description: str):
+    """Calls ``function``, turning an exception in to a warning so the rest of the child's resets still run."""
+    try:
+        function()
+    except Exception as err:
+        warnings.warn(f"{description} failed after fork: {err!r}", RuntimeWarning)
+
+
+def _after_fork_in_child():
+    for obj in list(_resettable):
+        _call(obj._after_fork, f"resetting {obj!r}")
+    for client in list(_clients):
+        _call(client.after_fork, f"after_fork of {client!r}")
+    for callback in _callbacks:
+        _call(callback, f"after_fork callback {callback!r}")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
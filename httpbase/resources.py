@@ -1,23 +1,263 @@
 import copy
-import json
-from typing import Dict, Union, Mapping, List, Iterator
+import functools
+from typing import Any, Callable, Dict, Iterable, Union, Mapping, List, Iterator
 
+from .codecs import Codec, get_codec
 from .constants import null
-from .exceptions import SerializationError
-from .fields import Field
+from .exceptions import DeserializationError, ImmutableFieldError, SerializationError
+from .fields import _LEAF, _NOT_LOADED, _OMITTED, _SERIALIZATION_ERRORS, _nesting, _serialization_plan
+from .fields import _serialize_nested, _set_value, _to_value
+from .fields import BoundField, Field, BoolField, DateField, EpochField, ListField, MapField, ResourceField
 
 # Types for checking
 JSON = Union[str, int, float, bool, None, Mapping[str, 'JSON'], List['JSON']]
 
 
+def _value_expression(field: Field, index: int, use_labels: bool) -> str:
+    """
+    Source for an expression that serializes ``value`` the same way ``field.serialize()`` would, or that calls the
+    ``to_value`` of fields that override it.
+    """
+    if type(field).to_value is not Field.to_value:
+        return f"_to_value(f{index}, value, use_labels={use_labels})"
+    serialize = type(field).serialize
+    fallback = f"f{index}.serialize(value, use_labels={use_labels})"
+    if serialize is Field.serialize:
+        if field.nullable:
+            return f"None if value is None else v{index}(value)"
+        return f"v{index}(value)"
+    if serialize is BoolField.serialize:
+        return "bool(value)"
+    if serialize is DateField.serialize or serialize is EpochField.serialize:
+        return f"d{index}(value)"
+    if serialize is ListField.serialize:
+        expression = f"[v{index}(item) for item in value]"
+    elif serialize is MapField.serialize:
+        expression = f"{{key: v{index}(item) for key, item in value.items()}}"
+    else:
+        return fallback
+    if field.nullable:
+        return f"{fallback} if value is None else {expression}"
+    return expression
+
+
+def _compile_serializer(declared_fields: Dict[str, Field], use_labels: bool) -> Callable:
+    """
+    Generate a function equivalent to :func:`~httpbase.resources.Resource._dict_generic` for one set of fields. Labels,
+    validators, ``omit_null`` and the handling of the built in field types are resolved once here instead of on every
+    call. Fields with a custom ``serialize`` or ``to_value`` still have it called. Fields holding nested resources are handed to the
+    iterative serializer in :mod:`httpbase.fields`.
+
+    Errors are reported to ``add_error``, the resource's own ``_add_error`` by default, under ``prefix`` plus the
+    attribute name so nested resources can report them under their full path.
+    """
+    namespace = {
+        "null": null, "_SERIALIZATION_ERRORS": _SERIALIZATION_ERRORS, "_OMITTED": _OMITTED, "_nested": _serialize_nested,
+        "_to_value": _to_value,
+    }
+    lines = [
+        "def serialize(resource, add_error=None, prefix=''):",
+        "    if add_error is None:",
+        "        add_error = resource._add_error",
+        "    values = resource._values",
+        "    result = {}",
+    ]
+    for index, (key, field) in enumerate(declared_fields.items()):
+        namespace[f"f{index}"] = field
+        namespace[f"k{index}"] = key
+        namespace[f"l{index}"] = field.label if use_labels else key
+        namespace[f"v{index}"] = field.validator
+        namespace[f"d{index}"] = getattr(field, "_format", None)
+        lines.append(f"    value = values[{index}]")
+        lines.append("    if value is null:")
+        lines.append("        pass" if field.omit_null else f"        result[l{index}] = None")
+        lines.append("    else:")
+        nesting = _nesting(field)
+        if nesting != _LEAF:
+            # Nested resources are walked iteratively and their errors are recorded under their full path
+            lines.append(f"        value = _nested(value, {nesting}, {use_labels}, add_error, prefix + k{index})")
+            lines.append("        if value is not _OMITTED:")
+            lines.append(f"            result[l{index}] = value")
+            continue
+        lines.append("        try:")
+        lines.append(f"            result[l{index}] = {_value_expression(field, index, use_labels)}")
+        lines.append("        except _SERIALIZATION_ERRORS as err:")
+        lines.append(f"            add_error(prefix + k{index}, f\"error from validator: {{str(err)}}\")")
+    lines.append("    return result")
+    exec("\n".join(lines), namespace)
+    return namespace["serialize"]
+
+
+def _freeze(value):
+    """Returns a hashable equivalent of a serialized JSON value."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _compile_initializer(declared_fields: Dict[str, Field]) -> Callable:
+    """
+    Generate a function that builds the list of values for a new resource from the kwargs given to its constructor.
+    Values that aren't ``None`` are stored as is unless the field overrides ``clean`` or ``set_value``.
+    """
+    namespace = {"_set_value": _set_value}
+    lines = ["def initialize(resource, kwargs):", "    get = kwargs.get"]
+    for index, (key, field) in enumerate(declared_fields.items()):
+        namespace[f"f{index}"] = field
+        namespace[f"k{index}"] = key
+        if type(field).set_value is not Field.set_value:
+            lines.append(f"    v{index} = _set_value(f{index}, get(k{index}), resource)")
+        elif type(field).clean is Field.clean:
+            lines.append(f"    v{index} = get(k{index})")
+            lines.append(f"    if v{index} is None:")
+            lines.append(f"        v{index} = f{index}.clean(None, resource)")
+        else:
+            lines.append(f"    v{index} = f{index}.clean(get(k{index}), resource)")
+    lines.append("    return [{}]".format(", ".join(f"v{index}" for index in range(len(declared_fields)))))
+    exec("\n".join(lines), namespace)
+    return namespace["initialize"]
+
+
+def _compile_decoder(declared_fields: Dict[str, Field]) -> Callable:
+    """
+    Generate a function that builds the list of values for a resource from a decoded JSON object. Each field is looked
+    up by its label first and then by its attribute name. Only fields that override ``deserialize``, ``clean`` or
+    ``set_value`` have them called for values that aren't ``None``.
+    """
+    namespace = {"_set_value": _set_value}
+    lines = ["def decode(resource, data, strict):", "    get = data.get"]
+    for index, (key, field) in enumerate(declared_fields.items()):
+        namespace[f"f{index}"] = field
+        namespace[f"k{index}"] = key
+        namespace[f"l{index}"] = field.label
+        custom_set_value = type(field).set_value is not Field.set_value
+        if custom_set_value:
+            clean = f"_set_value(f{index}, {{}}, resource)"
+        else:
+            clean = f"f{index}.clean({{}}, resource)"
+        lines.append(f"    v{index} = get(l{index})")
+        if field.label != key:
+            lines.append(f"    if v{index} is None:")
+            lines.append(f"        v{index} = get(k{index})")
+        lines.append(f"    if v{index} is None:")
+        lines.append(f"        v{index} = {clean.format('None')}")
+        if type(field).deserialize is not Field.deserialize:
+            lines.append("    else:")
+            lines.append(f"        v{index} = f{index}.deserialize(v{index}, strict)")
+            if custom_set_value or type(field).clean is not Field.clean:
+                lines.append(f"        v{index} = {clean.format(f'v{index}')}")
+        elif custom_set_value or type(field).clean is not Field.clean:
+            lines.append("    else:")
+            lines.append(f"        v{index} = {clean.format(f'v{index}')}")
+    lines.append("    return [{}]".format(", ".join(f"v{index}" for index in range(len(declared_fields)))))
+    exec("\n".join(lines), namespace)
+    return namespace["decode"]
+
+
+class _Path(object):
+    """
+    A dotted path compiled against a ``Resource`` class. The path is split once and, as far as the classes of nested
+    resources are known from the ``resource_class`` of their ``ResourceField``, the index of the value at each level is
+    looked up once as well. Resources of other classes than the expected ones, and paths through values that aren't
+    resources, fall back to plain attribute access.
+    """
+    __slots__ = ("steps", "target", "target_class", "target_index")
+
+    def __init__(self, resource_class: type, path: str):
+        names = path.split(".")
+        steps = []
+        prefix = []
+        for name in names[:-1]:
+            prefix.append(name)
+            index = resource_class._field_index.get(name) if resource_class is not None else None
+            steps.append((name, ".".join(prefix), resource_class, index))
+            field = resource_class._field_items[index][1] if index is not None else None
+            resource_class = field.resource_class if isinstance(field, ResourceField) else None
+        self.steps = tuple(steps)
+        self.target = names[-1]
+        self.target_class = resource_class
+        self.target_index = resource_class._field_index.get(self.target) if resource_class is not None else None
+
+    @staticmethod
+    def _step(resource, name: str, resource_class: type, index: int):
+        if type(resource) is not resource_class or index is None:
+            index = resource._field_index.get(name) if isinstance(resource, Resource) else None
+            if index is None:
+                return getattr(resource, name).value
+        value = resource._values[index]
+        if value is _NOT_LOADED:
+            value = resource._load_field(index)
+        return value
+
+    def container(self, resource: "Resource", resolved: dict=None):
+        """
+        Returns the object holding the target of the path. ``resolved`` maps prefixes of paths to the objects they
+        resolved to, and is used and updated when several paths are resolved together.
+        """
+        step = self._step
+        if resolved is None:
+            for name, _, resource_class, index in self.steps:
+                resource = step(resource, name, resource_class, index)
+            return resource
+        for name, prefix, resource_class, index in self.steps:
+            if prefix in resolved:
+                resource = resolved[prefix]
+            else:
+                resource = resolved[prefix] = step(resource, name, resource_class, index)
+        return resource
+
+    def index(self, container) -> Union[int, None]:
+        """Returns the index of the target in ``container`` or ``None`` if the target isn't a field."""
+        if type(container) is self.target_class and self.target_index is not None:
+            return self.target_index
+        if isinstance(container, Resource):
+            return container._field_index.get(self.target)
+        return None
+
+    def field(self, container):
+        index = self.index(container)
+        if index is None:
+            return getattr(container, self.target, container)
+        return container._bound_field(self.target)
+
+    def get(self, container):
+        index = self.index(container)
+        if index is None:
+            return getattr(container, self.target, container).value
+        value = container._values[index]
+        if value is _NOT_LOADED:
+            value = container._load_field(index)
+        return value
+
+    def set(self, container, value):
+        index = self.index(container)
+        if index is None:
+            getattr(container, self.target, container).set_value(value)
+        else:
+            value = _set_value(container._field_items[index][1], value, container)
+            container._mark_dirty(self.target)
+            container._values[index] = value
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_path(resource_class: type, path: str) -> _Path:
+    return _Path(resource_class, path)
+
+
 class ResourceMetaclass(type):
     """Metaclass for ``Resource`` objects. When a class object is constructed at run time this will add any declared
     to a dictionary and set that dictionary as the value for ``_declared_fields``. It will also go up the inheritance
     chain and add any fields from parent ``Resources`` as well.
 
-    This is done so that class instances can make copies of the fields that are assigned to it so that instances of
-    the ``Resource`` class don't all share the same fields/values.
+    The declared fields are shared by every instance of the class and are set back on the class as descriptors.
+    Instances only store their values, in a list ordered like ``_declared_fields``.
 
+    The metaclass also compiles a serializer for each class, one keyed by labels and one keyed by attribute names, that
+    :func:`~httpbase.resources.Resource.dict` uses instead of inspecting every field on every call, and functions that
+    build the values for new instances from constructor kwargs or from decoded JSON. Labels and validators are read
+    from the declared fields when the class is created.
     """
     @classmethod
     def _get_declared_fields(cls, bases, attrs):
@@ -35,9 +275,45 @@ class ResourceMetaclass(type):
 
         return dict(fields)
 
+    @staticmethod
+    def _bind_field(name: str, field: Field) -> Field:
+        if field.name is not None and field.name != name:
+            # The same field object was declared under another name on another resource
+            relabel = field.label == field.name
+            field = copy.copy(field)
+            if relabel:
+                field.label = None
+        if field.label is None:
+            field.label = name
+        field.name = name
+        return field
+
     def __new__(cls, name, bases, attrs):
-        attrs['_declared_fields'] = cls._get_declared_fields(bases, attrs)
-        return super(ResourceMetaclass, cls).__new__(cls, name, bases, attrs)
+        declared_fields = {
+            field_name: cls._bind_field(field_name, field)
+            for field_name, field in cls._get_declared_fields(bases, attrs).items()
+        }
+        attrs['_declared_fields'] = declared_fields
+        attrs['_field_items'] = tuple(declared_fields.items())
+        attrs['_field_index'] = {field_name: index for index, field_name in enumerate(declared_fields)}
+        attrs['_initialize'] = staticmethod(_compile_initializer(declared_fields))
+        attrs['_decode'] = staticmethod(_compile_decoder(declared_fields))
+        attrs['_decode_keys'] = frozenset(
+            [field.label for field in declared_fields.values()] + list(declared_fields)
+        )
+        attrs['_serialization_plans'] = (
+            _serialization_plan(declared_fields, use_labels=False),
+            _serialization_plan(declared_fields, use_labels=True),
+        )
+        attrs['_has_nested'] = any(_nesting(field) != _LEAF for field in declared_fields.values())
+        attrs['_serializers'] = (
+            _compile_serializer(declared_fields, use_labels=False),
+            _compile_serializer(declared_fields, use_labels=True),
+        )
+        new_class = super(ResourceMetaclass, cls).__new__(cls, name, bases, attrs)
+        for field_name, field in declared_fields.items():
+            setattr(new_class, field_name, field)
+        return new_class
 
 
 class Resource(metaclass=ResourceMetaclass):
@@ -70,28 +346,223 @@ class Resource(metaclass=ResourceMetaclass):
 
         # to update the value
         post.update("author.profile.email","new.email@example.com")
+
+    Fields are declared once on the class and shared by all instances, each instance only stores its values. Subclasses
+    can set extra attributes on their instances as usual. Ones that don't need to can declare ``__slots__ = ()`` so
+    their instances don't carry a ``__dict__``, which saves memory when there are many of them::
+
+        class PointResource(Resource):
+            __slots__ = ()
+            x = IntField()
+            y = IntField()
     """
+    __slots__ = ("_values", "_errors", "_bound", "_raw", "_dirty", "parent")
+
     # Expose this exception on this class so calling code can easily use it in ``try/except`` blocks
     SerializationError = SerializationError
 
+    # The JSON codec used by ``json()``, ``json_bytes()`` and ``from_json()``. Either a ``Codec``, the name of one, or
+    # ``None`` for the default codec. See :mod:`httpbase.codecs`
+    json_codec: Union[str, Codec] = None
+
     def __init__(self, **kwargs):
-        self._errors = {}
-        self._fields = {}
+        self._values = self._initialize(self, kwargs)
+        self._errors = None
+        self._bound = None
+        self._raw = None
+        self._dirty = None
         self.parent = None
-        for key, field in self.fields.items():
-            field._set_parent(self)
-            field.set_value(kwargs.get(key))
-            setattr(self, key, field)
-            if field.label is None:
-                field.label = key
 
     def __repr__(self):
         return f"<{self.__class__.__name__}>"
 
+    def __getstate__(self):
+        if self._raw is not None:
+            self._load()
+        return self._values, self._errors, getattr(self, "__dict__", None)
+
+    def __setstate__(self, state):
+        self._values, self._errors, attributes = state
+        if attributes:
+            self.__dict__.update(attributes)
+        self._bound = None
+        self._raw = None
+        self._dirty = None
+        self.parent = None
+
+    def _bound_field(self, name: str) -> BoundField:
+        """Returns the ``BoundField`` for the field called ``name``, creating it on first access."""
+        bound = self._bound
+        if bound is None:
+            bound = self._bound = {}
+        field = bound.get(name)
+        if field is None:
+            index = self._field_index[name]
+            field = bound[name] = BoundField(self._field_items[index][1], self, index)
+        return field
+
+    def _load_field(self, index: int):
+        """Decode the value of the field at ``index`` from the raw data of a lazily decoded resource."""
+        data, strict = self._raw
+        key, field = self._field_items[index]
+        value = data.get(field.label)
+        if value is None and field.label != key:
+            value = data.get(key)
+        if value is None:
+            value = _set_value(field, None, self)
+        else:
+            value = _set_value(field, field.deserialize(value, strict, lazy=True), self)
+        self._values[index] = value
+        return value
+
+    def _load(self):
+        """Decode every field of a lazily decoded resource that hasn't been accessed yet and drop the raw data."""
+        for index, value in enumerate(self._values):
+            if value is _NOT_LOADED:
+                self._load_field(index)
+        self._raw = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, JSON], strict: bool=False, lazy: bool=False) -> "Resource":
+        """
+        Create an instance from a decoded JSON object, such as the output of :func:`~httpbase.resources.Resource.dict`.
+        Keys are matched against field labels first and then attribute names, so the output of ``dict()`` can be
+        decoded with or without ``use_labels``. Nested objects are decoded for ``ResourceField``, ``ListField`` and
+        ``MapField`` fields that were given a ``resource_class``.
+
+        With ``lazy=True`` the resource keeps a reference to ``data`` and each field is only decoded, including any
+        nested resources, the first time its value is accessed through an attribute,
+        :func:`~httpbase.resources.Resource.get_value` or :func:`~httpbase.resources.Resource.get_field`. The decoded
+        value is then kept. Serializing, copying or pickling a lazy resource decodes all remaining fields. Errors for
+        missing fields are raised on access instead of here.
+
+        The constructor isn't called, so subclasses that override ``__init__`` should override this method as well.
+
+        Example::
+
+            class AuthorResource(Resource):
+                name = StrField(label="authorName")
+
+            class PostResource(Resource):
+                author = ResourceField(resource_class=AuthorResource)
+                title = StrField(label="postTitle")
+
+            post = PostResource.from_dict({"author": {"authorName": "author"}, "postTitle": "Post Title"})
+            print(post.get_value("author.name"))
+            "author"
+
+        Args:
+            data: A dictionary of JSON values.
+            strict: If ``True`` unknown keys and nested values that don't match their field raise a
+                ``DeserializationError``. Otherwise unknown keys are ignored and mismatched values are kept as is.
+            lazy: If ``True`` fields are decoded on first access instead of up front.
+
+        Raises:
+            DeserializationError: If ``data`` isn't a mapping, or in strict mode if it doesn't match the resource.
+            NonNullableField: If a field that isn't nullable and has no default is missing or ``null``.
+        """
+        if type(data) is not dict and not isinstance(data, Mapping):
+            raise DeserializationError(f"{cls.__name__} expected an object got {data.__class__.__name__}")
+        if strict:
+            unknown = data.keys() - cls._decode_keys
+            if unknown:
+                raise DeserializationError(f"{cls.__name__} got unexpected keys {sorted(unknown)}")
+        resource = cls.__new__(cls)
+        resource._errors = None
+        resource._bound = None
+        resource._dirty = None
+        resource.parent = None
+        if lazy:
+            resource._raw = (data, strict)
+            resource._values = [_NOT_LOADED] * len(cls._field_items)
+        else:
+            resource._raw = None
+            resource._values = cls._decode(resource, data, strict)
+        return resource
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes], strict: bool=False,
+                  lazy: bool=False) -> Union["Resource", List["Resource"]]:
+        """
+        Create resources from a JSON document. A JSON object is decoded to a single instance and an array of objects to
+        a list of instances.
+
+        The document is decoded with the ``json_codec`` of the class.
+
+        Args:
+            data: A JSON document as ``str`` or ``bytes``.
+            strict: See :func:`~httpbase.resources.Resource.from_dict`.
+            lazy: See :func:`~httpbase.resources.Resource.from_dict`.
+
+        Raises:
+            DeserializationError: See :func:`~httpbase.resources.Resource.from_dict`.
+        """
+        return cls._from_decoded(get_codec(cls.json_codec).decode(data), strict, lazy)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, codec: Union[str, Codec]=None, strict: bool=False,
+                   lazy: bool=False) -> Union["Resource", List["Resource"]]:
+        """
+        Create resources from a document in any format with a :class:`~httpbase.codecs.Codec`, such as the output of
+        :func:`~httpbase.resources.Resource.to_bytes`. An object is decoded to a single instance and an array of
+        objects to a list of instances.
+
+        Example::
+
+            PostResource.from_bytes(response.content, codec="msgpack")
+
+        Args:
+            data: The encoded document.
+            codec: A ``Codec`` or the name of one. Defaults to the ``json_codec`` of the class.
+            strict: See :func:`~httpbase.resources.Resource.from_dict`.
+            lazy: See :func:`~httpbase.resources.Resource.from_dict`.
+
+        Raises:
+            ValueError: If ``data`` can't be decoded.
+            DeserializationError: See :func:`~httpbase.resources.Resource.from_dict`.
+        """
+        return cls._from_decoded(get_codec(codec or cls.json_codec).decode(data), strict, lazy)
+
+    @classmethod
+    def _from_decoded(cls, decoded, strict: bool, lazy: bool) -> Union["Resource", List["Resource"]]:
+        if isinstance(decoded, list):
+            from_dict = cls.from_dict
+            return [from_dict(item, strict, lazy) for item in decoded]
+        return cls.from_dict(decoded, strict, lazy)
+
+    @classmethod
+    def from_response(cls, response, strict: bool=False, lazy: bool=False) -> Union["Resource", List["Resource"]]:
+        """
+        Create resources from the body of a ``requests.Response``. The raw bytes of the body are decoded directly,
+        skipping the encoding detection ``Response.json()`` does.
+
+        Args:
+            response: A response with a JSON body.
+            strict: See :func:`~httpbase.resources.Resource.from_dict`.
+            lazy: See :func:`~httpbase.resources.Resource.from_dict`.
+
+        Raises:
+            DeserializationError: See :func:`~httpbase.resources.Resource.from_dict`.
+        """
+        return cls.from_json(response.content, strict, lazy)
+
+    def _mark_dirty(self, name: str):
+        # Called before every write to a field
+        if self._dirty is None:
+            self._dirty = {name}
+        else:
+            self._dirty.add(name)
+
+    def _add_error(self, key: str, message: str):
+        if self._errors is None:
+            self._errors = {}
+        self._errors[key] = message
+
     @property
-    def fields(self) -> Dict[str, Field]:
+    def fields(self) -> Dict[str, BoundField]:
         """
-        Returns a dictionary where the keys are the attribute name for a field and the value is the ``Field`` object
+        Returns a dictionary where the keys are the attribute name for a field and the value is the ``BoundField`` for
+        this instance
 
         Example::
 
@@ -109,11 +580,9 @@ class Resource(metaclass=ResourceMetaclass):
              'title': <StrField: Post Title>}
 
         Returns:
-            dict[str, Field]
+            dict[str, BoundField]
         """
-        if not self._fields:
-            self._fields = {key: value for key, value in copy.deepcopy(self._declared_fields).items()}
-        return self._fields
+        return {key: self._bound_field(key) for key in self._field_index}
 
     @property
     def errors(self) -> Dict[str, str]:
@@ -122,6 +591,8 @@ class Resource(metaclass=ResourceMetaclass):
         output of ``dict()``. If this dictionary contains any errors :func:`~httpbase.resources.Resource.json` will
         raise a ``SerializationError``
         """
+        if not self._errors:
+            return {}
         return {key: value for key, value in self._errors.items()}
 
     def dict(self, use_labels: bool=True) -> Dict[str, JSON]:
@@ -165,26 +636,55 @@ class Resource(metaclass=ResourceMetaclass):
                 helpful if you want to write the serialized ``Resource`` to a file to loaded again later. That will
                 allow use to use the ``Resource(**dict)`` syntax.
         """
+        if self._raw is not None:
+            self._load()
+        return self._serializers[bool(use_labels)](self)
+
+    def _dict_generic(self, use_labels: bool=True) -> Dict[str, JSON]:
+        """
+        Reference implementation of :func:`~httpbase.resources.Resource.dict` that inspects every field on every call.
+        The compiled serializers must produce exactly the same output and errors as this method.
+        """
+        if self._raw is not None:
+            self._load()
         result = {}
-        for key, field in self.fields.items():
+        for (key, field), value in zip(self._field_items, self._values):
             try:
                 if use_labels:
                     label = field.label
                 else:
                     label = key
-                if field.omit_null and field.value is null:
+                if field.omit_null and value is null:
                     continue
-                elif field.value is null:
+                elif value is null:
                     result[label] = None
+                elif _nesting(field) != _LEAF:
+                    value = _serialize_nested(value, _nesting(field), use_labels, self._add_error, key)
+                    if value is not _OMITTED:
+                        result[label] = value
                 else:
-                    result[label] = field.to_value(use_labels=use_labels)
-            except (TypeError, AttributeError, ValueError) as err:
-                self._errors[key] = f"error from validator: {str(err)}"
+                    result[label] = _to_value(field, value, use_labels=use_labels)
+            except _SERIALIZATION_ERRORS as err:
+                self._add_error(key, f"error from validator: {str(err)}")
         return result
 
     def json(self, use_labels: bool=True) -> str:
         """
-        Get the JSON for an instance.
+        Get the JSON for an instance. The JSON is encoded with the ``json_codec`` of the class. Resources nested to any
+        depth can be encoded.
+
+        Args:
+            use_labels: Boolean to determine whether or not the attr name or the label of the ``Field`` should be used.
+
+        Raises:
+            SerializationError: Raises a ``SerializationError`` if there are fields that aren't JSON serializable.
+        """
+        return self._encode(self.json_codec, use_labels, text=True)
+
+    def json_bytes(self, use_labels: bool=True) -> bytes:
+        """
+        Get the JSON for an instance as ``bytes``, ready to be sent as the body of a request. Codecs like orjson encode
+        straight to ``bytes``, which skips encoding the output of :func:`~httpbase.resources.Resource.json`.
 
         Args:
             use_labels: Boolean to determine whether or not the attr name or the label of the ``Field`` should be used.
@@ -192,11 +692,107 @@ class Resource(metaclass=ResourceMetaclass):
         Raises:
             SerializationError: Raises a ``SerializationError`` if there are fields that aren't JSON serializable.
         """
+        return self._encode(self.json_codec, use_labels)
+
+    def to_bytes(self, codec: Union[str, Codec]=None, use_labels: bool=True) -> bytes:
+        """
+        Encode an instance with a :class:`~httpbase.codecs.Codec`, such as the ``"msgpack"`` or ``"cbor"`` binary
+        codecs.
+
+        Example::
+
+            client.create_post(data=post.to_bytes("msgpack"))
+
+        Args:
+            codec: A ``Codec`` or the name of one. Defaults to the ``json_codec`` of the class.
+            use_labels: Boolean to determine whether or not the attr name or the label of the ``Field`` should be used.
+
+        Raises:
+            SerializationError: Raises a ``SerializationError`` if there are fields that can't be serialized, or if the
+                resource is nested deeper than the recursion limit and the codec isn't a JSON codec. JSON codecs encode
+                resources nested to any depth.
+        """
+        return self._encode(codec or self.json_codec, use_labels)
+
+    def _encode(self, codec: Union[str, Codec], use_labels: bool, text: bool=False) -> Union[bytes, str]:
+        codec = get_codec(codec)
+        value = self._checked_dict(use_labels)
+        try:
+            return codec.dumps(value) if text else codec.encode(value)
+        except RecursionError:
+            # The JSON codecs encode trees of any depth, codecs that recurse are limited by the recursion limit
+            raise SerializationError(f"the resource is nested too deeply to encode with the {codec.name} codec")
+
+    def _checked_dict(self, use_labels: bool) -> Dict[str, JSON]:
         d = self.dict(use_labels=use_labels)
         if self.errors:
             msg = "fields with types {} could not be serialized".format([(k, v) for k, v in self.errors.items()])
             raise SerializationError(msg)
-        return json.dumps(d)
+        return d
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        ``True`` if a field of this resource, or of a nested resource, has been set since the resource was created or
+        :func:`~httpbase.resources.Resource.mark_clean` was last called.
+        """
+        if self._dirty:
+            return True
+        return any(isinstance(value, Resource) and value.is_dirty for value in self._values)
+
+    def merge_patch(self, use_labels: bool=True) -> Dict[str, JSON]:
+        """
+        Get a JSON Merge Patch (RFC 7386) containing only the fields that have been set since the resource was created
+        or :func:`~httpbase.resources.Resource.mark_clean` was last called. Changes made to nested resources, for
+        example through :func:`~httpbase.resources.Resource.update`, are included as nested patches. Fields set to
+        ``None`` are included as ``null`` which removes them on the server.
+
+        Changes are tracked when fields are set, so values that are mutated in place, like appending to the list of a
+        ``ListField``, aren't picked up. Set the field to the new value instead.
+
+        Example::
+
+            post = PostResource.from_response(client.get_post(1))
+            post.update("title", "New Title")
+            post.update("author.profile.email", "new.email@example.com")
+            post.merge_patch()
+            {'postTitle': 'New Title', 'author': {'profile': {'email': 'new.email@example.com'}}}
+            client.patch_post(1, data=json.dumps(post.merge_patch()))
+            post.mark_clean()
+
+        Args:
+            use_labels: See :func:`~httpbase.resources.Resource.dict`.
+
+        Raises:
+            SerializationError: If a changed field can't be serialized.
+        """
+        patch = {}
+        dirty = self._dirty or ()
+        for (key, field), value in zip(self._field_items, self._values):
+            label = field.label if use_labels else key
+            if key in dirty:
+                if value is null:
+                    patch[label] = None
+                    continue
+                try:
+                    patch[label] = _to_value(field, value, use_labels=use_labels)
+                except _SERIALIZATION_ERRORS as err:
+                    raise SerializationError(f"field {key} could not be serialized: {err}")
+            elif isinstance(value, Resource):
+                nested = value.merge_patch(use_labels=use_labels)
+                if nested:
+                    patch[label] = nested
+        return patch
+
+    def mark_clean(self):
+        """
+        Forget the changes tracked for :func:`~httpbase.resources.Resource.merge_patch`, on this resource and any nested
+        resources. Call this after the changes were sent successfully.
+        """
+        self._dirty = None
+        for value in self._values:
+            if isinstance(value, Resource):
+                value.mark_clean()
 
     def _traverse_fields(self, path: str) -> Field:
         """
@@ -208,11 +804,8 @@ class Resource(metaclass=ResourceMetaclass):
         Returns:
             Field
         """
-        field = self
-        levels, target = path.split(".")[:-1], path.split(".")[-1]
-        for level in levels:
-            field = getattr(field, level).value
-        return getattr(field, target, field)
+        compiled = _compile_path(type(self), path)
+        return compiled.field(compiled.container(self))
 
     def get_field(self, path: str) -> Field:
         """
@@ -252,8 +845,8 @@ class Resource(metaclass=ResourceMetaclass):
         Args:
             path: A dot separated path
         """
-        target = self._traverse_fields(path)
-        return target.value
+        compiled = _compile_path(type(self), path)
+        return compiled.get(compiled.container(self))
 
     def update(self, path: str, value):
         """
@@ -273,8 +866,54 @@ class Resource(metaclass=ResourceMetaclass):
             path: A dot separated path
             value: A new value
         """
-        target = self._traverse_fields(path)
-        target.set_value(value)
+        compiled = _compile_path(type(self), path)
+        compiled.set(compiled.container(self), value)
+
+    def get_values(self, paths: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get the values for several dotted paths at once. Nested resources shared by several paths are only looked up
+        once.
+
+        Example::
+
+            post.get_values(["title", "author.name", "author.profile.email"])
+            {'title': 'Post Title', 'author.name': 'author', 'author.profile.email': 'foo@example.com'}
+
+        Args:
+            paths: Dot separated paths
+
+        Returns:
+            dict[str, Any]
+        """
+        cls = type(self)
+        resolved = {}
+        values = {}
+        for path in paths:
+            compiled = _compile_path(cls, path)
+            values[path] = compiled.get(compiled.container(self, resolved))
+        return values
+
+    def update_many(self, updates: Mapping[str, Any]):
+        """
+        Update the values at several dotted paths at once, in order. Nested resources shared by several paths are only
+        looked up once.
+
+        Example::
+
+            post.update_many({"title": "New Title", "author.profile.email": "new.email@example.com"})
+
+        Args:
+            updates: A mapping of dot separated paths to new values.
+        """
+        cls = type(self)
+        resolved = {}
+        for path, value in updates.items():
+            compiled = _compile_path(cls, path)
+            compiled.set(compiled.container(self, resolved), value)
+            if resolved:
+                # Anything resolved through the value that was just replaced is stale now
+                for prefix in [prefix for prefix in resolved if prefix == path or prefix.startswith(path + ".")]:
+                    del resolved[prefix]
 
     def get_label(self, path: str) -> str:
         """
@@ -338,3 +977,104 @@ class Resource(metaclass=ResourceMetaclass):
             target = target.value
         for key, field in target.fields.items():
             yield field.label
+
+
+class FrozenResource(Resource):
+    """
+    A resource whose fields can't be set after it has been created. Setting a field, through an attribute,
+    :func:`~httpbase.resources.Resource.update` or a ``BoundField``, raises an ``ImmutableFieldError``.
+
+    The output of :func:`~httpbase.resources.Resource.dict` and :func:`~httpbase.resources.Resource.json` is computed
+    the first time it is asked for and then returned from a cache, so a frozen resource can be sent many times while
+    only being serialized once. The dictionary returned by ``dict()`` is the cached one and must not be modified.
+    Frozen resources compare equal when they are of the same class and serialize to the same values, and they are
+    hashable, so they can be used as cache keys and deduplicated in sets.
+
+    The cached output is a snapshot. Containers and nested resources held by a frozen resource aren't copied, so they
+    should be frozen resources themselves or never mutated in place.
+
+    Example::
+
+        class PointResource(FrozenResource):
+            x = IntField()
+            y = IntField()
+
+        point = PointResource(x=1, y=2)
+        point.x = 3
+        ImmutableFieldError: PointResource.x can't be changed, PointResource is frozen
+        point == PointResource(x=1, y=2)
+        True
+        len({point, PointResource(x=1, y=2)})
+        1
+    """
+    __slots__ = ("_cache",)
+
+    def _mark_dirty(self, name: str):
+        class_name = self.__class__.__name__
+        raise ImmutableFieldError(f"{class_name}.{name} can't be changed, {class_name} is frozen")
+
+    def _cached(self) -> Dict:
+        try:
+            return self._cache
+        except AttributeError:
+            # Instances created without calling __init__, like by from_dict() or unpickling, start without a cache
+            cache = self._cache = {}
+            return cache
+
+    def dict(self, use_labels: bool=True) -> Dict[str, JSON]:
+        cache = self._cached()
+        key = ("dict", bool(use_labels))
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = super().dict(use_labels=use_labels)
+        return result
+
+    def json(self, use_labels: bool=True) -> str:
+        cache = self._cached()
+        key = ("json", bool(use_labels))
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = super().json(use_labels=use_labels)
+        return result
+
+    def json_bytes(self, use_labels: bool=True) -> bytes:
+        cache = self._cached()
+        key = ("json_bytes", bool(use_labels))
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = super().json_bytes(use_labels=use_labels)
+        return result
+
+    def to_bytes(self, codec: Union[str, Codec]=None, use_labels: bool=True) -> bytes:
+        if codec is not None and not isinstance(codec, str):
+            return super().to_bytes(codec, use_labels=use_labels)
+        cache = self._cached()
+        key = ("to_bytes", codec, bool(use_labels))
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = super().to_bytes(codec, use_labels=use_labels)
+        return result
+
+    def _key(self):
+        cache = self._cached()
+        key = cache.get("key")
+        if key is None:
+            key = cache["key"] = _freeze(self.dict())
+        return key
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self is other or self._key() == other._key()
+
+    def __hash__(self):
+        cache = self._cached()
+        result = cache.get("hash")
+        if result is None:
+            result = cache["hash"] = hash((type(self), self._key()))
+        return result
+
+    @property
+    def is_dirty(self) -> bool:
+        """Always ``False``, frozen resources can't be changed."""
+        return False
@@ -13,14 +13,25 @@ class Route(object):
     A route definition. Contains a relative path, the HTTP method to use, a set containing the names of template
     variables (``user_id`` in ``/api/users/{user_id}``) and a set of usable query parameters.
 
+    A route can also name the codec for its request and response bodies, overriding the codec of the client. The client
+    then sends ``Accept`` and ``Content-Type`` headers for it, so the format can be picked per endpoint::
+
+        get_events = Route("/api/events", HTTPMethods.GET, codec="msgpack")
+
+    Args:
+        path: The path relative to the base URL of the client.
+        method: The HTTP method.
+        params: The names of the query parameters the route accepts.
+        codec: A :class:`~httpbase.codecs.Codec` or the name of one. ``None`` uses the codec of the client.
     """
-    def __init__(self, path: str, method: str, params: set=None):
+    def __init__(self, path: str, method: str, params: set=None, codec=None):
         self.path = path
         self.method = method
         self.vars = REGEX.findall(self.path)
         if params is None:
             params = set()
         self.params = params
+        self.codec = codec
 
     def get_url(self, baseurl: str, **params):
         """
@@ -0,0 +1,293 @@
+import codecs
+import json
+import re
+from typing import Iterable, Iterator
+
+from .codecs import Codec
+from .resources import JSON, Resource
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]" + _WHITESPACE
+
+# Characters that can end a value at the top level of an array
+_SCALAR_END = re.compile(r"[,\]\s]")
+# Characters that change the nesting of a value, outside of strings and inside of them
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+# Default largest item, in characters, ``iter_json_array`` buffers before giving up on it
+DEFAULT_MAX_ITEM_SIZE = 16 * 1024 * 1024
+
+# Consumed text is only dropped from the buffer once there is this much of it, so it isn't copied after every item
+_COMPACT_THRESHOLD = 65536
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Default number of bytes of serialized resources buffered before a chunk is handed to the transport
+DEFAULT_BUFFER_SIZE = 65536
+
+
+class _TextBuffer(object):
+    """Text decoded from a stream of byte chunks, with a read position."""
+    __slots__ = ("chunks", "decoder", "text", "pos", "exhausted")
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Read the next chunk in to the buffer. Returns ``False`` once the stream is exhausted."""
+        if self.exhausted:
+            return False
+        if self.pos >= _COMPACT_THRESHOLD:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self.chunks:
+            if isinstance(chunk, str):
+                text = chunk
+            else:
+                text = self.decoder.decode(chunk)
+            if text:
+                self.text += text
+                return True
+        self.text += self.decoder.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character without consuming it. Returns ``""`` at the end."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+
+class _ItemScanner(object):
+    """
+    Finds the end of an array item that spans several chunks without parsing it. Each call to ``scan`` carries on from
+    where the last one stopped, so every character of the item is only looked at once however many chunks it spans.
+    Positions are kept relative to the start of the item, which stays valid when the buffer is compacted.
+    """
+    __slots__ = ("offset", "depth", "in_string")
+
+    def __init__(self):
+        self.offset = 0
+        self.depth = 0
+        self.in_string = False
+
+    def scan(self, text: str, start: int) -> int:
+        """Returns the position just past the end of the item starting at ``start``, or ``-1`` if it isn't in ``text``."""
+        pos = start + self.offset
+        if text[start] not in '[{"':
+            # Numbers, ``true``, ``false`` and ``null`` end at the first delimiter
+            match = _SCALAR_END.search(text, pos)
+            if match is not None:
+                return match.start()
+            self.offset = len(text) - start
+            return -1
+        while True:
+            if self.in_string:
+                match = _STRING_SPECIAL.search(text, pos)
+                if match is None:
+                    pos = len(text)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(text):
+                        # Look at the escape again once the next chunk is in
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self.in_string = False
+                pos = match.end()
+                if self.depth == 0:
+                    return pos
+                continue
+            match = _STRUCTURE.search(text, pos)
+            if match is None:
+                pos = len(text)
+                break
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                self.in_string = True
+            elif char in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth <= 0:
+                    return pos
+        self.offset = pos - start
+        return -1
+
+
+def iter_json_array(chunks: Iterable[bytes], decoder: json.JSONDecoder=None,
+                    max_item_size: int=DEFAULT_MAX_ITEM_SIZE) -> Iterator[JSON]:
+    """
+    Incrementally parse a JSON document whose top level value is an array and yield its items one at a time. Only the
+    item being parsed and the unparsed part of the current chunk are held in memory. An item that spans several chunks
+    is only parsed once all of it has been read, and no more than ``max_item_size`` characters of it are buffered.
+
+    Example::
+
+        response = requests.get("http://example.com/big-list", stream=True)
+        for item in iter_json_array(response.iter_content(65536)):
+            print(item["id"])
+
+    Args:
+        chunks: The document as an iterable of UTF-8 encoded ``bytes`` (or ``str``) chunks of any size.
+        decoder: The ``JSONDecoder`` used to parse each item.
+        max_item_size: The largest item, in characters, that is buffered.
+
+    Raises:
+        ValueError: If the document isn't a valid JSON array or an item is larger than ``max_item_size``.
+    """
+    decoder = decoder or json.JSONDecoder()
+    buffer = _TextBuffer(chunks)
+    if buffer.next_char() != "[":
+        raise ValueError("expected a JSON array")
+    buffer.pos += 1
+    if buffer.next_char() == "]":
+        buffer.pos += 1
+    else:
+        while True:
+            first = buffer.next_char()
+            if first == "":
+                raise ValueError("unexpected end of JSON array")
+            try:
+                item, end = decoder.raw_decode(buffer.text, buffer.pos)
+            except ValueError:
+                # Most likely the item continues in the next chunk
+                end = None
+            if end is not None and first not in '[{"' and (end == len(buffer.text)
+                                                          or buffer.text[end] not in _DELIMITERS):
+                # A number cut off by the end of the buffer parses fine but may continue in the next chunk
+                end = None
+            if end is None:
+                scanner = _ItemScanner()
+                while scanner.scan(buffer.text, buffer.pos) == -1:
+                    if len(buffer.text) - buffer.pos > max_item_size:
+                        raise ValueError(f"JSON array item is larger than {max_item_size} characters")
+                    if not buffer.fill():
+                        break
+                item, end = decoder.raw_decode(buffer.text, buffer.pos)
+            buffer.pos = end
+            yield item
+            separator = buffer.next_char()
+            buffer.pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, got {separator!r}")
+    if buffer.next_char() != "":
+        raise ValueError("unexpected data after JSON array")
+
+
+def iter_ndjson(chunks: Iterable[bytes], decoder: json.JSONDecoder=None, codec: Codec=None) -> Iterator[JSON]:
+    """
+    Parse newline delimited JSON and yield one value per non-empty line.
+
+    Args:
+        chunks: The document as an iterable of UTF-8 encoded ``bytes`` chunks of any size.
+        decoder: The ``JSONDecoder`` used to parse each line.
+        codec: A :class:`~httpbase.codecs.Codec` used to parse each line instead of ``decoder``. The line is passed to
+            it as ``bytes``.
+
+    Raises:
+        ValueError: If a line isn't valid JSON.
+    """
+    if codec is not None:
+        decode_codec = codec.decode
+
+        def decode(line: bytearray):
+            return decode_codec(bytes(line))
+    else:
+        decode_text = (decoder or json.JSONDecoder()).decode
+
+        def decode(line: bytearray):
+            return decode_text(line.decode("utf-8"))
+
+    pending = bytearray()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        start = 0
+        newline = chunk.find(b"\n")
+        while newline != -1:
+            pending += chunk[start:newline]
+            line = pending.strip()
+            pending.clear()
+            if line:
+                yield decode(line)
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        pending += chunk[start:]
+    line = pending.strip()
+    if line:
+        yield decode(line)
+
+
+def _buffered(pieces: Iterable[bytes], buffer_size: int) -> Iterator[bytes]:
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def encode_json_array(resources: Iterable[Resource], buffer_size: int=DEFAULT_BUFFER_SIZE,
+                      use_labels: bool=True) -> Iterator[bytes]:
+    """
+    Serialize resources as a JSON array one resource at a time. The resources are only pulled from ``resources`` as the
+    chunks are consumed, so when used as the body of a request the upload itself provides the backpressure and at most
+    about ``buffer_size`` bytes are held in memory.
+
+    Example::
+
+        requests.post("http://example.com/bulk", data=encode_json_array(resource_generator()))
+
+    Args:
+        resources: Any iterable of resources, such as a generator.
+        buffer_size: Approximate size in bytes of the chunks that are yielded.
+        use_labels: Passed to :func:`~httpbase.resources.Resource.json_bytes`.
+
+    Raises:
+        SerializationError: If a resource can't be serialized. The chunks before it will already have been yielded.
+    """
+    def pieces():
+        separator = b"["
+        for resource in resources:
+            yield separator
+            yield resource.json_bytes(use_labels=use_labels)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+    return _buffered(pieces(), buffer_size)
+
+
+def encode_ndjson(resources: Iterable[Resource], buffer_size: int=DEFAULT_BUFFER_SIZE,
+                  use_labels: bool=True) -> Iterator[bytes]:
+    """
+    Serialize resources as newline delimited JSON one resource at a time. See
+    :func:`~httpbase.streaming.encode_json_array`.
+    """
+    def pieces():
+        for resource in resources:
+            yield resource.json_bytes(use_labels=use_labels)
+            yield b"\n"
+
+    return _buffered(pieces(), buffer_size)
@@ -0,0 +1,199 @@
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Hashable, NamedTuple
+
+from . import forks
+from .exceptions import TenantCapacityError
+
+
+class TenantStats(NamedTuple):
+    """Point in time snapshot of how much capacity a single tenant is using."""
+    in_flight: int = 0
+    queued: int = 0
+    completed: int = 0
+    rejected: int = 0
+    peak_in_flight: int = 0
+    total_wait: float = 0.0
+
+
+class _TenantState(object):
+    __slots__ = ("in_flight", "completed", "rejected", "peak_in_flight", "total_wait", "last_tag", "waiters")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_in_flight = 0
+        self.total_wait = 0.0
+        self.last_tag = 0.0
+        self.waiters = collections.deque()
+
+
+class _Waiter(object):
+    __slots__ = ("tag", "event", "granted", "enqueued")
+
+    def __init__(self, tag: float):
+        self.tag = tag
+        self.event = threading.Event()
+        self.granted = False
+        self.enqueued = time.monotonic()
+
+
+class TenantScheduler(object):
+    """
+    Admission control for clients that send requests on behalf of many tenants.
+
+    A scheduler limits the total number of requests in flight to ``max_concurrency`` and the number any one tenant can
+    have in flight to its limit. When there is no free capacity requests wait in a per-tenant queue and are admitted in
+    weighted fair order, so a tenant with a weight of ``2`` gets roughly twice the share of a contended client as a
+    tenant with a weight of ``1`` and a single noisy tenant can't starve everyone else.
+
+    In a child process started by a fork the scheduler starts over empty.
+
+    Example::
+
+        scheduler = TenantScheduler(max_concurrency=20, tenant_limit=5, weights={"enterprise": 3})
+        client = MyClient(baseurl="http://example.com", tenant_scheduler=scheduler)
+        client.get_thing(thing_id=1, tenant="acme")
+        print(scheduler.metrics()["acme"])
+        TenantStats(in_flight=0, queued=0, completed=1, rejected=0, peak_in_flight=1, total_wait=0.0)
+
+    Args:
+        max_concurrency: Total number of requests allowed in flight across all tenants.
+        tenant_limit: Default number of requests a single tenant may have in flight. Defaults to ``max_concurrency``.
+        limits: Per tenant overrides for ``tenant_limit``.
+        weights: Per tenant weights used when ordering queued requests. Tenants not listed have a weight of ``1``.
+        timeout: Default number of seconds to wait for a slot before giving up. ``None`` waits forever.
+
+    Raises:
+        ValueError: If ``max_concurrency`` is less than ``1`` or a weight isn't greater than ``0``.
+    """
+    def __init__(self, max_concurrency: int=10, tenant_limit: int=None, limits: Dict[Hashable, int]=None,
+                 weights: Dict[Hashable, float]=None, timeout: float=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError("weights must be greater than 0")
+        self.max_concurrency = max_concurrency
+        self.tenant_limit = tenant_limit or max_concurrency
+        self.limits = dict(limits or {})
+        self.weights = dict(weights or {})
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._tenants: Dict[Hashable, _TenantState] = {}
+        forks.register(self)
+
+    def _after_fork(self):
+        # The requests in flight and queued in the parent were made by threads that don't exist in the child and would
+        # hold their slots forever, and the lock may have been held by one of them
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._tenants = {}
+
+    def _state(self, tenant: Hashable) -> _TenantState:
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = self._tenants[tenant] = _TenantState()
+        return state
+
+    def _has_capacity(self, tenant: Hashable, state: _TenantState) -> bool:
+        return state.in_flight < self.limits.get(tenant, self.tenant_limit)
+
+    def _grant(self, state: _TenantState, waiter: _Waiter):
+        self._in_flight += 1
+        self._virtual_time = max(self._virtual_time, waiter.tag)
+        state.in_flight += 1
+        state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+        state.total_wait += time.monotonic() - waiter.enqueued
+        waiter.granted = True
+        waiter.event.set()
+
+    def _dispatch(self):
+        """Hand free slots to the queued requests with the smallest finish tags. Must be called holding the lock."""
+        while self._in_flight < self.max_concurrency:
+            best = None
+            for tenant, state in self._tenants.items():
+                if state.waiters and self._has_capacity(tenant, state):
+                    if best is None or state.waiters[0].tag < best.waiters[0].tag:
+                        best = state
+            if best is None:
+                return
+            self._grant(best, best.waiters.popleft())
+
+    def acquire(self, tenant: Hashable=None, timeout: float=None):
+        """
+        Wait for a slot for ``tenant``. Every successful call must be paired with a call to
+        :func:`~httpbase.tenants.TenantScheduler.release`.
+
+        Args:
+            tenant: The key of the tenant the request is made on behalf of.
+            timeout: Seconds to wait before giving up. Defaults to the ``timeout`` given to the scheduler.
+
+        Raises:
+            TenantCapacityError: If no slot became available before the timeout.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            state = self._state(tenant)
+            tag = max(self._virtual_time, state.last_tag) + 1.0 / self.weights.get(tenant, 1)
+            state.last_tag = tag
+            waiter = _Waiter(tag)
+            state.waiters.append(waiter)
+            self._dispatch()
+        if waiter.event.wait(timeout):
+            return
+        with self._lock:
+            if waiter.granted:
+                return
+            state.waiters.remove(waiter)
+            state.rejected += 1
+        raise TenantCapacityError(f"no capacity available for tenant {tenant!r} after {timeout} seconds")
+
+    def release(self, tenant: Hashable=None):
+        """
+        Give back a slot acquired for ``tenant`` and admit the next queued request, if any.
+
+        Args:
+            tenant: The key of the tenant the slot was acquired for.
+        """
+        with self._lock:
+            state = self._state(tenant)
+            state.in_flight -= 1
+            state.completed += 1
+            self._in_flight -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, tenant: Hashable=None, timeout: float=None):
+        """Context manager that holds a slot for ``tenant`` for the duration of the block."""
+        self.acquire(tenant, timeout=timeout)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def metrics(self) -> Dict[Hashable, TenantStats]:
+        """
+        Returns a snapshot of the usage of every tenant the scheduler has seen.
+
+        Returns:
+            dict[Hashable, TenantStats]
+        """
+        with self._lock:
+            return {
+                tenant: TenantStats(
+                    in_flight=state.in_flight,
+                    queued=len(state.waiters),
+                    completed=state.completed,
+                    rejected=state.rejected,
+                    peak_in_flight=state.peak_in_flight,
+                    total_wait=state.total_wait,
+                )
+                for tenant, state in self._tenants.items()
+            }
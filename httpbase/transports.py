@@ -0,0 +1,575 @@
+"""
+Transports send the requests of a :class:`~httpbase.client.HTTPBaseClient`. A transport is any callable with the
+signature of ``requests.request``, set as the ``transport`` of a client. Clients without one send their requests with
+``requests``.
+"""
+import asyncio
+import datetime
+import functools
+import http.client
+import io
+import os
+import re
+import sys
+import threading
+import time
+import weakref
+from typing import Callable, List, Tuple
+from urllib.parse import unquote, urlsplit
+
+import requests
+import urllib3
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from requests.hooks import dispatch_hook
+from requests.models import DEFAULT_REDIRECT_LIMIT
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.connection import is_connection_dropped
+
+from . import forks
+
+# Kwargs of ``requests.request`` that configure the network connection, which in-process transports don't have
+_CONNECTION_KWARGS = ("timeout", "verify", "cert", "proxies", "stream")
+
+_Headers = List[Tuple[str, str]]
+
+# Warming up and maintaining pools use private parts of urllib3 connection pools, which are the same in these major
+# versions. With any other version they do nothing and requests are sent as usual
+_POOL_INTERNALS_VERSIONS = (1, 2)
+_POOL_INTERNALS = int(re.match(r"\d+", urllib3.__version__).group()) in _POOL_INTERNALS_VERSIONS
+
+
+def _body_bytes(body) -> bytes:
+    """Returns the body of a prepared request as ``bytes``, reading it first if it's a file or a generator."""
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    if hasattr(body, "read"):
+        return _body_bytes(body.read())
+    return b"".join(chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in body)
+
+
+def build_response(status: int, reason: str, headers: _Headers, content: bytes, url: str,
+                   request: requests.PreparedRequest=None, elapsed: float=0.0) -> requests.Response:
+    """
+    Returns a ``requests.Response`` with a body that has already been read, for transports that don't get their
+    responses from ``requests``. Repeated headers are joined with commas, the way ``requests`` joins them.
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    joined = CaseInsensitiveDict()
+    for name, value in headers:
+        joined[name] = f"{joined[name]}, {value}" if name in joined else value
+    response.headers = joined
+    response._content = content
+    response._content_consumed = True
+    response.raw = io.BytesIO(content)
+    response.encoding = get_encoding_from_headers(joined)
+    response.url = url
+    response.request = request
+    response.elapsed = datetime.timedelta(seconds=elapsed)
+    return response
+
+
+class _IdleTimedPool(object):
+    """
+    Connection pool that records when each connection was returned to it by a request, so idle connections can be
+    reaped. Connections that maintenance takes out and puts back keep the time they were last used.
+    """
+    def _put_conn(self, conn):
+        if conn is not None:
+            if getattr(conn, "requeued", False):
+                conn.requeued = False
+            else:
+                conn.idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+
+class _HTTPPool(_IdleTimedPool, HTTPConnectionPool):
+    pass
+
+
+class _HTTPSPool(_IdleTimedPool, HTTPSConnectionPool):
+    pass
+
+
+class _IdleTimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _HTTPPool, "https": _HTTPSPool}
+
+
+def _idle_queue(pool: HTTPConnectionPool):
+    """
+    Returns the queue of the idle connections of ``pool``, or ``None`` if the private parts of the pool that warming up
+    and maintenance use aren't there, or the pool is closed.
+    """
+    if not (_POOL_INTERNALS and hasattr(pool, "_get_conn") and hasattr(pool, "_put_conn")):
+        return None
+    return getattr(getattr(pool, "pool", None), "queue", None)
+
+
+def _is_open(conn) -> bool:
+    return conn is not None and getattr(conn, "sock", None) is not None and not is_connection_dropped(conn)
+
+
+def _requeue(pool: HTTPConnectionPool, conn):
+    """Put a connection taken out by maintenance back in ``pool``, without counting it as used if it's still open."""
+    if _is_open(conn):
+        conn.requeued = True
+        pool._put_conn(conn)
+    else:
+        pool._put_conn(None)
+
+
+def _keep_warm(transport_ref: weakref.ref, stopped: threading.Event, interval: float):
+    """Body of the thread that maintains the pools of a ``SessionTransport`` until it's closed or collected."""
+    while not stopped.wait(interval):
+        transport = transport_ref()
+        if transport is None:
+            return
+        try:
+            transport.maintain()
+        except Exception:
+            # Hosts that can't be reached now are tried again on the next pass
+            pass
+        del transport
+
+
+class SessionTransport(object):
+    """
+    Sends requests with a ``requests.Session``, keeping connections open between requests so they only pay for DNS,
+    TCP and TLS setup once per connection instead of once per request. Requests sent without a transport open a new
+    connection every time.
+
+    Connections can be opened ahead of the first requests with :func:`~httpbase.transports.SessionTransport.warm`.
+    With ``min_idle`` or ``idle_timeout`` a background thread checks the pools every ``maintenance_interval`` seconds,
+    closing connections that have been idle longer than ``idle_timeout`` or that the server closed, and opening new
+    ones so at least ``min_idle`` are ready for each host the transport has connected to.
+
+    The transport is safe to use in pre-fork servers. A child process never uses the connections of its parent, the
+    session is dropped in the child right after a fork and a new one is started by the next request.
+
+    Example::
+
+        transport = SessionTransport(pool_maxsize=20, min_idle=4, idle_timeout=300)
+        client = MyClient(baseurl="https://example.com", transport=transport)
+        client.warm(connections=8)
+
+    Args:
+        pool_connections: The number of hosts to keep connection pools for.
+        pool_maxsize: The number of connections to keep open to each host. Set it to the number of threads sending
+            requests at once.
+        max_retries: The number of times to retry requests that fail to connect.
+        min_idle: The number of idle connections to keep open to each host.
+        idle_timeout: Seconds after which idle connections beyond ``min_idle`` are closed. ``None`` keeps them open
+            until the server closes them.
+        maintenance_interval: Seconds between checks of the pools.
+    """
+    def __init__(self, pool_connections: int=DEFAULT_POOLSIZE, pool_maxsize: int=DEFAULT_POOLSIZE,
+                 max_retries: int=0, min_idle: int=0, idle_timeout: float=None, maintenance_interval: float=30.0):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.min_idle = min(min_idle, pool_maxsize)
+        self.idle_timeout = idle_timeout
+        self.maintenance_interval = maintenance_interval
+        self._lock = threading.Lock()
+        self._session = None
+        self._stopped = None
+        self._pid = os.getpid()
+        forks.register(self)
+
+    @property
+    def session(self) -> requests.Session:
+        """The session requests are sent with, started by the first request in each process."""
+        if self._pid != os.getpid():
+            self._after_fork()
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._new_session()
+                    if self.min_idle or self.idle_timeout is not None:
+                        self._stopped = threading.Event()
+                        threading.Thread(target=_keep_warm, name="httpbase-pool-maintenance", daemon=True,
+                                         args=(weakref.ref(self), self._stopped, self.maintenance_interval)).start()
+                session = self._session
+        return session
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = _IdleTimedAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                                    max_retries=self.max_retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def __call__(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def _pool(self, url: str) -> HTTPConnectionPool:
+        """Returns the connection pool requests to ``url`` are sent with."""
+        session = self.session
+        adapter = session.get_adapter(url)
+        settings = session.merge_environment_settings(url, {}, None, None, None)
+        if not hasattr(adapter, "get_connection_with_tls_context"):  # pragma: no cover
+            # requests before 2.32.2
+            return adapter.get_connection(url, settings["proxies"])
+        prepared = requests.Request("GET", url).prepare()
+        return adapter.get_connection_with_tls_context(prepared, settings["verify"], settings["proxies"],
+                                                       settings["cert"])
+
+    def _fill(self, pool: HTTPConnectionPool, connections: int) -> int:
+        if _idle_queue(pool) is None:
+            return 0
+        # Take connections out of the pool the way that many concurrent requests would, so requests sent meanwhile
+        # aren't left without one, and open the ones that aren't open in parallel
+        taken = [pool._get_conn() for _ in range(min(connections, self.pool_maxsize))]
+        closed = [conn for conn in taken if not _is_open(conn)]
+        errors = []
+
+        def connect(conn):
+            try:
+                conn.connect()
+            except Exception as err:
+                conn.close()
+                errors.append(err)
+
+        threads = [threading.Thread(target=connect, args=(conn,)) for conn in closed]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for conn in taken:
+            if conn in closed:
+                pool._put_conn(conn if _is_open(conn) else None)
+            else:
+                _requeue(pool, conn)
+        if errors:
+            raise requests.ConnectionError(errors[0])
+        return len(taken)
+
+    def warm(self, url: str, connections: int=1) -> int:
+        """
+        Open connections to the host of ``url`` until ``connections`` of them are idle and ready, at most
+        ``pool_maxsize``. Connections already open are reused.
+
+        Does nothing with versions of urllib3 other than 1 and 2, since it uses private parts of their connection pools.
+
+        Args:
+            url: Any URL on the host.
+            connections: The number of connections to have open.
+
+        Returns:
+            The number of idle connections to the host.
+
+        Raises:
+            ValueError: If ``connections`` is less than ``1``.
+            requests.ConnectionError: If a connection couldn't be opened. The connections that could be opened are
+                kept.
+        """
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        self._fill(self._pool(url), connections)
+        return self.idle_connections(url)
+
+    def idle_connections(self, url: str) -> int:
+        """Returns the number of open connections to the host of ``url`` that no request is using."""
+        return sum(_is_open(conn) for conn in list(_idle_queue(self._pool(url)) or ()))
+
+    def maintain(self):
+        """
+        Close the connections that have been idle for longer than ``idle_timeout``, or that the server closed, and open
+        new ones so at least ``min_idle`` are ready for each host. Called regularly by a background thread when the
+        transport has a ``min_idle`` or an ``idle_timeout``. Like warming up, does nothing with versions of urllib3
+        other than 1 and 2.
+        """
+        if self._session is None or not _POOL_INTERNALS:
+            return
+        now = time.monotonic()
+        for adapter in set(self._session.adapters.values()):
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                pool = pools.get(key)
+                queue = _idle_queue(pool)
+                if queue is None:
+                    continue
+                idle = [pool._get_conn() for _ in range(sum(conn is not None for conn in list(queue)))]
+                kept = 0
+                # The most recently used connections come out of the pool first and are the ones kept
+                for conn in idle:
+                    expired = (kept >= self.min_idle and self.idle_timeout is not None
+                               and now - getattr(conn, "idle_since", now) > self.idle_timeout)
+                    if _is_open(conn) and not expired:
+                        kept += 1
+                    else:
+                        conn.close()
+                for conn in reversed(idle):
+                    _requeue(pool, conn)
+                if kept < self.min_idle:
+                    self._fill(pool, self.min_idle)
+
+    def close(self):
+        """Close the open connections and stop maintaining the pools. The next request starts a new session."""
+        with self._lock:
+            session, self._session = self._session, None
+            stopped, self._stopped = self._stopped, None
+        if stopped is not None:
+            stopped.set()
+        if session is not None:
+            session.close()
+
+    def _after_fork(self):
+        if self._pid == os.getpid():
+            return
+        # The sockets of the session are shared with the parent and must never be used here. Dropping the session only
+        # closes the copies the child has. The lock may have been held by a thread that doesn't exist in the child, and
+        # neither does the maintenance thread, which is started again with the new session
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._session = None
+        self._stopped = None
+
+
+@functools.lru_cache(maxsize=None)
+def _preparing_session() -> requests.Session:
+    """
+    Returns the session in-process transports prepare requests with, so they get the default headers, the ``.netrc``
+    auth and the rest of what ``requests.request`` adds. It never sends anything, so it never has connections or cookies.
+    """
+    return requests.Session()
+
+
+class InProcessTransport(object):
+    """
+    Base class for transports that hand requests to an application in the same process instead of sending them over a
+    socket. Requests are prepared by a ``requests.Session``, so the URL, headers and body the application gets,
+    including the default headers like ``User-Agent``, are the same as what would have been sent, and redirects are
+    followed the same way. Kwargs that configure the connection, like ``timeout`` and ``verify``, are ignored.
+    Exceptions raised by the application aren't caught.
+
+    Subclasses implement :func:`~httpbase.transports.InProcessTransport.handle`.
+    """
+    def __call__(self, method: str, url: str, allow_redirects: bool=True, **kwargs) -> requests.Response:
+        for name in _CONNECTION_KWARGS:
+            kwargs.pop(name, None)
+        session = _preparing_session()
+        response = self._send(session.prepare_request(requests.Request(method, url, **kwargs)))
+        history = []
+        while allow_redirects and response.is_redirect:
+            history.append(response)
+            if len(history) > DEFAULT_REDIRECT_LIMIT:
+                raise requests.TooManyRedirects(f"exceeded {DEFAULT_REDIRECT_LIMIT} redirects", response=response)
+            # ``requests`` builds the next request the same way it does when it follows a redirect itself. It rewrites
+            # the method, drops the body, and drops the ``Authorization`` header when the redirect leaves the host
+            redirected = next(session.resolve_redirects(response, response.request, yield_requests=True))
+            response = self._send(redirected)
+        response.history = history
+        return response
+
+    def handle(self, method: str, url: str, headers: _Headers, body: bytes) -> Tuple[int, str, _Headers, bytes]:
+        """
+        Pass a request to the application.
+
+        Args:
+            method: The HTTP method.
+            url: The full URL, including the query string.
+            headers: The request headers as ``(name, value)`` pairs.
+            body: The request body.
+
+        Returns:
+            The status code, reason phrase, headers and body of the response.
+        """
+        raise NotImplementedError
+
+    def _send(self, prepared: requests.PreparedRequest) -> requests.Response:
+        start = time.perf_counter()
+        headers = [(name, value) for name, value in prepared.headers.items() if name.lower() != "transfer-encoding"]
+        body = _body_bytes(prepared.body)
+        if body and "Content-Length" not in prepared.headers:
+            headers.append(("Content-Length", str(len(body))))
+        prepared.body = body or None
+        status, reason, response_headers, content = self.handle(prepared.method, prepared.url, headers, body)
+        response = build_response(status, reason, response_headers, content, prepared.url, prepared,
+                                  time.perf_counter() - start)
+        return dispatch_hook("response", prepared.hooks, response)
+
+
+class WSGITransport(InProcessTransport):
+    """
+    Sends requests straight to a WSGI application, with no network I/O.
+
+    Example::
+
+        client = MyClient(baseurl="http://testserver", transport=WSGITransport(flask_app))
+
+    Args:
+        app: The WSGI application.
+        remote_addr: The ``REMOTE_ADDR`` of the requests.
+    """
+    def __init__(self, app: Callable, remote_addr: str="127.0.0.1"):
+        self.app = app
+        self.remote_addr = remote_addr
+
+    def environ(self, method: str, url: str, headers: _Headers, body: bytes) -> dict:
+        """Returns the WSGI environ for a request."""
+        parsed = urlsplit(url)
+        environ = {
+            "REQUEST_METHOD": method,
+            "SCRIPT_NAME": "",
+            # WSGI strings are bytes decoded as latin-1
+            "PATH_INFO": unquote(parsed.path, encoding="latin-1") or "/",
+            "QUERY_STRING": parsed.query,
+            "SERVER_NAME": parsed.hostname or "localhost",
+            "SERVER_PORT": str(parsed.port or (443 if parsed.scheme == "https" else 80)),
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": self.remote_addr,
+            "HTTP_HOST": parsed.netloc,
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": parsed.scheme or "http",
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in headers:
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = "HTTP_" + key
+            environ[key] = f"{environ[key]},{value}" if key in environ and key != "HTTP_HOST" else value
+        return environ
+
+    def handle(self, method: str, url: str, headers: _Headers, body: bytes) -> Tuple[int, str, _Headers, bytes]:
+        started = []
+        written = []
+
+        def start_response(status: str, response_headers: _Headers, exc_info=None):
+            # Nothing is sent until the application returns, so an error page can always replace the response
+            started[:] = [status, response_headers]
+            return written.append
+
+        result = self.app(self.environ(method, url, headers, body), start_response)
+        try:
+            for chunk in result:
+                written.append(chunk)
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+        if not started:
+            raise RuntimeError("the WSGI application didn't call start_response")
+        status, response_headers = started
+        code, _, reason = status.partition(" ")
+        return int(code), reason, list(response_headers), b"".join(written)
+
+
+class ASGITransport(InProcessTransport):
+    """
+    Sends requests straight to an ASGI application, with no network I/O. The application runs on an event loop in a
+    background thread that is started by the first request, so the transport works from synchronous code and from
+    inside another event loop, and state the application keeps on its loop is shared by every request. Lifespan events
+    aren't sent.
+
+    Example::
+
+        client = MyClient(baseurl="http://testserver", transport=ASGITransport(starlette_app))
+
+    Args:
+        app: The ASGI application.
+        client: The ``(host, port)`` of the client in the request scope.
+    """
+    def __init__(self, app: Callable, client: Tuple[str, int]=("127.0.0.1", 123)):
+        self.app = app
+        self.client = client
+        self._loop = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        forks.register(self)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._pid != os.getpid():
+            self._after_fork()
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="httpbase-asgi", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def close(self):
+        """Stop the event loop of the application. It is started again by the next request."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def _after_fork(self):
+        if self._pid == os.getpid():
+            return
+        # The thread running the event loop wasn't copied in to the child, a new loop is started by the next request
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._loop = None
+
+    def scope(self, method: str, url: str, headers: _Headers) -> dict:
+        """Returns the ASGI HTTP connection scope for a request."""
+        parsed = urlsplit(url)
+        scheme = parsed.scheme or "http"
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": scheme,
+            "path": unquote(parsed.path) or "/",
+            "raw_path": (parsed.path or "/").encode("ascii"),
+            "query_string": parsed.query.encode("ascii"),
+            "root_path": "",
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in [("Host", parsed.netloc), *headers]],
+            "server": (parsed.hostname or "localhost", parsed.port or (443 if scheme == "https" else 80)),
+            "client": self.client,
+        }
+
+    async def _run(self, scope: dict, body: bytes) -> Tuple[int, _Headers, bytes]:
+        request = [{"type": "http.request", "body": body, "more_body": False}]
+        complete = asyncio.Event()
+        started = []
+        chunks = []
+
+        async def receive() -> dict:
+            if request:
+                return request.pop()
+            await complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict):
+            if message["type"] == "http.response.start":
+                started[:] = [message["status"], message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    complete.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            complete.set()
+        if not started:
+            raise RuntimeError("the ASGI application didn't send a response")
+        status, headers = started
+        return status, [(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers], b"".join(chunks)
+
+    def handle(self, method: str, url: str, headers: _Headers, body: bytes) -> Tuple[int, str, _Headers, bytes]:
+        future = asyncio.run_coroutine_threadsafe(self._run(self.scope(method, url, headers), body), self._get_loop())
+        status, response_headers, content = future.result()
+        return status, http.client.responses.get(status, ""), response_headers, content
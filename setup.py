@@ -11,7 +11,7 @@ setup(
     author='Ian Auld',
     author_email='imauld@gmail.com',
     description="Library for quickly making those simple HTTP clients we all end up writing all the time",
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks*']),
     include_package_data=True,
     install_requires=['requests'],
     zip_safe=False,
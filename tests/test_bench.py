@@ -0,0 +1,109 @@
+import contextlib
+import io
+import time
+from unittest import TestCase
+
+from httpbase.bench import LatencyHistogram, StandInServer, main, run_load, status_class
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.routes import Route
+
+
+class ItemsClient(HTTPBaseClient):
+    def get_item(self, item_id: int=1):
+        return self._make_request(Route("/items/{item_id}", HTTPMethods.GET), item_id=item_id)
+
+
+def item_args():
+    return ({"item_id": item_id} for item_id in range(3))
+
+
+class TestLatencyHistogram(TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for millis in range(1, 101):
+            histogram.record(millis / 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.mean, 0.0505)
+        self.assertEqual(histogram.min, 0.001)
+        self.assertEqual(histogram.max, 0.1)
+        for percent, expected in ((50, 0.05), (90, 0.09), (99, 0.099), (100, 0.1)):
+            self.assertGreaterEqual(histogram.percentile(percent), expected)
+            self.assertLessEqual(histogram.percentile(percent), expected * 1.02)
+
+    def test_bars(self):
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.bars(), [])
+        self.assertEqual(histogram.percentile(99), 0.0)
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+        bars = histogram.bars(rows=10)
+        self.assertLessEqual(len(bars), 10)
+        self.assertEqual(sum(count for _, _, count in bars), 1000)
+
+
+class TestStatusClass(TestCase):
+    def test_status_class(self):
+        class Response(object):
+            def __init__(self, status_code):
+                self.status_code = status_code
+
+        self.assertEqual(status_class(Response(204)), "2xx")
+        self.assertEqual(status_class(Response(429)), "4xx")
+        self.assertEqual(status_class(Response(503)), "5xx")
+        self.assertEqual(status_class(ValueError()), "error: ValueError")
+        self.assertEqual(status_class(object()), "other")
+
+
+class TestRunLoad(TestCase):
+    def test_closed_loop(self):
+        with StandInServer() as server:
+            client = ItemsClient(baseurl=server.url)
+            report = run_load(client.get_item, concurrency=2, requests=20)
+        self.assertEqual(report.requests, 20)
+        self.assertEqual(report.statuses, {"2xx": 20})
+        self.assertEqual(sum(report.throughput), 20)
+        self.assertIn("closed loop", report.format())
+
+    def test_open_loop_measures_from_schedule(self):
+        # One thread can only send one request every 20ms, so at 200 requests/s each request is sent later than the
+        # last and the waiting has to show up in the latencies
+        report = run_load(lambda: time.sleep(0.02), rate=200, requests=10, max_in_flight=1)
+        self.assertEqual(report.requests, 10)
+        self.assertGreater(report.late, 0)
+        self.assertGreater(report.histogram.max, 0.1)
+        self.assertGreater(report.histogram.percentile(90), report.histogram.percentile(10) + 0.05)
+
+    def test_open_loop_rate(self):
+        report = run_load(lambda: None, rate=100, duration=0.2)
+        self.assertEqual(report.requests, 20)
+        self.assertGreaterEqual(report.duration, 0.18)
+
+    def test_errors(self):
+        def call(item_id):
+            if item_id == 2:
+                raise ValueError("bad item")
+
+        with StandInServer(status=503) as server:
+            client = ItemsClient(baseurl=server.url)
+            report = run_load(client.get_item, ({"item_id": item_id} for item_id in range(4)), concurrency=1)
+        self.assertEqual(report.statuses, {"5xx": 4})
+        report = run_load(call, ({"item_id": item_id} for item_id in range(4)), concurrency=2)
+        self.assertEqual(report.statuses, {"other": 3, "error: ValueError": 1})
+
+    def test_mode_required(self):
+        with self.assertRaises(ValueError):
+            run_load(lambda: None)
+        with self.assertRaises(ValueError):
+            run_load(lambda: None, rate=1, concurrency=1)
+
+
+class TestMain(TestCase):
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(["tests.test_bench:ItemsClient", "get_item", "--local", "--concurrency", "2",
+                           "--args", "tests.test_bench:item_args"])
+        self.assertEqual(status, 0)
+        self.assertIn("requests: 3 ", output.getvalue())
+        self.assertIn("2xx", output.getvalue())
@@ -0,0 +1,174 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from httpbase.cassettes import MAGIC, Cassette, CassetteWriter, Interaction, RecordingTransport, ReplayTransport
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.exceptions import CassetteError
+from httpbase.routes import Route
+from httpbase.transports import WSGITransport, build_response
+
+
+def wsgi_app(environ, start_response):
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = environ["wsgi.input"].read(length)
+    start_response("200 OK", [("Content-Type", "text/plain"), ("X-Path", environ["PATH_INFO"])])
+    return [environ["REQUEST_METHOD"].encode(), b" ", environ["QUERY_STRING"].encode(), b" ", body]
+
+
+class ItemsClient(HTTPBaseClient):
+    def get_item(self, item_id: int, **params):
+        return self._make_request(Route("/items/{item_id}", HTTPMethods.GET), item_id=item_id, params=params)
+
+    def create_item(self, data: bytes):
+        return self._make_request(Route("/items", HTTPMethods.POST), data=data)
+
+
+def interaction(index: int, elapsed: float=0.0) -> Interaction:
+    return Interaction("GET", f"http://testserver/items/{index}", [("Accept", "*/*")], b"", 200, "OK",
+                       [("Content-Type", "text/plain")], f"item {index}".encode(), elapsed)
+
+
+class CassetteTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "test.cassette")
+
+
+class TestCassette(CassetteTestCase):
+    def test_round_trip(self):
+        recorded = Interaction("POST", "http://testserver/items?a=1", [("Content-Type", "application/json"),
+                               ("X-Name", "é: ok")], b'{"a": 1}', 201, "Created",
+                               [("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")], b"\x00\xff", 0.25)
+        with CassetteWriter(self.path) as writer:
+            writer.write(recorded)
+            writer.write(interaction(1))
+        cassette = Cassette(self.path)
+        self.addCleanup(cassette.close)
+        self.assertEqual(len(cassette), 2)
+        self.assertEqual(cassette[0], recorded)
+        self.assertEqual(list(cassette), [recorded, interaction(1)])
+        self.assertEqual(cassette.request_key(1), ("GET", "http://testserver/items/1"))
+
+    def test_append(self):
+        with CassetteWriter(self.path) as writer:
+            writer.write(interaction(0))
+        with CassetteWriter(self.path) as writer:
+            writer.write(interaction(1))
+        cassette = Cassette(self.path)
+        self.addCleanup(cassette.close)
+        self.assertEqual(list(cassette), [interaction(0), interaction(1)])
+
+    def test_truncated_record_ignored(self):
+        with CassetteWriter(self.path) as writer:
+            writer.write(interaction(0))
+            writer.write(interaction(1))
+        with open(self.path, "r+b") as cassette_file:
+            cassette_file.truncate(os.path.getsize(self.path) - 3)
+        cassette = Cassette(self.path)
+        self.addCleanup(cassette.close)
+        self.assertEqual(list(cassette), [interaction(0)])
+
+    def test_not_a_cassette(self):
+        with open(self.path, "wb") as cassette_file:
+            cassette_file.write(b"something else")
+        with self.assertRaises(CassetteError):
+            Cassette(self.path)
+        with self.assertRaises(CassetteError):
+            CassetteWriter(self.path)
+
+    def test_empty(self):
+        with open(self.path, "wb") as cassette_file:
+            cassette_file.write(MAGIC)
+        cassette = Cassette(self.path)
+        self.addCleanup(cassette.close)
+        self.assertEqual(len(cassette), 0)
+
+
+class TestRecordAndReplay(CassetteTestCase):
+    def record(self):
+        with RecordingTransport(self.path, transport=WSGITransport(wsgi_app)) as recorder:
+            client = ItemsClient(baseurl="http://testserver", transport=recorder)
+            responses = [client.get_item(1, page=1), client.get_item(1, page=2), client.get_item(2),
+                         client.create_item(b"new item")]
+        return responses
+
+    def test_record(self):
+        responses = self.record()
+        self.assertEqual(responses[0].text, "GET page=1 ")
+        cassette = Cassette(self.path)
+        self.addCleanup(cassette.close)
+        self.assertEqual(len(cassette), 4)
+        self.assertEqual(cassette[0].url, "http://testserver/items/1?page=1")
+        self.assertEqual(cassette[0].response_body, b"GET page=1 ")
+        self.assertIn(("X-Path", "/items/1"), cassette[0].response_headers)
+        self.assertEqual(cassette[3].method, "POST")
+        self.assertEqual(cassette[3].request_body, b"new item")
+        self.assertIn(("Content-Length", "8"), cassette[3].request_headers)
+        self.assertGreater(cassette[3].elapsed, 0)
+
+    def test_record_request_bodies(self):
+        def transport(method, url, **kwargs):
+            # Doesn't say what it sent, like a transport that doesn't go through ``requests``
+            return build_response(200, "OK", [], b"", url)
+
+        with RecordingTransport(self.path, transport=transport) as recorder:
+            recorder("POST", "http://testserver/form", data={"name": "café"})
+            recorder("POST", "http://testserver/json", json={"id": 1})
+            recorder("POST", "http://testserver/text", data="café")
+            recorder("POST", "http://testserver/chunks", data=iter([b"a", b"b"]))
+        with RecordingTransport(self.path, transport=WSGITransport(wsgi_app)) as recorder:
+            recorder("POST", "http://testserver/text", data="café")
+        cassette = Cassette(self.path)
+        self.addCleanup(cassette.close)
+        self.assertEqual([cassette[index].request_body for index in range(len(cassette))],
+                         [b"name=caf%C3%A9", b'{"id": 1}', "café".encode(), b"ab", "café".encode()])
+
+    def test_replay_by_request(self):
+        recorded = self.record()
+        client = ItemsClient(baseurl="http://testserver", transport=ReplayTransport(self.path))
+        self.assertEqual(client.create_item(b"").text, "POST  new item")
+        self.assertEqual(client.get_item(1, page=2).text, "GET page=2 ")
+        self.assertEqual(client.get_item(2).text, "GET  ")
+        response = client.get_item(1, page=1)
+        self.assertEqual(response.status_code, recorded[0].status_code)
+        self.assertEqual(response.headers["X-Path"], "/items/1")
+        self.assertEqual(response.url, "http://testserver/items/1?page=1")
+        with self.assertRaises(CassetteError):
+            client.get_item(3)
+
+    def test_replay_sequence(self):
+        self.record()
+        client = ItemsClient(baseurl="http://testserver", transport=ReplayTransport(self.path, match="sequence"))
+        texts = [client.get_item(9).text for _ in range(5)]
+        self.assertEqual(texts, ["GET page=1 ", "GET page=2 ", "GET  ", "POST  new item", "GET page=1 "])
+
+    def test_no_repeat(self):
+        self.record()
+        transport = ReplayTransport(self.path, repeat=False)
+        client = ItemsClient(baseurl="http://testserver", transport=transport)
+        client.get_item(2)
+        with self.assertRaises(CassetteError):
+            client.get_item(2)
+        transport = ReplayTransport(self.path, match="sequence", repeat=False)
+        for _ in range(4):
+            transport("GET", "http://testserver/anything")
+        with self.assertRaises(CassetteError):
+            transport("GET", "http://testserver/anything")
+
+    def test_simulate_latency(self):
+        with CassetteWriter(self.path) as writer:
+            writer.write(interaction(0, elapsed=0.05))
+        transport = ReplayTransport(self.path, simulate_latency=True, latency_scale=2)
+        start = time.perf_counter()
+        response = transport("GET", "http://testserver/items/0")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        self.assertEqual(response.elapsed.total_seconds(), 0.05)
+        self.assertEqual(response.text, "item 0")
+
+    def test_invalid_match(self):
+        with self.assertRaises(ValueError):
+            ReplayTransport(self.path, match="url")
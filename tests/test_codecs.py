@@ -0,0 +1,254 @@
+import json
+from unittest import TestCase, mock, skipIf
+
+import requests
+
+from httpbase import codecs
+from httpbase.client import HTTPBaseClient
+from httpbase.codecs import (
+    Codec, JSONCodec, OrjsonCodec, get_codec, get_codec_for_content_type, get_default_codec, register_codec,
+    set_default_codec
+)
+from httpbase.constants import HTTPMethods, HTTPResponseCodes
+from httpbase.exceptions import ConfigurationError, SerializationError
+from httpbase.fields import IntField, StrField
+from httpbase.resources import FrozenResource, Resource
+from httpbase.routes import Route
+from httpbase.streaming import iter_ndjson
+
+
+class ReprCodec(Codec):
+    name = "repr"
+    content_type = "text/x-python"
+
+    def encode(self, value) -> bytes:
+        return repr(value).encode()
+
+    def decode(self, data):
+        if isinstance(data, bytes):
+            data = data.decode()
+        return eval(data, {})
+
+
+class Foo(Resource):
+    foo = StrField(label="foo")
+    bar = IntField(label="bar")
+
+
+class TestCodecs(TestCase):
+    def tearDown(self):
+        set_default_codec(None)
+        codecs._CODECS.pop(ReprCodec.name, None)
+
+    def test_default_codec(self):
+        self.assertIsInstance(get_default_codec(), JSONCodec)
+        self.assertIs(get_codec(), get_default_codec())
+        self.assertEqual(Foo(foo="é", bar=1).json(), json.dumps({"foo": "é", "bar": 1}))
+
+    def test_deep_values(self):
+        value = {"a": [1, 2.5, None, True, {"é": "x"}], 1: {}, None: []}
+        self.assertEqual(codecs._dumps_iteratively(value), json.dumps(value))
+        deep = leaf = []
+        for _ in range(5000):
+            leaf.append({"k": []})
+            leaf = leaf[0]["k"]
+        self.assertEqual(JSONCodec().dumps(deep), '[{"k": ' * 5000 + "[]" + "}]" * 5000)
+
+    def test_get_codec(self):
+        codec = JSONCodec()
+        self.assertIs(get_codec(codec), codec)
+        self.assertIs(get_codec("json"), get_codec("json"))
+        with self.assertRaises(ConfigurationError):
+            get_codec("yaml")
+
+    def test_auto(self):
+        expected = OrjsonCodec if codecs.orjson is not None else JSONCodec
+        self.assertIs(type(get_codec("auto")), expected)
+
+    def test_register_codec(self):
+        register_codec(ReprCodec)
+        self.assertIsInstance(get_codec("repr"), ReprCodec)
+        set_default_codec("repr")
+        self.assertEqual(Foo(foo="a", bar=1).json(), "{'foo': 'a', 'bar': 1}")
+        self.assertEqual(Foo.from_json("{'foo': 'a', 'bar': 2}").bar.value, 2)
+        set_default_codec(None)
+        self.assertIsInstance(get_default_codec(), JSONCodec)
+
+    @skipIf(codecs.orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        class Bar(Foo):
+            json_codec = "orjson"
+
+        resource = Bar(foo="é", bar=1)
+        self.assertEqual(resource.json(), '{"foo":"é","bar":1}')
+        self.assertEqual(resource.json_bytes(), '{"foo":"é","bar":1}'.encode())
+        self.assertEqual(Bar.from_json(resource.json_bytes()).dict(), resource.dict())
+        self.assertEqual(get_codec("orjson").decode(get_codec("orjson").encode({1: [1.5]})), {"1": [1.5]})
+
+    @skipIf(codecs.orjson is not None, "orjson is installed")
+    def test_orjson_missing(self):
+        with self.assertRaises(ConfigurationError):
+            get_codec("orjson")
+
+    def test_json_bytes(self):
+        resource = Foo(foo="é", bar=1)
+        self.assertEqual(resource.json_bytes(), resource.json().encode())
+        with self.assertRaises(SerializationError):
+            Foo(foo="a", bar="b").json_bytes()
+
+    def test_frozen_json_bytes(self):
+        class Bar(FrozenResource):
+            foo = StrField(label="foo")
+
+        resource = Bar(foo="a")
+        self.assertIs(resource.json_bytes(), resource.json_bytes())
+        self.assertEqual(resource.json_bytes(), b'{"foo": "a"}')
+
+    def test_iter_ndjson_codec(self):
+        register_codec(ReprCodec)
+        chunks = [b"{'a': 1}\n{'a'", b": 2}\n"]
+        self.assertEqual(list(iter_ndjson(chunks, codec=get_codec("repr"))), [{"a": 1}, {"a": 2}])
+
+
+class CodecClient(HTTPBaseClient):
+    baseurl = "http://example.com"
+    codec = ReprCodec()
+
+
+class TestClientCodecs(TestCase):
+    def test_error_response(self):
+        client = CodecClient()
+        response = client._make_request(Route("/foo/{foo_id}", HTTPMethods.GET))
+        self.assertEqual(response.status_code, HTTPResponseCodes.BAD_REQUEST)
+        self.assertEqual(response.headers["Content-Type"], "text/x-python")
+        self.assertIn("error making request", client._decode_response(response)["message"])
+
+    def test_json_kwarg(self):
+        with mock.patch("httpbase.client.requests.request") as request:
+            CodecClient()._make_request(Route("/foo", HTTPMethods.POST), json={"a": 1})
+        kwargs = request.call_args[1]
+        self.assertNotIn("json", kwargs)
+        self.assertEqual(kwargs["data"], b"{'a': 1}")
+        self.assertEqual(kwargs["headers"], {"Content-Type": "text/x-python", "Accept": "text/x-python"})
+
+    def test_json_kwarg_default_codec(self):
+        with mock.patch("httpbase.client.requests.request") as request:
+            HTTPBaseClient(baseurl="http://example.com")._make_request(Route("/foo", HTTPMethods.POST), json={"a": 1})
+        self.assertEqual(request.call_args[1], {"json": {"a": 1}})
+
+    def test_codec_kwarg(self):
+        client = HTTPBaseClient(baseurl="http://example.com", codec="json")
+        self.assertIsInstance(client._get_codec(), JSONCodec)
+
+
+class TestBinaryCodecs(TestCase):
+    value = {
+        "ints": [0, 1, 127, 128, -1, -32, -33, 255, 256, -129, 65536, -65537, 2 ** 40, -2 ** 40, 2 ** 64 - 1, -2 ** 63],
+        "float": 1.5,
+        "flags": [True, False, None],
+        "text": ["", "é", "x" * 31, "x" * 300, "x" * 70000],
+        "bytes": b"\x00\xff" * 200,
+        "nested": {"list": list(range(20)), "map": {str(index): index for index in range(20)}},
+        1: "non-string key",
+    }
+
+    def test_round_trip(self):
+        for name in ("msgpack", "cbor"):
+            codec = get_codec(name)
+            self.assertEqual(codec.decode(codec.encode(self.value)), self.value, name)
+            self.assertEqual(codec.decode(bytearray(codec.encode([]))), [], name)
+
+    def test_msgpack_spec(self):
+        codec = get_codec("msgpack")
+        self.assertEqual(codec.encode({"compact": True, "schema": 0}).hex(), "82a7636f6d70616374c3a6736368656d6100")
+        self.assertEqual(codec.content_type, "application/msgpack")
+
+    def test_cbor_spec(self):
+        # Examples from appendix A of RFC 8949
+        codec = get_codec("cbor")
+        examples = [
+            (1000000, "1a000f4240"), (-1000, "3903e7"), (1.1, "fb3ff199999999999a"), ("ü", "62c3bc"),
+            ([1, [2, 3], [4, 5]], "8301820203820405"), ({"a": 1, "b": [2, 3]}, "a26161016162820203"),
+            (18446744073709551616, "c249010000000000000000"), (-18446744073709551617, "c349010000000000000000"),
+        ]
+        for value, encoded in examples:
+            self.assertEqual(codec.encode(value).hex(), encoded)
+            self.assertEqual(codec.decode(bytes.fromhex(encoded)), value)
+        self.assertEqual(codec.decode(bytes.fromhex("f93c00")), 1.0)
+        self.assertEqual(codec.decode(bytes.fromhex("9f018202039f0405ffff")), [1, [2, 3], [4, 5]])
+        self.assertEqual(codec.decode(bytes.fromhex("bf6346756ef563416d7421ff")), {"Fun": True, "Amt": -2})
+        self.assertEqual(codec.decode(bytes.fromhex("7f657374726561646d696e67ff")), "streaming")
+
+    def test_invalid(self):
+        for name in ("msgpack", "cbor"):
+            codec = get_codec(name)
+            encoded = codec.encode({"a": [1, 2]})
+            for data in (b"", encoded[:-1], encoded + b"\x00"):
+                with self.assertRaises(ValueError):
+                    codec.decode(data)
+            with self.assertRaises(TypeError):
+                codec.encode(object())
+            with self.assertRaises(TypeError):
+                codec.dumps({})
+        with self.assertRaises(ValueError):
+            get_codec("msgpack").encode(2 ** 64)
+        with self.assertRaises(ValueError):
+            get_codec("msgpack").decode(b"\xc1")
+
+    def test_resource(self):
+        for name in ("msgpack", "cbor"):
+            resource = Foo(foo="é", bar=2 ** 40)
+            data = resource.to_bytes(name)
+            self.assertLess(len(data), len(resource.json_bytes()))
+            self.assertEqual(Foo.from_bytes(data, name).dict(), resource.dict())
+            self.assertEqual([item.dict() for item in Foo.from_bytes(get_codec(name).encode([resource.dict()]), name)],
+                             [resource.dict()])
+            with self.assertRaises(SerializationError):
+                Foo(foo="a", bar="b").to_bytes(name)
+        self.assertEqual(Foo(foo="a", bar=1).to_bytes(), Foo(foo="a", bar=1).json_bytes())
+
+    def test_frozen_resource(self):
+        class Bar(FrozenResource):
+            foo = StrField(label="foo")
+
+        resource = Bar(foo="a")
+        self.assertIs(resource.to_bytes("cbor"), resource.to_bytes("cbor"))
+        self.assertEqual(Bar.from_bytes(resource.to_bytes("cbor"), "cbor"), resource)
+
+    def test_get_codec_for_content_type(self):
+        self.assertIsInstance(get_codec_for_content_type("application/msgpack"), codecs.MessagePackCodec)
+        self.assertIsInstance(get_codec_for_content_type("Application/CBOR"), codecs.CBORCodec)
+        self.assertIs(get_codec_for_content_type("application/json; charset=utf-8"), get_default_codec())
+        self.assertIsNone(get_codec_for_content_type("text/html"))
+
+
+class TestContentNegotiation(TestCase):
+    def setUp(self):
+        self.client = HTTPBaseClient(baseurl="http://example.com")
+        self.route = Route("/foo", HTTPMethods.POST, codec="msgpack")
+
+    def test_request(self):
+        with mock.patch("httpbase.client.requests.request") as request:
+            self.client._make_request(self.route, json={"a": 1}, headers={"Accept": "application/json"})
+        kwargs = request.call_args[1]
+        self.assertEqual(kwargs["data"], get_codec("msgpack").encode({"a": 1}))
+        self.assertEqual(kwargs["headers"], {"Content-Type": "application/msgpack", "Accept": "application/json"})
+
+    def test_route_without_codec(self):
+        with mock.patch("httpbase.client.requests.request") as request:
+            self.client._make_request(Route("/foo", HTTPMethods.POST), json={"a": 1})
+        self.assertEqual(request.call_args[1], {"json": {"a": 1}})
+
+    def test_decode_response(self):
+        response = requests.Response()
+        response._content = get_codec("cbor").encode({"a": 1})
+        response.headers = {"Content-Type": "application/cbor"}
+        self.assertEqual(self.client._decode_response(response), {"a": 1})
+        response.headers = {}
+        response._content = get_codec("msgpack").encode({"a": 1})
+        self.assertEqual(self.client._decode_response(response, self.route), {"a": 1})
+
+    def test_error_response(self):
+        response = self.client._make_request(Route("/foo/{foo_id}", HTTPMethods.GET, codec="cbor"))
+        self.assertEqual(response.headers["Content-Type"], "application/cbor")
+        self.assertIn("error making request", self.client._decode_response(response)["message"])
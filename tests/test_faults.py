@@ -0,0 +1,146 @@
+import random
+import time
+from unittest import TestCase
+
+import requests
+
+from httpbase.bench import StandInServer
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.faults import FaultTransport, Faults, exponential, fixed, lognormal, normal, uniform
+from httpbase.routes import Route
+from httpbase.transports import WSGITransport
+
+get_item = Route("/items/{item_id}", HTTPMethods.GET)
+create_item = Route("/items", HTTPMethods.POST)
+get_nested = Route("items/{item_id}/tags", HTTPMethods.GET)
+
+BODY = b"x" * 1000
+
+
+def wsgi_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [BODY]
+
+
+class ItemsClient(HTTPBaseClient):
+    def get_item(self, item_id: int=1, **kwargs):
+        return self._make_request(get_item, item_id=item_id, **kwargs)
+
+    def create_item(self, **kwargs):
+        return self._make_request(create_item, **kwargs)
+
+
+def client(transport: FaultTransport) -> ItemsClient:
+    transport.transport = WSGITransport(wsgi_app)
+    return ItemsClient(baseurl="http://testserver/api/", transport=transport)
+
+
+class TestDistributions(TestCase):
+    def test_distributions(self):
+        rng = random.Random(1)
+        self.assertEqual(fixed(0.5)(rng), 0.5)
+        self.assertTrue(all(0.1 <= uniform(0.1, 0.2)(rng) <= 0.2 for _ in range(100)))
+        self.assertTrue(all(normal(0.01, 1)(rng) >= 0 for _ in range(100)))
+        samples = sorted(lognormal(0.05, 0.5)(rng) for _ in range(1001))
+        self.assertAlmostEqual(samples[500], 0.05, delta=0.005)
+        samples = [exponential(0.02)(rng) for _ in range(1000)]
+        self.assertAlmostEqual(sum(samples) / len(samples), 0.02, delta=0.003)
+
+
+class TestFaults(TestCase):
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            Faults(error_rate=1.5)
+        with self.assertRaises(ValueError):
+            Faults(partial_body_fraction=-0.1)
+
+
+class TestFaultTransport(TestCase):
+    def test_pass_through(self):
+        transport = FaultTransport()
+        response = client(transport).get_item()
+        self.assertEqual(response.content, BODY)
+        self.assertEqual(transport.counts, {})
+
+    def test_route_matching(self):
+        default, items, nested = Faults(), Faults(), Faults()
+        transport = FaultTransport(faults=default, routes={get_item: items, get_nested: nested})
+        self.assertIs(transport.faults_for("GET", "http://testserver/items/1"), items)
+        self.assertIs(transport.faults_for("get", "http://testserver/items/1?page=2"), items)
+        self.assertIs(transport.faults_for("GET", "http://testserver/api/items/1/tags"), nested)
+        self.assertIs(transport.faults_for("POST", "http://testserver/items/1"), default)
+        self.assertIs(transport.faults_for("GET", "http://testserver/items/1/other"), default)
+        self.assertIsNone(FaultTransport(routes={get_item: items}).faults_for("GET", "http://testserver/items"))
+
+    def test_errors(self):
+        transport = FaultTransport(routes={get_item: Faults(error_rate=1, error_statuses=[503])})
+        items = client(transport)
+        response = items.get_item()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"message": "injected fault"})
+        self.assertEqual(items.create_item().status_code, 200)
+        self.assertEqual(transport.counts, {"error": 1})
+
+    def test_reset(self):
+        transport = FaultTransport(faults=Faults(reset_rate=1))
+        with self.assertRaises(requests.ConnectionError):
+            client(transport).get_item()
+        self.assertEqual(transport.counts["reset"], 1)
+
+    def test_latency(self):
+        transport = FaultTransport(faults=Faults(latency=fixed(0.05)))
+        items = client(transport)
+        start = time.perf_counter()
+        items.get_item()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+        start = time.perf_counter()
+        with self.assertRaises(requests.ReadTimeout):
+            items.get_item(timeout=(1, 0.02))
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(transport.counts, {"latency": 1, "timeout": 1})
+
+    def test_partial_body(self):
+        transport = FaultTransport(faults=Faults(partial_body_rate=1, partial_body_fraction=0.25))
+        items = client(transport)
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            items.get_item()
+        response = items.get_item(stream=True)
+        received = []
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            for chunk in response.iter_content(100):
+                received.append(chunk)
+        self.assertEqual(b"".join(received), BODY[:250])
+
+    def test_slow_body(self):
+        transport = FaultTransport(faults=Faults(slow_body_rate=1, body_bytes_per_second=10000))
+        items = client(transport)
+        start = time.perf_counter()
+        self.assertEqual(items.get_item().content, BODY)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+
+    def test_seed_reproducible(self):
+        def outcomes(seed):
+            transport = FaultTransport(faults=Faults(error_rate=0.3, reset_rate=0.2), seed=seed)
+            items = client(transport)
+            results = []
+            for _ in range(50):
+                try:
+                    results.append(items.get_item().status_code)
+                except requests.ConnectionError:
+                    results.append("reset")
+            return results
+
+        first = outcomes(7)
+        self.assertEqual(first, outcomes(7))
+        self.assertNotEqual(first, outcomes(8))
+        self.assertIn("reset", first)
+        self.assertIn(200, first)
+
+    def test_with_stand_in_server(self):
+        transport = FaultTransport(routes={get_item: Faults(error_rate=0.5)}, seed=3)
+        with StandInServer() as server:
+            items = ItemsClient(baseurl=server.url, transport=transport)
+            statuses = {items.get_item().status_code for _ in range(20)}
+        self.assertEqual(statuses & {200}, {200})
+        self.assertTrue(statuses - {200})
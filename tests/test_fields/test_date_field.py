@@ -1,9 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime, timezone
 from unittest import TestCase
 
-from httpbase.constants import DEFAULT_DATE_FORMAT
+from httpbase.constants import DEFAULT_DATE_FORMAT, ISO_DATE_FORMAT
 from httpbase.fields import DateField
-from httpbase.exceptions import SerializationError, NonNullableField
+from httpbase.exceptions import DeserializationError, SerializationError, NonNullableField
 from httpbase.resources import Resource
 
 
@@ -95,3 +95,52 @@ class TestDateField(TestCase):
         resource = Foo(foo=value)
         self.assertEqual(resource.foo.value, value)
         self.assertEqual(resource.dict(), {"foo": DATE.strftime("%D")})
+
+    def test_iso_format(self):
+        class Foo(Resource):
+            foo = DateField(label="foo", format=ISO_DATE_FORMAT)
+
+        resource = Foo(foo=DATE)
+        self.assertEqual(resource.dict(), {"foo": DATE.isoformat()})
+        self.assertEqual(Foo.from_dict(resource.dict()).foo.value, DATE)
+
+    def test_iso_equivalent_formats_match_strftime(self):
+        values = [DATE, datetime(2018, 4, 20, 16, 20, 5, 123), datetime(999, 1, 1), date(2018, 4, 20), date(999, 1, 1),
+                  datetime(2018, 4, 20, tzinfo=timezone.utc)]
+        for format in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d"):
+            field = DateField(format=format)
+            for value in values:
+                if isinstance(value, datetime) or format == "%Y-%m-%d":
+                    self.assertEqual(field.serialize(value), value.strftime(format))
+            self.assertEqual(field.serialize_many(values[:2]), [value.strftime(format) for value in values[:2]])
+
+    def test_parse(self):
+        class Foo(Resource):
+            foo = DateField(label="foo", format="%d/%m/%Y %H:%M")
+
+        resource = Foo.from_dict({"foo": "20/04/2018 16:20"})
+        self.assertEqual(resource.foo.value, DATE)
+        self.assertEqual(Foo.from_dict({"foo": "yesterday"}).foo.value, "yesterday")
+        with self.assertRaises(DeserializationError):
+            Foo.from_dict({"foo": "yesterday"}, strict=True)
+        with self.assertRaises(DeserializationError):
+            Foo.from_dict({"foo": 12}, strict=True)
+
+    def test_unparseable_format(self):
+        # strptime doesn't support %s so values in the default format are left as strings
+        class Foo(Resource):
+            foo = DateField(label="foo")
+
+        self.assertEqual(Foo.from_dict({"foo": FORMATTED_DATE}, strict=True).foo.value, FORMATTED_DATE)
+
+    def test_many(self):
+        field = DateField(format="%Y-%m-%dT%H:%M:%S")
+        values = [DATE, CUTOFF_DATE]
+        serialized = field.serialize_many(values)
+        self.assertEqual(serialized, [value.strftime("%Y-%m-%dT%H:%M:%S") for value in values])
+        self.assertEqual(field.deserialize_many(serialized), values)
+        self.assertEqual(field.deserialize_many(serialized + ["bad"]), values + ["bad"])
+        with self.assertRaises(DeserializationError):
+            field.deserialize_many(serialized + ["bad"], strict=True)
+        with self.assertRaises(TypeError):
+            field.serialize_many([DATE, "bad"])
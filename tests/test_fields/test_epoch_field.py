@@ -3,7 +3,7 @@ from unittest import TestCase
 
 from httpbase.constants import DEFAULT_DATE_FORMAT
 from httpbase.fields import EpochField
-from httpbase.exceptions import SerializationError, NonNullableField
+from httpbase.exceptions import DeserializationError, SerializationError, NonNullableField
 from httpbase.resources import Resource
 
 
@@ -102,3 +102,24 @@ class TestEpochField(TestCase):
         resource = Foo(foo=value)
         self.assertEqual(resource.foo.value, value)
         self.assertEqual(resource.dict(), {"foo": int(FORMATTED_DATE)})
+
+    def test_parse(self):
+        class Foo(Resource):
+            foo = EpochField(label="foo")
+
+        self.assertEqual(Foo.from_dict({"foo": FORMATTED_DATE}).foo.value, DATE)
+        self.assertEqual(Foo.from_dict({"foo": int(FORMATTED_DATE)}).foo.value, DATE)
+        self.assertEqual(Foo.from_dict({"foo": "soon"}).foo.value, "soon")
+        with self.assertRaises(DeserializationError):
+            Foo.from_dict({"foo": "soon"}, strict=True)
+
+    def test_many(self):
+        values = [DATE, CUTOFF_DATE]
+        self.assertEqual(EpochField().serialize_many(values), [value.timestamp() for value in values])
+        self.assertEqual(EpochField(total_seconds=False).serialize_many(values),
+                         [int(value.timestamp()) for value in values])
+        self.assertEqual(EpochField().deserialize_many([value.timestamp() for value in values]), values)
+        with self.assertRaises(TypeError):
+            EpochField().serialize_many([DATE, "bad"])
+        with self.assertRaises(DeserializationError):
+            EpochField().deserialize_many([DATE.timestamp(), "bad"], strict=True)
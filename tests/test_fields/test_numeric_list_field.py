@@ -0,0 +1,74 @@
+from array import array
+from unittest import TestCase, skipIf
+
+from httpbase import fields
+from httpbase.fields import NumericListField
+from httpbase.exceptions import DeserializationError, SerializationError, NonNullableField
+from httpbase.resources import Resource
+
+
+class TestNumericListField(TestCase):
+    def test_numeric_list_field(self):
+        class Foo(Resource):
+            foo = NumericListField(label="foo", typecode="d", use_numpy=False)
+            bar = NumericListField(label="bar", typecode="q", use_numpy=False)
+
+        resource = Foo(foo=[1, 2.5], bar=range(3))
+        self.assertEqual(resource.foo.value, array("d", [1.0, 2.5]))
+        self.assertEqual(resource.bar.value, array("q", [0, 1, 2]))
+        self.assertEqual(resource.dict(), {"foo": [1.0, 2.5], "bar": [0, 1, 2]})
+        self.assertFalse(resource.errors)
+
+    def test_invalid_elements(self):
+        class Foo(Resource):
+            foo = NumericListField(label="foo", typecode="q", use_numpy=False)
+
+        for value in (["a"], [1.5], [2 ** 70]):
+            resource = Foo(foo=value)
+            self.assertEqual(resource.foo.value, value)
+            with self.assertRaises(SerializationError):
+                resource.json()
+            self.assertIn("foo", resource.errors)
+
+    def test_nullable(self):
+        class Foo(Resource):
+            foo = NumericListField(label="foo", nullable=True, use_numpy=False)
+
+        self.assertEqual(Foo().dict(), {"foo": None})
+
+        class Foo(Resource):
+            foo = NumericListField(label="foo", use_numpy=False)
+
+        with self.assertRaises(NonNullableField):
+            Foo(foo=None)
+
+    def test_default(self):
+        class Foo(Resource):
+            foo = NumericListField(label="foo", default=[], use_numpy=False)
+
+        first, second = Foo(), Foo()
+        first.foo.value.append(1.0)
+        self.assertEqual(second.dict(), {"foo": []})
+
+    def test_from_dict(self):
+        class Foo(Resource):
+            foo = NumericListField(label="foo", use_numpy=False)
+
+        self.assertEqual(Foo.from_dict({"foo": [1, 2]}).foo.value, array("d", [1.0, 2.0]))
+        self.assertEqual(Foo.from_dict({"foo": ["a"]}).foo.value, ["a"])
+        with self.assertRaises(DeserializationError):
+            Foo.from_dict({"foo": ["a"]}, strict=True)
+
+    @skipIf(fields._numpy() is None, "numpy is not installed")
+    def test_numpy(self):
+        class Foo(Resource):
+            foo = NumericListField(label="foo", typecode="d")
+
+        resource = Foo(foo=[1, 2.5])
+        self.assertIsInstance(resource.foo.value, fields._numpy().ndarray)
+        self.assertEqual(resource.dict(), {"foo": [1.0, 2.5]})
+
+    @skipIf(fields._numpy() is not None, "numpy is installed")
+    def test_numpy_missing(self):
+        with self.assertRaises(ImportError):
+            NumericListField(use_numpy=True)
@@ -0,0 +1,144 @@
+import json
+import os
+import signal
+from unittest import TestCase, mock, skipUnless
+
+from httpbase import forks
+from httpbase.bench import StandInServer
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.routes import Route
+from httpbase.tenants import TenantScheduler
+from httpbase.transports import ASGITransport, SessionTransport
+
+
+class ItemsClient(HTTPBaseClient):
+    forked = 0
+
+    def get_item(self, item_id: int=1):
+        return self._make_request(Route("/items/{item_id}", HTTPMethods.GET), item_id=item_id)
+
+    def after_fork(self):
+        self.forked += 1
+
+
+async def asgi_app(scope, receive, send):
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+def in_child(func):
+    """Runs ``func`` in a forked child and returns what it returned, which has to be JSON serializable."""
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        # Anything that hangs in the child fails the test instead of hanging it
+        signal.alarm(5)
+        try:
+            os.write(write, json.dumps(func()).encode())
+        except BaseException as err:
+            os.write(write, json.dumps({"error": repr(err)}).encode())
+        finally:
+            os._exit(0)
+    os.close(write)
+    with os.fdopen(read, "rb") as pipe:
+        data = pipe.read()
+    os.waitpid(pid, 0)
+    return json.loads(data) if data else {"error": "the child exited without a result"}
+
+
+class TestSessionTransport(TestCase):
+    def test_reuses_session(self):
+        transport = SessionTransport()
+        with StandInServer() as server:
+            client = ItemsClient(baseurl=server.url, transport=transport)
+            self.assertEqual(client.get_item().status_code, 200)
+            session = transport.session
+            self.assertEqual(client.get_item().status_code, 200)
+            self.assertIs(transport.session, session)
+        transport.close()
+        self.assertIsNot(transport.session, session)
+
+    def test_pid_check(self):
+        transport = SessionTransport()
+        session = transport.session
+        transport._pid = -1
+        self.assertIsNot(transport.session, session)
+        self.assertEqual(transport._pid, os.getpid())
+
+
+class TestAfterForkInChild(TestCase):
+    def test_failures_dont_stop_later_resets(self):
+        calls = []
+
+        class Resettable(object):
+            def __init__(self, fail):
+                self.fail = fail
+
+            def _after_fork(self):
+                calls.append("reset")
+                if self.fail:
+                    raise RuntimeError("reset failed")
+
+        def failing_callback():
+            raise ValueError("callback failed")
+
+        resettable = [Resettable(True), Resettable(False)]
+        callbacks = [failing_callback, lambda: calls.append("callback")]
+        with mock.patch.object(forks, "_resettable", resettable), mock.patch.object(forks, "_clients", []), \
+                mock.patch.object(forks, "_callbacks", callbacks):
+            with self.assertWarns(RuntimeWarning) as caught:
+                forks._after_fork_in_child()
+        self.assertEqual(calls, ["reset", "reset", "callback"])
+        self.assertIn("reset failed", str(caught.warnings[0].message))
+        self.assertIn("callback failed", str(caught.warnings[1].message))
+
+
+@skipUnless(hasattr(os, "fork"), "needs os.fork")
+class TestFork(TestCase):
+    def test_session_reset_in_child(self):
+        transport = SessionTransport()
+        with StandInServer() as server:
+            client = ItemsClient(baseurl=server.url, transport=transport)
+            client.get_item()
+            session = transport.session
+
+            def child():
+                reset = transport._session is None
+                return {"reset": reset, "status": client.get_item().status_code, "forked": client.forked}
+
+            self.assertEqual(in_child(child), {"reset": True, "status": 200, "forked": 1})
+            self.assertIs(transport.session, session)
+            self.assertEqual(client.get_item().status_code, 200)
+            self.assertEqual(client.forked, 0)
+
+    def test_asgi_loop_restarted_in_child(self):
+        transport = ASGITransport(asgi_app)
+        self.assertEqual(transport("GET", "http://testserver/").text, str(os.getpid()))
+        result = in_child(lambda: {"body": transport("GET", "http://testserver/").text, "pid": os.getpid()})
+        self.assertEqual(result["body"], str(result["pid"]))
+        transport.close()
+
+    def test_tenant_scheduler_reset_in_child(self):
+        scheduler = TenantScheduler(max_concurrency=1)
+        scheduler.acquire("acme")
+
+        def child():
+            scheduler.acquire("acme", timeout=1)
+            return {tenant: stats.in_flight for tenant, stats in scheduler.metrics().items()}
+
+        try:
+            self.assertEqual(in_child(child), {"acme": 1})
+        finally:
+            scheduler.release("acme")
+
+    def test_after_fork_callback(self):
+        calls = []
+        callback = forks.after_fork(lambda: calls.append(os.getpid()))
+        try:
+            result = in_child(lambda: {"calls": calls, "pid": os.getpid()})
+            self.assertEqual(result["calls"], [result["pid"]])
+            self.assertEqual(calls, [])
+        finally:
+            forks._callbacks.remove(callback)
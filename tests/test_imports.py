@@ -0,0 +1,37 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+import httpbase
+
+
+class TestLazyImports(TestCase):
+    def test_resources_dont_import_requests(self):
+        script = (
+            "import sys, httpbase, httpbase.resources, httpbase.batches\n"
+            "httpbase.Resource, httpbase.IntField\n"
+            "assert 'requests' not in sys.modules\n"
+            "assert 'numpy' not in sys.modules\n"
+            "httpbase.HTTPBaseClient\n"
+            "assert 'requests' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+    def test_exports(self):
+        from httpbase.client import HTTPBaseClient
+        from httpbase.resources import Resource
+
+        import requests
+
+        self.assertIs(httpbase.HTTPBaseClient, HTTPBaseClient)
+        self.assertIs(httpbase.Resource, Resource)
+        self.assertIs(httpbase.Response, requests.Response)
+        for name in httpbase.__all__:
+            self.assertIn(name, dir(httpbase))
+            getattr(httpbase, name)
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            httpbase.NotAThing
+        with self.assertRaises(ImportError):
+            from httpbase import NotAThing  # noqa: F401
@@ -1,5 +1,8 @@
 from unittest import TestCase
 
+from httpbase.fields import ResourceField
+from httpbase.resources import Resource
+
 from ._test_classes import PostResource, AuthorResource, ProfileResource
 
 
@@ -67,3 +70,41 @@ class TestResourceAccessors(TestCase):
         target = list(self.post.labels("author.profile"))
         expected = ["email"]
         self.assertListEqual(target, expected)
+
+    def test_get_values(self):
+        paths = ["body", "author.name", "author.profile.email", "metadata"]
+        expected = {
+            "body": "This is my post",
+            "author.name": "author",
+            "author.profile.email": "foo@example.com",
+            "metadata": {"subscribed": True, "popular": False},
+        }
+        self.assertEqual(self.post.get_values(paths), expected)
+
+    def test_update_many(self):
+        new_profile = ProfileResource(email="new@example.com")
+        self.post.update_many({
+            "author.name": "new name",
+            "author.profile": new_profile,
+            "author.profile.email": "newer@example.com",
+        })
+        self.assertEqual(self.author.name.value, "new name")
+        self.assertIs(self.author.profile.value, new_profile)
+        self.assertEqual(new_profile.email.value, "newer@example.com")
+        self.assertEqual(self.profile.email.value, "foo@example.com")
+
+    def test_typed_paths(self):
+        class TypedAuthor(Resource):
+            profile = ResourceField(resource_class=ProfileResource)
+
+        class TypedPost(Resource):
+            author = ResourceField(resource_class=TypedAuthor)
+
+        post = TypedPost(author=TypedAuthor(profile=self.profile))
+        self.assertEqual(post.get_value("author.profile.email"), "foo@example.com")
+        # A nested resource of another class than the declared one is still found
+        post.update("author", self.author)
+        self.assertEqual(post.get_value("author.profile.email"), "foo@example.com")
+        self.assertEqual(post.get_value("author.name"), "author")
+        post.update("author.name", "new name")
+        self.assertEqual(self.author.name.value, "new name")
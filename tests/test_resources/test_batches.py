@@ -0,0 +1,174 @@
+import copy
+import json
+import pickle
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from httpbase.batches import ResourceBatch, serialize_parallel
+from httpbase.exceptions import SerializationError
+from httpbase.fields import BoolField, IntField, ListField, ResourceField, StrField
+from httpbase.resources import Resource
+
+
+class AuthorResource(Resource):
+    name = StrField()
+    email = StrField(nullable=True)
+
+
+class PostResource(Resource):
+    author = ResourceField(resource_class=AuthorResource)
+    body = StrField()
+
+
+class RowResource(Resource):
+    row_id = IntField(label="id")
+    name = StrField()
+    score = IntField(nullable=True)
+    note = StrField(nullable=True, omit_null=True)
+    active = BoolField(default=True)
+    tags = ListField(default=[])
+
+
+class TestResourceBatch(TestCase):
+    def setUp(self):
+        self.resources = [
+            RowResource(row_id=index, name=f"row {index}", score=index * 2 if index % 2 else None, tags=[index])
+            for index in range(10)
+        ]
+        self.batch = ResourceBatch[RowResource](resources=self.resources)
+
+    def test_class_getitem(self):
+        self.assertIs(ResourceBatch[RowResource], ResourceBatch[RowResource])
+        self.assertIs(ResourceBatch[RowResource].resource_class, RowResource)
+        self.assertIs(ResourceBatch(RowResource).resource_class, RowResource)
+        with self.assertRaises(TypeError):
+            ResourceBatch()
+
+    def test_columns(self):
+        self.assertEqual(len(self.batch), 10)
+        self.assertIsInstance(self.batch.column("row_id"), array)
+        self.assertEqual(list(self.batch.column("row_id")), list(range(10)))
+        self.assertIsInstance(self.batch.column("score"), list)
+
+    def test_dicts_match_resources(self):
+        self.assertEqual(self.batch.dicts(), [resource.dict() for resource in self.resources])
+        self.assertEqual(
+            self.batch.dicts(use_labels=False), [resource.dict(use_labels=False) for resource in self.resources]
+        )
+        self.assertEqual(json.loads(self.batch.json()), self.batch.dicts())
+        self.assertEqual([json.loads(line) for line in self.batch.ndjson().splitlines()], self.batch.dicts())
+
+    def test_rows(self):
+        row = self.batch[3]
+        self.assertIsInstance(row, RowResource)
+        self.assertEqual(row.dict(), self.resources[3].dict())
+        self.assertEqual(self.batch[-1].row_id.value, 9)
+        self.assertEqual([row.name.value for row in self.batch], [resource.name.value for resource in self.resources])
+        with self.assertRaises(IndexError):
+            self.batch[10]
+
+    def test_rows_write_through(self):
+        self.batch[2].update("name", "renamed")
+        self.batch[2].row_id = 200
+        self.assertEqual(self.batch.column("name")[2], "renamed")
+        self.assertEqual(self.batch.dicts()[2]["id"], 200)
+
+    def test_copied_rows_are_detached(self):
+        for row in (copy.deepcopy(self.batch[4]), pickle.loads(pickle.dumps(self.batch[4]))):
+            row.name = "detached"
+            self.assertEqual(row.dict()["id"], 4)
+            self.assertEqual(self.batch.column("name")[4], "row 4")
+
+    def test_array_column_falls_back_to_list(self):
+        self.batch[1].row_id = 2 ** 70
+        self.assertIsInstance(self.batch.column("row_id"), list)
+        self.assertEqual(self.batch.dicts()[1]["id"], 2 ** 70)
+        self.batch.add(row_id="7", name="from a string")
+        self.assertEqual(self.batch.dicts()[-1]["id"], 7)
+
+    def test_add(self):
+        batch = ResourceBatch(RowResource)
+        batch.add(row_id=1, name="foo")
+        self.assertEqual(batch.dicts(), [RowResource(row_id=1, name="foo").dict()])
+
+    def test_validation_errors(self):
+        self.batch.add(row_id="not a number", name="bad")
+        self.batch[0].tags = [object()]
+        self.assertEqual(set(self.batch.validate()), {0, 10})
+        self.assertIn("row_id", self.batch.validate()[10])
+        self.assertIn("tags", self.batch.validate()[0])
+        self.assertNotIn("id", self.batch.dicts()[10])
+        with self.assertRaises(SerializationError):
+            self.batch.json()
+
+    def test_append_type_check(self):
+        with self.assertRaises(TypeError):
+            self.batch.append(AuthorResource(name="author"))
+
+    def test_append_subclass_rejected(self):
+        class ExtendedRowResource(RowResource):
+            extra = StrField()
+
+        dicts = self.batch.dicts()
+        with self.assertRaises(TypeError):
+            self.batch.append(ExtendedRowResource(row_id=10, name="row 10", extra="extra"))
+        self.assertEqual(len(self.batch), 10)
+        self.assertEqual(self.batch.dicts(), dicts)
+        self.assertEqual(len(json.loads(self.batch.json())), 10)
+
+    def test_nested_resources(self):
+        posts = [
+            PostResource(author=AuthorResource(name="author", email="foo@example.com"), body=f"post {index}")
+            for index in range(3)
+        ]
+        batch = ResourceBatch[PostResource].from_dicts([post.dict() for post in posts])
+        self.assertEqual(batch.dicts(), [post.dict() for post in posts])
+        self.assertEqual(batch[1].get_value("author.email"), "foo@example.com")
+
+    def test_pickle(self):
+        batch = pickle.loads(pickle.dumps(self.batch))
+        self.assertIs(type(batch), ResourceBatch)
+        self.assertIs(batch.resource_class, RowResource)
+        self.assertIsInstance(batch.column("row_id"), array)
+        self.assertEqual(batch.json(), self.batch.json())
+
+    def test_chunks(self):
+        chunks = list(self.batch.chunks(4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        self.assertEqual(sum((chunk.dicts() for chunk in chunks), []), self.batch.dicts())
+        with self.assertRaises(ValueError):
+            next(self.batch.chunks(0))
+
+
+class TestSerializeParallel(TestCase):
+    def setUp(self):
+        self.resources = [RowResource(row_id=index, name=f"row {index}", tags=[index]) for index in range(10)]
+        self.batch = ResourceBatch(RowResource, self.resources)
+
+    def test_in_process(self):
+        self.assertEqual(serialize_parallel(self.resources), self.batch.json())
+        self.assertEqual(serialize_parallel(self.batch, ndjson=True), self.batch.ndjson())
+        self.assertEqual(serialize_parallel([]), "[]")
+        self.assertEqual(serialize_parallel([], ndjson=True), "")
+
+    def test_process_pool(self):
+        for resources in (self.resources, self.batch):
+            self.assertEqual(serialize_parallel(resources, workers=2, chunk_size=3, min_rows=0), self.batch.json())
+            self.assertEqual(serialize_parallel(resources, ndjson=True, use_labels=False, workers=2, chunk_size=3,
+                                                min_rows=0),
+                             self.batch.ndjson(use_labels=False))
+        self.assertEqual(json.loads(serialize_parallel(self.batch, workers=2, chunk_size=3, min_rows=0)),
+                         [resource.dict() for resource in self.resources])
+
+    def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(serialize_parallel(self.resources, chunk_size=4, min_rows=0, executor=executor),
+                             self.batch.json())
+            self.resources[7].score = "not a number"
+            with self.assertRaises(SerializationError):
+                serialize_parallel(self.resources, chunk_size=4, min_rows=0, executor=executor)
+
+    def test_mixed_classes(self):
+        with self.assertRaises(TypeError):
+            serialize_parallel(self.resources + [AuthorResource(name="name")], workers=2, min_rows=0)
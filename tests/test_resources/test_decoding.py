@@ -0,0 +1,117 @@
+import json
+from unittest import TestCase, mock
+
+from httpbase.constants import null
+from httpbase.exceptions import DeserializationError, NonNullableField
+from httpbase.fields import _NOT_LOADED, IntField, ListField, MapField, ResourceField, StrField
+from httpbase.resources import Resource
+
+
+class ProfileResource(Resource):
+    email = StrField(label="emailAddress")
+
+
+class AuthorResource(Resource):
+    name = StrField(label="authorName")
+    profile = ResourceField(resource_class=ProfileResource, nullable=True)
+
+
+class PostResource(Resource):
+    post_id = IntField(label="postId")
+    author = ResourceField(resource_class=AuthorResource)
+    contributors = ListField(resource_class=AuthorResource, nullable=True, default=[])
+    related = MapField(resource_class=ProfileResource, nullable=True)
+    tags = ListField(nullable=True)
+
+
+POST = {
+    "postId": 1,
+    "author": {"authorName": "author", "profile": {"emailAddress": "foo@example.com"}},
+    "contributors": [{"authorName": "contributor", "profile": {"emailAddress": "bar@example.com"}}],
+    "related": {"editor": {"emailAddress": "editor@example.com"}},
+    "tags": ["a", "b"],
+}
+
+
+class TestResourceDecoding(TestCase):
+    def test_from_dict(self):
+        post = PostResource.from_dict(POST)
+        self.assertEqual(post.post_id.value, 1)
+        self.assertIsInstance(post.author.value, AuthorResource)
+        self.assertEqual(post.get_value("author.profile.email"), "foo@example.com")
+        self.assertEqual(post.contributors.value[0].name.value, "contributor")
+        self.assertEqual(post.related.value["editor"].email.value, "editor@example.com")
+        self.assertEqual(post.tags.value, ["a", "b"])
+
+    def test_round_trip(self):
+        post = PostResource.from_dict(POST)
+        self.assertEqual(PostResource.from_dict(post.dict()).dict(), post.dict())
+        self.assertEqual(PostResource.from_dict(post.dict(use_labels=False)).dict(), post.dict())
+
+    def test_defaults_and_nulls(self):
+        post = PostResource.from_dict({"postId": 1, "author": {"authorName": "author", "profile": None}})
+        self.assertEqual(post.contributors.value, [])
+        self.assertIs(post.get_value("author.profile"), null)
+        with self.assertRaises(NonNullableField):
+            PostResource.from_dict({"postId": 1})
+
+    def test_strict(self):
+        data = dict(POST, unknown=True)
+        self.assertEqual(PostResource.from_dict(data).post_id.value, 1)
+        with self.assertRaises(DeserializationError):
+            PostResource.from_dict(data, strict=True)
+
+        data = dict(POST, author="author")
+        self.assertEqual(PostResource.from_dict(data).author.value, "author")
+        with self.assertRaises(DeserializationError):
+            PostResource.from_dict(data, strict=True)
+
+        data = dict(POST, contributors=[{"authorName": "contributor", "unknown": True}])
+        self.assertEqual(PostResource.from_dict(data).contributors.value[0].name.value, "contributor")
+        with self.assertRaises(DeserializationError):
+            PostResource.from_dict(data, strict=True)
+
+        with self.assertRaises(DeserializationError):
+            PostResource.from_dict(["not", "an", "object"])
+
+    def test_from_json(self):
+        post = PostResource.from_json(json.dumps(POST))
+        self.assertEqual(post.post_id.value, 1)
+
+        posts = PostResource.from_json(json.dumps([POST, POST]).encode())
+        self.assertEqual(len(posts), 2)
+        self.assertTrue(all(isinstance(post, PostResource) for post in posts))
+
+    def test_from_response(self):
+        response = mock.Mock(content=json.dumps([POST]).encode())
+        posts = PostResource.from_response(response)
+        self.assertEqual(posts[0].get_value("author.name"), "author")
+
+
+class TestLazyDecoding(TestCase):
+    def test_fields_load_on_access(self):
+        post = PostResource.from_dict(POST, lazy=True)
+        self.assertEqual(post._values.count(_NOT_LOADED), len(PostResource._declared_fields))
+
+        self.assertEqual(post.post_id.value, 1)
+        self.assertEqual(post._values.count(_NOT_LOADED), len(PostResource._declared_fields) - 1)
+
+        author = post.get_value("author")
+        self.assertIsInstance(author, AuthorResource)
+        self.assertIs(author._values[0], _NOT_LOADED)
+        self.assertEqual(post.get_field("author.name").value, "author")
+        # Loaded values are kept
+        self.assertIs(post.get_value("author"), author)
+
+    def test_serialization_loads_everything(self):
+        eager = PostResource.from_dict(POST)
+        lazy = PostResource.from_json(json.dumps([POST]), lazy=True)[0]
+        self.assertEqual(lazy.dict(), eager.dict())
+        self.assertIsNone(lazy._raw)
+        self.assertNotIn(_NOT_LOADED, lazy._values)
+
+    def test_errors_raised_on_access(self):
+        post = PostResource.from_dict({"postId": 1}, lazy=True)
+        self.assertEqual(post.post_id.value, 1)
+        with self.assertRaises(NonNullableField):
+            post.author.value
@@ -0,0 +1,83 @@
+import copy
+import pickle
+from unittest import TestCase
+
+from httpbase.exceptions import ImmutableFieldError, SerializationError
+from httpbase.fields import IntField, ListField, ResourceField, StrField
+from httpbase.resources import FrozenResource, Resource
+
+
+class PointResource(FrozenResource):
+    x = IntField()
+    y = IntField(label="yValue")
+
+
+class ShapeResource(FrozenResource):
+    name = StrField()
+    origin = ResourceField(resource_class=PointResource)
+    tags = ListField(default=[])
+
+
+class OtherPointResource(FrozenResource):
+    x = IntField()
+    y = IntField(label="yValue")
+
+
+class TestFrozenResource(TestCase):
+    def setUp(self):
+        self.point = PointResource(x=1, y=2)
+        self.shape = ShapeResource(name="square", origin=self.point, tags=["a"])
+
+    def test_fields_cant_be_set(self):
+        with self.assertRaises(ImmutableFieldError):
+            self.point.x = 3
+        with self.assertRaises(ImmutableFieldError):
+            self.point.x.value = 3
+        with self.assertRaises(ImmutableFieldError):
+            self.point.x.set_value(3)
+        with self.assertRaises(ImmutableFieldError):
+            self.shape.update("origin.x", 3)
+        with self.assertRaises(ImmutableFieldError):
+            self.shape.update_many({"name": "circle"})
+        self.assertEqual(self.point.get_value("x"), 1)
+        self.assertFalse(self.shape.is_dirty)
+
+    def test_equality_and_hashing(self):
+        same = PointResource(x=1, y=2)
+        self.assertEqual(self.point, same)
+        self.assertEqual(hash(self.point), hash(same))
+        self.assertNotEqual(self.point, PointResource(x=2, y=1))
+        self.assertNotEqual(self.point, OtherPointResource(x=1, y=2))
+        self.assertEqual(len({self.point, same, PointResource(x=2, y=1)}), 2)
+        self.assertEqual(self.shape, ShapeResource.from_dict(self.shape.dict()))
+        self.assertEqual({self.shape: "cached"}[ShapeResource(name="square", origin=same, tags=["a"])], "cached")
+
+    def test_output_is_cached(self):
+        self.assertIs(self.point.dict(), self.point.dict())
+        self.assertIs(self.point.json(), self.point.json())
+        self.assertEqual(self.point.dict(), {"x": 1, "yValue": 2})
+        self.assertEqual(self.point.dict(use_labels=False), {"x": 1, "y": 2})
+        self.assertEqual(self.shape.json(), '{"name": "square", "origin": {"x": 1, "yValue": 2}, "tags": ["a"]}')
+
+    def test_errors(self):
+        point = PointResource(x="one", y=2)
+        for _ in range(2):
+            with self.assertRaises(SerializationError):
+                point.json()
+        self.assertIn("x", point.errors)
+
+    def test_copy_and_pickle(self):
+        for point in (copy.copy(self.point), copy.deepcopy(self.point), pickle.loads(pickle.dumps(self.point))):
+            self.assertEqual(point, self.point)
+            self.assertEqual(point.json(), self.point.json())
+
+    def test_lazy(self):
+        point = PointResource.from_dict({"x": 1, "yValue": 2}, lazy=True)
+        self.assertEqual(point, self.point)
+        self.assertEqual(point.x.value, 1)
+
+    def test_mutable_resources_compare_by_identity(self):
+        class MutableResource(Resource):
+            x = IntField()
+
+        self.assertNotEqual(MutableResource(x=1), MutableResource(x=1))
@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from httpbase.fields import IntField, StrField
+from httpbase.resources import Resource
+
+from ._test_classes import PostResource, AuthorResource, ProfileResource
+
+
+class CountResource(Resource):
+    count = IntField(label="itemCount")
+    note = StrField(nullable=True)
+
+
+class TestMergePatch(TestCase):
+    def setUp(self):
+        self.profile = ProfileResource(email="foo@example.com")
+        self.author = AuthorResource(profile=self.profile, name="author")
+        self.post = PostResource(author=self.author, body="This is my post", metadata={"subscribed": True})
+
+    def test_new_resources_are_clean(self):
+        self.assertFalse(self.post.is_dirty)
+        self.assertEqual(self.post.merge_patch(), {})
+
+    def test_changed_fields(self):
+        self.post.update("body", "new body")
+        self.post.metadata = {"subscribed": False}
+        self.assertTrue(self.post.is_dirty)
+        self.assertEqual(self.post.merge_patch(), {"body": "new body", "metaData": {"subscribed": False}})
+        self.assertEqual(self.post.merge_patch(use_labels=False), {"body": "new body", "metadata": {"subscribed": False}})
+
+    def test_nested_changes(self):
+        self.post.update("author.profile.email", "bar@example.com")
+        self.assertTrue(self.post.is_dirty)
+        self.assertEqual(self.post.merge_patch(), {"author": {"profile": {"email": "bar@example.com"}}})
+
+    def test_replaced_resource(self):
+        self.post.update("author", AuthorResource(profile=ProfileResource(email="new@example.com"), name="new"))
+        self.assertEqual(
+            self.post.merge_patch(),
+            {"author": {"name": "new", "profile": {"email": "new@example.com"}}},
+        )
+
+    def test_nulls(self):
+        resource = CountResource(count=1, note="note")
+        resource.note.set_value(None)
+        resource.count.value = 2
+        self.assertEqual(resource.merge_patch(), {"itemCount": 2, "note": None})
+
+    def test_mark_clean(self):
+        self.post.update("body", "new body")
+        self.post.update("author.name", "new name")
+        self.post.mark_clean()
+        self.assertFalse(self.post.is_dirty)
+        self.assertFalse(self.author.is_dirty)
+        self.assertEqual(self.post.merge_patch(), {})
+
+    def test_serialization_error(self):
+        resource = CountResource(count=1)
+        resource.count = "abc"
+        with self.assertRaises(resource.SerializationError):
+            resource.merge_patch()
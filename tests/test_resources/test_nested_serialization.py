@@ -0,0 +1,135 @@
+import json
+import sys
+from unittest import TestCase
+
+from httpbase import codecs
+from httpbase.exceptions import SerializationError
+from httpbase.fields import IntField, ListField, MapField, ResourceField, StrField
+from httpbase.resources import Resource
+
+
+class ProfileResource(Resource):
+    email = StrField(label="emailAddress")
+    nickname = StrField(nullable=True, omit_null=True)
+    website = StrField(nullable=True)
+    age = IntField(nullable=True, omit_null=True)
+
+
+class AuthorResource(Resource):
+    name = StrField(label="authorName")
+    profile = ResourceField(resource_class=ProfileResource, nullable=True)
+    age = IntField(nullable=True, omit_null=True)
+
+
+class PostResource(Resource):
+    title = StrField(label="postTitle")
+    author = ResourceField(resource_class=AuthorResource)
+    contributors = ListField(resource_class=AuthorResource, default=[])
+    reviewers = MapField(resource_class=AuthorResource, default={})
+
+
+class NodeResource(Resource):
+    depth = IntField()
+    child = ResourceField(nullable=True, omit_null=True)
+
+
+class TestNestedSerialization(TestCase):
+    def setUp(self):
+        self.profile = ProfileResource(email="foo@example.com")
+        self.post = PostResource(
+            title="Post Title",
+            author=AuthorResource(name="author", profile=self.profile),
+            contributors=[AuthorResource(name="first"), AuthorResource(name="second", profile=self.profile)],
+            reviewers={"lead": AuthorResource(name="lead")},
+        )
+
+    def test_labels(self):
+        self.assertEqual(self.post.dict(), {
+            "postTitle": "Post Title",
+            "author": {"authorName": "author", "profile": {"emailAddress": "foo@example.com", "website": None}},
+            "contributors": [
+                {"authorName": "first", "profile": None},
+                {"authorName": "second", "profile": {"emailAddress": "foo@example.com", "website": None}},
+            ],
+            "reviewers": {"lead": {"authorName": "lead", "profile": None}},
+        })
+        self.assertFalse(self.post.errors)
+
+    def test_attribute_names(self):
+        self.assertEqual(self.post.dict(use_labels=False), {
+            "title": "Post Title",
+            "author": {"name": "author", "profile": {"email": "foo@example.com", "website": None}},
+            "contributors": [
+                {"name": "first", "profile": None},
+                {"name": "second", "profile": {"email": "foo@example.com", "website": None}},
+            ],
+            "reviewers": {"lead": {"name": "lead", "profile": None}},
+        })
+
+    def test_field_serialize_uses_labels(self):
+        field = PostResource._declared_fields["contributors"]
+        self.assertEqual(
+            field.serialize([AuthorResource(name="first")], use_labels=False), [{"name": "first", "profile": None}]
+        )
+
+    def test_errors_are_recorded_by_path(self):
+        self.post.update("author.profile.age", "unknown")
+        self.post.contributors.value[1] = "not a resource"
+        self.post.reviewers.value["lead"].update("age", "unknown")
+        result = self.post.dict()
+        self.assertEqual(
+            set(self.post.errors), {"author.profile.age", "contributors.1", "reviewers.lead.age"}
+        )
+        self.assertEqual(result["author"]["profile"], {"emailAddress": "foo@example.com", "website": None})
+        self.assertEqual(len(result["contributors"]), 1)
+        self.assertEqual(result["reviewers"], {"lead": {"authorName": "lead", "profile": None}})
+        with self.assertRaises(Resource.SerializationError):
+            self.post.json()
+
+    def test_compiled_matches_generic(self):
+        self.post.update("author.profile.age", "unknown")
+        compiled = self.post.dict()
+        compiled_errors = self.post.errors
+        self.post._errors = None
+        self.assertEqual(self.post._dict_generic(), compiled)
+        self.assertEqual(self.post.errors, compiled_errors)
+
+    def test_direct_field_serialize_raises_with_path(self):
+        field = PostResource._declared_fields["author"]
+        author = AuthorResource(name="author", profile=self.profile, age="unknown")
+        with self.assertRaisesRegex(ValueError, "^age: "):
+            field.serialize(author)
+
+    def test_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 3
+        root = node = NodeResource(depth=0)
+        for index in range(1, depth):
+            node.child = NodeResource(depth=index)
+            node = node.child.value
+        result = root.dict()
+        self.assertFalse(root.errors)
+        for index in range(depth - 1):
+            self.assertEqual(result["depth"], index)
+            result = result["child"]
+        self.assertEqual(result, {"depth": depth - 1})
+        node.depth = "deepest"
+        root.dict()
+        self.assertEqual(list(root.errors), [".".join(["child"] * (depth - 1) + ["depth"])])
+
+    def test_deep_nesting_encodes(self):
+        depth = sys.getrecursionlimit() * 3
+        root = node = NodeResource(depth=0)
+        for index in range(1, depth):
+            node.child = NodeResource(depth=index)
+            node = node.child.value
+        text = root.json()
+        self.assertTrue(text.startswith('{"depth": 0, "child": {"depth": 1, '))
+        self.assertTrue(text.endswith('{"depth": %d}' % (depth - 1) + "}" * (depth - 1)))
+        self.assertEqual(root.json_bytes(), text.encode())
+        if codecs.orjson is not None:
+            self.assertEqual(root.to_bytes("orjson"), text.replace(", ", ",").replace(": ", ":").encode())
+        with self.assertRaises(SerializationError):
+            root.to_bytes("msgpack")
+
+    def test_json_round_trip(self):
+        self.assertEqual(PostResource.from_json(self.post.json()).dict(), json.loads(self.post.json()))
@@ -1,9 +1,27 @@
+import copy
 from datetime import datetime
 import json
+import pickle
 from unittest import TestCase
 
+from httpbase.batches import ResourceBatch
 from httpbase.resources import Resource
-from httpbase.fields import IntField, ResourceField, ListField
+from httpbase.fields import BoolField, IntField, ResourceField, ListField, MapField, StrField
+
+
+class UpperField(StrField):
+    def to_value(self, **kwargs):
+        return super().to_value(**kwargs).upper()
+
+
+class StrippedField(StrField):
+    def set_value(self, value):
+        super().set_value(value.strip() if isinstance(value, str) else value)
+
+
+class CustomResource(Resource):
+    name = UpperField()
+    code = StrippedField(label="codeName", default="")
 
 
 class FlatResource(Resource):
@@ -22,6 +40,17 @@ class ComplexResource(Resource):
         qux = ResourceField(label="qux", nullable=True, default=NestedResource(bar_id=456, bar=FlatResource(foo_id=456)))
 
 
+class AnnotatedResource(FlatResource):
+    def __init__(self, note: str="", **kwargs):
+        super().__init__(**kwargs)
+        self.note = note
+
+
+class SlottedResource(Resource):
+    __slots__ = ()
+    foo_id = IntField()
+
+
 class TestResource(TestCase):
     def setUp(self):
         self.pk = 123
@@ -100,3 +129,109 @@ class TestResource(TestCase):
         resource = Parent(child=Child(user_id=123))
         self.assertIn("userId", resource.dict()["child"])
         self.assertIn("user_id", resource.dict(use_labels=False)["child"])
+
+    def test_compiled_serializer_matches_generic(self):
+        class Child(Resource):
+            user_id = IntField(label="userId")
+
+        class Everything(Resource):
+            flat = IntField(label="flatId")
+            nullable = IntField(nullable=True)
+            omitted = IntField(nullable=True, omit_null=True)
+            items = ListField(label="itemList", nullable=True)
+            mapping = MapField(label="map")
+            flag = BoolField()
+            child = ResourceField(label="kid")
+
+        resources = [
+            Everything(flat=1, items=[1, 2], mapping={"a": 1}, flag=True, child=Child(user_id=1)),
+            Everything(flat="abc", mapping=datetime.utcnow(), flag=False, child=datetime.utcnow()),
+            Everything(flat=1, mapping={"a": datetime.utcnow()}, flag=True, child=Child(user_id="abc")),
+        ]
+        for resource in resources:
+            for use_labels in (True, False):
+                compiled = resource.dict(use_labels=use_labels)
+                compiled_errors = resource.errors
+                resource._errors = {}
+                self.assertEqual(compiled, resource._dict_generic(use_labels=use_labels))
+                self.assertEqual(compiled_errors, resource.errors)
+
+    def test_fields_are_shared(self):
+        first, second = FlatResource(foo_id=1), FlatResource(foo_id=2)
+        self.assertIs(first.foo_id.field, second.foo_id.field)
+        self.assertIs(first.foo_id.field, FlatResource.foo_id)
+        self.assertEqual((first.foo_id.value, second.foo_id.value), (1, 2))
+
+    def test_extra_attributes(self):
+        resource = AnnotatedResource(note="first", foo_id=1)
+        self.assertEqual(resource.note, "first")
+        for clone in (copy.deepcopy(resource), pickle.loads(pickle.dumps(resource))):
+            self.assertEqual((clone.note, clone.foo_id.value), ("first", 1))
+        self.assertFalse(hasattr(SlottedResource(foo_id=1), "__dict__"))
+        with self.assertRaises(AttributeError):
+            SlottedResource(foo_id=1).note = "second"
+
+    def test_mutable_defaults_are_copied(self):
+        first, second = ComplexResource(), ComplexResource()
+        first.foo.value.append("ghi")
+        first.update("qux.bar.foo_id", 789)
+        self.assertEqual(second.foo.value, ["abc", "123", "def"])
+        self.assertEqual(second.get_value("qux.bar.foo_id"), 456)
+
+    def test_assignment_sets_value(self):
+        resource = FlatResource(foo_id=1)
+        field = resource.foo_id
+        resource.foo_id = 2
+        self.assertIs(resource.foo_id, field)
+        self.assertEqual(resource.foo_id.value, 2)
+        resource.foo_id = None
+        self.assertEqual(resource.foo_id.value, 123)
+
+    def test_reused_field(self):
+        shared = IntField()
+
+        class First(Resource):
+            first_id = shared
+
+        class Second(Resource):
+            second_id = shared
+
+        self.assertEqual(First(first_id=1).dict(), {"first_id": 1})
+        self.assertEqual(Second(second_id=2).dict(), {"second_id": 2})
+
+    def test_custom_to_value(self):
+        resource = CustomResource(name="abc")
+        self.assertEqual(resource.dict(), {"name": "ABC", "codeName": ""})
+        self.assertEqual(resource.dict(), resource._dict_generic())
+        self.assertEqual(resource.name.to_value(), "ABC")
+        self.assertEqual(json.loads(resource.json()), {"name": "ABC", "codeName": ""})
+        resource.mark_clean()
+        resource.name = "def"
+        self.assertEqual(resource.merge_patch(), {"name": "DEF"})
+
+        class Parent(Resource):
+            child = ResourceField()
+
+        self.assertEqual(Parent(child=resource).dict(), {"child": {"name": "DEF", "codeName": ""}})
+        self.assertEqual(ResourceBatch(CustomResource, [resource]).dicts(), [{"name": "DEF", "codeName": ""}])
+
+    def test_custom_set_value(self):
+        resource = CustomResource(name="abc", code="  x1 ")
+        self.assertEqual(resource.code.value, "x1")
+        resource.code = " y2 "
+        self.assertEqual(resource.code.value, "y2")
+        resource.code.set_value(" z3")
+        self.assertEqual(resource.code.value, "z3")
+        resource.update("code", "w4 ")
+        self.assertEqual(resource.code.value, "w4")
+        self.assertEqual(CustomResource.from_dict({"name": "abc", "codeName": " v5 "}).code.value, "v5")
+        self.assertEqual(
+            CustomResource.from_dict({"name": "abc", "codeName": " v5 "}, lazy=True).code.value, "v5"
+        )
+        self.assertEqual(CustomResource(name="abc").code.value, "")
+
+    def test_copy_and_pickle(self):
+        resource = NestedResource(bar_id=self.pk, bar=FlatResource())
+        for clone in (copy.deepcopy(resource), pickle.loads(pickle.dumps(resource))):
+            self.assertEqual(clone.dict(), resource.dict())
+            self.assertIsNot(clone.bar.value, resource.bar.value)
@@ -0,0 +1,161 @@
+import json
+from unittest import TestCase, mock
+
+import requests
+
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.fields import IntField, StrField
+from httpbase.resources import Resource
+from httpbase.routes import Route
+from httpbase.streaming import encode_json_array, encode_ndjson, iter_json_array, iter_ndjson
+
+
+ITEMS = [
+    {"id": 1, "name": "café ☃", "tags": ["a", "b"], "nested": {"deep": [1, 2.5, None, True, False]}},
+    12345,
+    -1.5e10,
+    "a string with ] and , and \" inside",
+    [],
+    {},
+    None,
+    True,
+]
+
+
+def chunked(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class ItemResource(Resource):
+    item_id = IntField(label="id")
+    name = StrField()
+
+
+class TestIterJsonArray(TestCase):
+    def test_chunk_sizes(self):
+        data = json.dumps(ITEMS, indent=2).encode()
+        for size in (1, 2, 3, 7, 64, len(data)):
+            self.assertEqual(list(iter_json_array(chunked(data, size))), ITEMS)
+
+    def test_empty(self):
+        self.assertEqual(list(iter_json_array([b" [ ", b" ] "])), [])
+
+    def test_items_are_yielded_incrementally(self):
+        def chunks():
+            yield b'[{"id": 1}, '
+            yield b'{"id": 2}'
+            raise AssertionError("read past the second item")
+
+        items = iter_json_array(chunks())
+        self.assertEqual(next(items), {"id": 1})
+
+    def test_invalid(self):
+        for data in (b'{"id": 1}', b"[1, 2", b"[1,]", b"[1 2]", b"[1] 2"):
+            with self.assertRaises(ValueError):
+                list(iter_json_array(chunked(data, 2)))
+
+    def test_max_item_size(self):
+        def chunks():
+            yield b'[{"id": 1}, {"name": "'
+            while True:
+                yield b"x" * 1000
+
+        with self.assertRaises(ValueError):
+            list(iter_json_array(chunks(), max_item_size=10000))
+
+    def test_items_spanning_chunks_are_parsed_once(self):
+        class CountingDecoder(json.JSONDecoder):
+            calls = 0
+
+            def raw_decode(self, s, idx=0):
+                CountingDecoder.calls += 1
+                return super().raw_decode(s, idx)
+
+        item = {"values": list(range(1000)), "text": "a \\ \" [ { string"}
+        data = json.dumps([item, 12345, "x"]).encode()
+        self.assertEqual(list(iter_json_array(chunked(data, 16), CountingDecoder())), [item, 12345, "x"])
+        self.assertLessEqual(CountingDecoder.calls, 6)
+
+
+class TestIterNdjson(TestCase):
+    def test_chunk_sizes(self):
+        data = "\n".join(json.dumps(item) for item in ITEMS).encode() + b"\n\n"
+        for size in (1, 5, len(data)):
+            self.assertEqual(list(iter_ndjson(chunked(data, size))), ITEMS)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(iter_ndjson([b'{"id": 1}\n{"id": \n']))
+
+
+class TestEncoding(TestCase):
+    def setUp(self):
+        self.resources = [ItemResource(item_id=index, name=f"item {index}") for index in range(100)]
+        self.expected = [resource.dict() for resource in self.resources]
+
+    def test_json_array(self):
+        self.assertEqual(json.loads(b"".join(encode_json_array(self.resources))), self.expected)
+        self.assertEqual(json.loads(b"".join(encode_json_array([]))), [])
+
+    def test_ndjson(self):
+        body = b"".join(encode_ndjson(self.resources))
+        self.assertEqual([json.loads(line) for line in body.splitlines()], self.expected)
+
+    def test_buffering(self):
+        pulled = []
+
+        def resources():
+            for resource in self.resources:
+                pulled.append(resource)
+                yield resource
+
+        chunks = encode_json_array(resources(), buffer_size=100)
+        first = next(chunks)
+        self.assertLess(len(first), 200)
+        self.assertLess(len(pulled), 10)
+        rest = list(chunks)
+        self.assertTrue(all(len(chunk) < 200 for chunk in rest))
+        self.assertEqual(json.loads(first + b"".join(rest)), self.expected)
+
+
+class TestStreamRequest(TestCase):
+    def setUp(self):
+        self.client = HTTPBaseClient(baseurl="http://example.com")
+        self.route = Route("/api/items", HTTPMethods.GET)
+
+    def make_response(self, body: bytes, content_type: str, status_code: int=200):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers["Content-Type"] = content_type
+        response.raw = mock.Mock()
+        response.iter_content = lambda chunk_size: chunked(body, 4)
+        return response
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_json_array(self, mock_requests):
+        body = json.dumps([{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}]).encode()
+        mock_requests.return_value = self.make_response(body, "application/json")
+        items = list(self.client._stream_request(self.route, resource_class=ItemResource))
+        self.assertEqual([item.item_id.value for item in items], [1, 2])
+        mock_requests.assert_called_with("get", "http://example.com/api/items", stream=True)
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_ndjson(self, mock_requests):
+        body = b'{"id": 1, "name": "foo"}\n{"id": 2, "name": "bar"}\n'
+        mock_requests.return_value = self.make_response(body, "application/x-ndjson; charset=utf-8")
+        self.assertEqual([item["id"] for item in self.client._stream_request(self.route)], [1, 2])
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_error_status(self, mock_requests):
+        mock_requests.return_value = self.make_response(b"[]", "application/json", status_code=500)
+        with self.assertRaises(requests.HTTPError):
+            list(self.client._stream_request(self.route))
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_stream_resources(self, mock_requests):
+        resources = [ItemResource(item_id=1, name="foo"), ItemResource(item_id=2, name="bar")]
+        self.client._make_request(self.route, stream_resources=iter(resources), ndjson=True)
+        args, kwargs = mock_requests.call_args
+        self.assertEqual(kwargs["headers"], {"Content-Type": "application/x-ndjson"})
+        self.assertEqual(b"".join(kwargs["data"]), b'{"id": 1, "name": "foo"}\n{"id": 2, "name": "bar"}\n')
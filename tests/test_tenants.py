@@ -0,0 +1,134 @@
+import io
+import threading
+import time
+from unittest import TestCase, mock
+
+import requests
+
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods, HTTPResponseCodes
+from httpbase.exceptions import TenantCapacityError
+from httpbase.routes import Route
+from httpbase.tenants import TenantScheduler
+
+
+def _wait_for_queued(scheduler, count):
+    deadline = time.monotonic() + 5
+    while sum(stats.queued for stats in scheduler.metrics().values()) < count:
+        if time.monotonic() > deadline:
+            raise AssertionError("requests never queued")
+        time.sleep(0.001)
+
+
+class TestTenantScheduler(TestCase):
+    def test_invalid_weight(self):
+        with self.assertRaises(ValueError):
+            TenantScheduler(weights={"acme": 0})
+        with self.assertRaises(ValueError):
+            TenantScheduler(weights={"acme": -1})
+
+    def test_tenant_limit(self):
+        scheduler = TenantScheduler(max_concurrency=4, tenant_limit=2)
+        scheduler.acquire("noisy")
+        scheduler.acquire("noisy")
+        with self.assertRaises(TenantCapacityError):
+            scheduler.acquire("noisy", timeout=0.01)
+        # Other tenants still get through while the noisy one is capped.
+        scheduler.acquire("quiet", timeout=0.01)
+
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["noisy"].in_flight, 2)
+        self.assertEqual(metrics["noisy"].rejected, 1)
+        self.assertEqual(metrics["noisy"].queued, 0)
+        self.assertEqual(metrics["quiet"].in_flight, 1)
+
+    def test_per_tenant_limits(self):
+        scheduler = TenantScheduler(max_concurrency=4, tenant_limit=1, limits={"big": 3})
+        for _ in range(3):
+            scheduler.acquire("big", timeout=0.01)
+        scheduler.acquire("small", timeout=0.01)
+        with self.assertRaises(TenantCapacityError):
+            scheduler.acquire("small", timeout=0.01)
+
+    def test_release(self):
+        scheduler = TenantScheduler(max_concurrency=1)
+        with scheduler.slot("a"):
+            self.assertEqual(scheduler.metrics()["a"].in_flight, 1)
+        stats = scheduler.metrics()["a"]
+        self.assertEqual(stats.in_flight, 0)
+        self.assertEqual(stats.completed, 1)
+        self.assertEqual(stats.peak_in_flight, 1)
+
+    def test_weighted_fair_order(self):
+        scheduler = TenantScheduler(max_concurrency=1, weights={"heavy": 2})
+        scheduler.acquire("blocker")
+        order = []
+
+        def worker(tenant):
+            with scheduler.slot(tenant):
+                order.append(tenant)
+
+        threads = []
+        for tenant in ["light"] * 3 + ["heavy"] * 4:
+            thread = threading.Thread(target=worker, args=(tenant,))
+            thread.start()
+            threads.append(thread)
+            _wait_for_queued(scheduler, len(threads))
+        scheduler.release("blocker")
+        for thread in threads:
+            thread.join(5)
+
+        # "heavy" was queued last but gets two slots for every one "light" gets.
+        self.assertEqual(order, ["heavy", "light", "heavy", "heavy", "light", "heavy", "light"])
+
+
+class TestTenantClient(TestCase):
+    def setUp(self):
+        self.scheduler = TenantScheduler(max_concurrency=1, timeout=0.01)
+        self.client = HTTPBaseClient(baseurl="http://example.com", tenant_scheduler=self.scheduler)
+        self.route = Route("/api/{tenant}/foo", HTTPMethods.GET)
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_make_request(self, mock_requests):
+        self.client._make_request(self.route, tenant="acme")
+        mock_requests.assert_called_with("get", "http://example.com/api/acme/foo")
+        self.assertEqual(self.scheduler.metrics()["acme"].completed, 1)
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_capacity_error_response(self, mock_requests):
+        self.scheduler.acquire("acme")
+        resp = self.client._make_request(self.route, tenant="acme")
+        self.assertEqual(resp.status_code, HTTPResponseCodes.TOO_MANY_REQUESTS)
+        self.assertIn("message", resp.json())
+        mock_requests.assert_not_called()
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_streamed_response_holds_slot(self, mock_requests):
+        response = requests.Response()
+        response.raw = io.BytesIO(b"body")
+        mock_requests.return_value = response
+        streamed = self.client._make_request(self.route, tenant="acme", stream=True)
+        self.assertEqual(self.scheduler.metrics()["acme"].in_flight, 1)
+        self.assertEqual(self.client._make_request(self.route, tenant="acme").status_code,
+                         HTTPResponseCodes.TOO_MANY_REQUESTS)
+        self.assertEqual(streamed.content, b"body")
+        self.assertEqual(self.scheduler.metrics()["acme"].in_flight, 0)
+        streamed.close()
+        self.assertEqual(self.scheduler.metrics()["acme"].completed, 1)
+
+    @mock.patch("httpbase.client.requests.request")
+    def test_closed_streamed_response_releases_slot(self, mock_requests):
+        response = requests.Response()
+        response.raw = io.BytesIO(b"body")
+        mock_requests.return_value = response
+        streamed = self.client._make_request(self.route, tenant="acme", stream=True)
+        next(streamed.iter_content(1))
+        self.assertEqual(self.scheduler.metrics()["acme"].in_flight, 1)
+        streamed.close()
+        self.assertEqual(self.scheduler.metrics()["acme"].in_flight, 0)
+
+    @mock.patch("httpbase.client.requests.request", side_effect=requests.ConnectionError)
+    def test_failed_streamed_request_releases_slot(self, mock_requests):
+        with self.assertRaises(requests.ConnectionError):
+            self.client._make_request(self.route, tenant="acme", stream=True)
+        self.assertEqual(self.scheduler.metrics()["acme"].in_flight, 0)
@@ -0,0 +1,204 @@
+import asyncio
+import json
+from unittest import TestCase
+from urllib.parse import parse_qs
+
+import requests
+
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.fields import IntField, StrField
+from httpbase.resources import Resource
+from httpbase.routes import Route
+from httpbase.transports import ASGITransport, WSGITransport
+
+
+class ItemResource(Resource):
+    item_id = IntField(label="id")
+    name = StrField(label="name")
+
+
+def describe(method, path, query, headers, body):
+    return {
+        "method": method,
+        "path": path,
+        "query": parse_qs(query),
+        "content_type": headers.get("content-type"),
+        "custom": headers.get("x-custom"),
+        "authorization": headers.get("authorization"),
+        "defaults": {name: headers.get(name) for name in ("user-agent", "accept", "accept-encoding", "connection")},
+        "body": body.decode(),
+    }
+
+
+def wsgi_app(environ, start_response):
+    path = environ["PATH_INFO"]
+    if path == "/redirect":
+        start_response("302 Found", [("Location", "/items/1")])
+        return [b""]
+    if path == "/moved":
+        start_response("301 Moved Permanently", [("Location", "http://other.example/items/1")])
+        return [b""]
+    if path == "/temporary":
+        start_response("307 Temporary Redirect", [("Location", "/items/1")])
+        return [b""]
+    if path == "/loop":
+        start_response("307 Temporary Redirect", [("Location", "/loop")])
+        return [b""]
+    if path == "/items.ndjson":
+        start_response("200 OK", [("Content-Type", "application/x-ndjson")])
+        return [b'{"id": 1, "name": "a"}\n', b'{"id": 2, "name": "b"}\n']
+    if path == "/missing":
+        start_response("404 Not Found", [("Content-Type", "application/json")])
+        return [b'{"message": "not found"}']
+    length = int(environ.get("CONTENT_LENGTH") or 0)
+    headers = {key[5:].lower().replace("_", "-"): value for key, value in environ.items() if key.startswith("HTTP_")}
+    headers["content-type"] = environ.get("CONTENT_TYPE")
+    body = environ["wsgi.input"].read(length)
+    data = describe(environ["REQUEST_METHOD"], path, environ["QUERY_STRING"], headers, body)
+    data["host"] = environ["HTTP_HOST"]
+    start_response("200 OK", [("Content-Type", "application/json"), ("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")])
+    return [json.dumps(data).encode()]
+
+
+async def asgi_app(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    headers = {name.decode(): value.decode() for name, value in scope["headers"]}
+    if scope["path"] == "/redirect":
+        await send({"type": "http.response.start", "status": 303, "headers": [(b"location", b"/items/1")]})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    data = describe(scope["method"], scope["path"], scope["query_string"].decode(), headers, body)
+    data["host"] = headers["host"]
+    await send({"type": "http.response.start", "status": 201, "headers": [(b"content-type", b"application/json")]})
+    encoded = json.dumps(data).encode()
+    await send({"type": "http.response.body", "body": encoded[:10], "more_body": True})
+    await send({"type": "http.response.body", "body": encoded[10:]})
+
+
+class ItemsClient(HTTPBaseClient):
+    baseurl = "http://testserver"
+
+    def get_item(self, item_id, **kwargs):
+        return self._make_request(Route("/items/{item_id}", HTTPMethods.GET, params={"page"}), item_id=item_id,
+                                  **kwargs)
+
+    def create_item(self, item, **kwargs):
+        return self._make_request(Route("/items", HTTPMethods.POST), json=item.dict(), **kwargs)
+
+
+class TransportTests(object):
+    transport = None
+
+    def setUp(self):
+        self.client = ItemsClient(transport=self.transport)
+
+    def test_get(self):
+        response = self.client.get_item(1, params={"page": 2}, headers={"X-Custom": "yes"}, timeout=5)
+        self.assertIsInstance(response, requests.Response)
+        data = response.json()
+        self.assertEqual(data["method"], "GET")
+        self.assertEqual(data["path"], "/items/1")
+        self.assertEqual(data["query"], {"page": ["2"]})
+        self.assertEqual(data["custom"], "yes")
+        self.assertEqual(data["host"], "testserver")
+        self.assertEqual(response.url, "http://testserver/items/1?page=2")
+        self.assertEqual(response.headers["Content-Type"], "application/json")
+
+    def test_default_headers(self):
+        expected = {name.lower(): value for name, value in requests.utils.default_headers().items()}
+        self.assertEqual(self.client.get_item(1).json()["defaults"], expected)
+
+    def test_post_json(self):
+        response = self.client.create_item(ItemResource(item_id=1, name="café"))
+        data = response.json()
+        self.assertEqual(data["method"], "POST")
+        self.assertEqual(data["content_type"], "application/json")
+        self.assertEqual(json.loads(data["body"]), {"id": 1, "name": "café"})
+
+    def test_stream_resources(self):
+        route = Route("/items", HTTPMethods.POST)
+        items = [ItemResource(item_id=index, name="item") for index in range(3)]
+        response = self.client._make_request(route, stream_resources=items, ndjson=True)
+        data = response.json()
+        self.assertEqual(data["content_type"], "application/x-ndjson")
+        self.assertEqual([json.loads(line)["id"] for line in data["body"].splitlines()], [0, 1, 2])
+
+    def test_route_error(self):
+        response = self.client._make_request(Route("/items/{item_id}", HTTPMethods.GET))
+        self.assertEqual(response.status_code, 400)
+
+
+class TestWSGITransport(TransportTests, TestCase):
+    transport = WSGITransport(wsgi_app)
+
+    def test_redirect(self):
+        response = self.client._make_request(Route("/redirect", HTTPMethods.POST), data=b"x")
+        self.assertEqual(response.json()["path"], "/items/1")
+        self.assertEqual(response.json()["method"], "GET")
+        self.assertEqual([redirect.status_code for redirect in response.history], [302])
+        response = self.client._make_request(Route("/redirect", HTTPMethods.GET), allow_redirects=False)
+        self.assertEqual(response.status_code, 302)
+        with self.assertRaises(requests.TooManyRedirects):
+            self.client._make_request(Route("/loop", HTTPMethods.GET))
+
+    def test_redirect_like_requests(self):
+        headers = {"Authorization": "Bearer token"}
+        data = self.client._make_request(Route("/redirect", HTTPMethods.GET), headers=headers).json()
+        self.assertEqual(data["authorization"], "Bearer token")
+        # The credentials aren't sent to another host
+        data = self.client._make_request(Route("/moved", HTTPMethods.GET), headers=headers).json()
+        self.assertEqual((data["host"], data["path"], data["authorization"]), ("other.example", "/items/1", None))
+        # Temporary redirects keep the method and the body
+        data = self.client._make_request(Route("/temporary", HTTPMethods.POST), data=b"x").json()
+        self.assertEqual((data["method"], data["body"]), ("POST", "x"))
+
+    def test_repeated_headers(self):
+        self.assertEqual(self.client.get_item(1).headers["set-cookie"], "a=1, b=2")
+
+    def test_error_status(self):
+        response = self.client._make_request(Route("/missing", HTTPMethods.GET))
+        self.assertEqual((response.status_code, response.reason), (404, "Not Found"))
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+
+    def test_stream_request(self):
+        items = list(self.client._stream_request(Route("/items.ndjson", HTTPMethods.GET), resource_class=ItemResource,
+                                                 chunk_size=7))
+        self.assertEqual([item.name.value for item in items], ["a", "b"])
+
+    def test_hooks(self):
+        seen = []
+        self.transport("GET", "http://testserver/items/1",
+                       hooks={"response": lambda response, **kwargs: seen.append(response.status_code)})
+        self.assertEqual(seen, [200])
+
+
+class TestASGITransport(TransportTests, TestCase):
+    transport = ASGITransport(asgi_app)
+
+    def test_status(self):
+        self.assertEqual(self.client.get_item(1).status_code, 201)
+        self.assertEqual(self.client.get_item(1).reason, "Created")
+
+    def test_redirect(self):
+        response = self.client._make_request(Route("/redirect", HTTPMethods.POST), data=b"x")
+        self.assertEqual(response.json()["method"], "GET")
+
+    def test_inside_event_loop(self):
+        async def call():
+            return self.client.get_item(1).json()
+
+        self.assertEqual(asyncio.run(call())["path"], "/items/1")
+
+    def test_close(self):
+        transport = ASGITransport(asgi_app)
+        client = ItemsClient(transport=transport)
+        client.get_item(1)
+        transport.close()
+        self.assertEqual(client.get_item(2).json()["path"], "/items/2")
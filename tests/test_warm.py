@@ -0,0 +1,151 @@
+import time
+from unittest import TestCase, mock
+
+import requests
+
+from httpbase.bench import StandInServer
+from httpbase.client import HTTPBaseClient
+from httpbase.constants import HTTPMethods
+from httpbase.exceptions import ConfigurationError
+from httpbase.routes import Route
+from httpbase import transports
+from httpbase.transports import SessionTransport
+
+health = Route("/health", HTTPMethods.HEAD)
+
+
+class ItemsClient(HTTPBaseClient):
+    def get_item(self, item_id: int=1):
+        return self._make_request(Route("/items/{item_id}", HTTPMethods.GET), item_id=item_id)
+
+
+def wait_for(condition, timeout: float=2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class PoolTestCase(TestCase):
+    def setUp(self):
+        self.server = StandInServer()
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def transport(self, **kwargs) -> SessionTransport:
+        transport = SessionTransport(**kwargs)
+        self.addCleanup(transport.close)
+        return transport
+
+
+class TestSessionTransportWarm(PoolTestCase):
+    def test_warm(self):
+        transport = self.transport(pool_maxsize=4)
+        self.assertEqual(transport.warm(self.server.url, connections=3), 3)
+        self.assertTrue(wait_for(lambda: self.server.connections == 3))
+        client = ItemsClient(baseurl=self.server.url, transport=transport)
+        for item_id in range(5):
+            self.assertEqual(client.get_item(item_id).status_code, 200)
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual(transport.warm(self.server.url, connections=10), 4)
+        self.assertTrue(wait_for(lambda: self.server.connections == 4))
+
+    def test_warm_unreachable(self):
+        transport = self.transport()
+        with self.assertRaises(requests.ConnectionError):
+            transport.warm("http://127.0.0.1:9", connections=2)
+        self.assertEqual(transport.idle_connections("http://127.0.0.1:9"), 0)
+
+    def test_warm_no_connections(self):
+        with self.assertRaises(ValueError):
+            self.transport().warm(self.server.url, connections=0)
+
+    def test_without_pool_internals(self):
+        transport = self.transport(min_idle=2)
+        with mock.patch.object(transports, "_POOL_INTERNALS", False):
+            self.assertEqual(transport.warm(self.server.url, connections=3), 0)
+            client = ItemsClient(baseurl=self.server.url, transport=transport)
+            self.assertEqual(client.get_item().status_code, 200)
+            transport.maintain()
+            self.assertEqual(transport.idle_connections(self.server.url), 0)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_reap_idle(self):
+        transport = self.transport(min_idle=1, idle_timeout=0)
+        transport.warm(self.server.url, connections=3)
+        transport.maintain()
+        self.assertEqual(transport.idle_connections(self.server.url), 1)
+
+    def test_reap_idle_after_timeout(self):
+        transport = self.transport(min_idle=1, idle_timeout=0.2)
+        transport.warm(self.server.url, connections=3)
+        # Passes more often than the timeout don't reset how long the connections have been idle
+        for _ in range(3):
+            transport.maintain()
+            self.assertEqual(transport.idle_connections(self.server.url), 3)
+            time.sleep(0.05)
+        time.sleep(0.1)
+        for _ in range(3):
+            transport.maintain()
+            self.assertEqual(transport.idle_connections(self.server.url), 1)
+
+    def test_min_idle(self):
+        transport = self.transport(min_idle=2)
+        ItemsClient(baseurl=self.server.url, transport=transport).get_item()
+        self.assertEqual(transport.idle_connections(self.server.url), 1)
+        transport.maintain()
+        self.assertEqual(transport.idle_connections(self.server.url), 2)
+
+    def test_maintenance_thread(self):
+        transport = self.transport(min_idle=2, maintenance_interval=0.02)
+        ItemsClient(baseurl=self.server.url, transport=transport).get_item()
+        self.assertTrue(wait_for(lambda: transport.idle_connections(self.server.url) == 2))
+
+
+class TestClientWarm(PoolTestCase):
+    def test_warm(self):
+        client = ItemsClient(baseurl=self.server.url, transport=self.transport())
+        self.assertEqual(client.warm(connections=2), 2)
+        self.assertEqual(client.warm(connections=3, route=health), 3)
+        self.assertTrue(wait_for(lambda: self.server.connections == 3))
+
+    def test_warm_route_without_pool(self):
+        client = ItemsClient(baseurl=self.server.url)
+        self.assertEqual(client.warm(connections=2, route=health), 0)
+        self.assertTrue(wait_for(lambda: self.server.connections == 2))
+
+    def test_warm_no_connections(self):
+        client = ItemsClient(baseurl=self.server.url, transport=self.transport())
+        with self.assertRaises(ValueError):
+            client.warm(connections=0, route=health)
+        self.assertEqual(self.server.connections, 0)
+
+    def test_warm_needs_pool_or_route(self):
+        with self.assertRaises(ConfigurationError):
+            ItemsClient(baseurl=self.server.url).warm()
+
+    def test_after_fork_warms(self):
+        transport = self.transport()
+        client = ItemsClient(baseurl=self.server.url, transport=transport, warm_connections=2)
+        client.after_fork()
+        # Nothing is opened in the fork handler, only before the first request
+        self.assertEqual(transport.idle_connections(self.server.url), 0)
+        self.assertEqual(client.get_item().status_code, 200)
+        self.assertEqual(transport.idle_connections(self.server.url), 2)
+        client.get_item()
+        self.assertEqual(self.server.connections, 2)
+        # Failing to warm up doesn't stop requests from being sent
+        unreachable = ItemsClient(baseurl="http://127.0.0.1:9", transport=transport, warm_connections=2)
+        unreachable.after_fork()
+        with self.assertWarns(RuntimeWarning), self.assertRaises(requests.ConnectionError):
+            unreachable.get_item()
+
+    def test_warm_replaces_pending_warm(self):
+        transport = self.transport()
+        client = ItemsClient(baseurl=self.server.url, transport=transport, warm_connections=2)
+        client.after_fork()
+        self.assertEqual(client.warm(connections=3), 3)
+        client.get_item()
+        self.assertEqual(self.server.connections, 3)